@@ -0,0 +1,137 @@
+import argparse
+import json
+import logging
+import os
+from scoring import file_sha256
+from values import MODEL_FILE, VECTORIZER_FILE, NATIVE_ARTIFACTS_DIR
+
+NATIVE_MODEL_FILE = 'model.cbm'
+VOCABULARY_FILE = 'vocabulary.json'
+IDF_FILE = 'idf.npy'
+DOCUMENT_FREQUENCIES_FILE = 'document_frequencies.npy'
+METADATA_FILE = 'artifact.json'
+
+# TfidfVectorizer settings needed to reproduce transform() with a fixed vocabulary
+VECTORIZER_PARAMS = [
+    'analyzer', 'binary', 'decode_error', 'encoding', 'input', 'lowercase', 'ngram_range',
+    'norm', 'smooth_idf', 'stop_words', 'strip_accents', 'sublinear_tf', 'token_pattern', 'use_idf'
+]
+
+def has_native_artifacts(directory=NATIVE_ARTIFACTS_DIR):
+    return os.path.isfile(os.path.join(directory, METADATA_FILE))
+
+def save_native_artifacts(model, vectorizer, directory=NATIVE_ARTIFACTS_DIR, source_model_sha256=None):
+    """
+    NATIVE ARTIFACTS:
+    Writes the CatBoost model in its own .cbm format and the vectorizer as
+    flat .npy arrays (TF-IDF: term list plus idf; hashing: document
+    frequencies) that are memory-mapped on load, so nothing is unpickled and
+    forked workers share the pages. Pool featurizers only store their columns.
+    """
+    import numpy as np
+    from featurizers import HashingTfidfFeaturizer, CatBoostPoolFeaturizer
+
+    os.makedirs(directory, exist_ok=True)
+    model.save_model(os.path.join(directory, NATIVE_MODEL_FILE), format='cbm')
+    metadata = {
+        'format_version': 1,
+        'classes': [int(label) for label in model.classes_],
+        'source_model_sha256': source_model_sha256
+    }
+
+    if isinstance(vectorizer, CatBoostPoolFeaturizer):
+        # Nothing fitted: the column lists are all there is
+        metadata['vectorizer_type'] = 'catboost_pool'
+        metadata['vectorizer_params'] = {
+            'text_features': vectorizer.text_features,
+            'cat_features': vectorizer.cat_features
+        }
+        vectorizer_files = []
+    elif isinstance(vectorizer, HashingTfidfFeaturizer):
+        np.save(os.path.join(directory, DOCUMENT_FREQUENCIES_FILE), vectorizer.document_frequencies)
+        metadata['vectorizer_type'] = 'hashing'
+        metadata['vectorizer_params'] = {
+            'n_features': vectorizer.n_features,
+            'token_pattern': vectorizer.token_pattern,
+            'lowercase': vectorizer.lowercase
+        }
+        metadata['n_documents'] = int(vectorizer.n_documents)
+        vectorizer_files = [DOCUMENT_FREQUENCIES_FILE]
+    else:
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, index in vectorizer.vocabulary_.items():
+            terms[index] = term
+        with open(os.path.join(directory, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(terms, f, ensure_ascii=False)
+        np.save(os.path.join(directory, IDF_FILE), np.ascontiguousarray(vectorizer.idf_, dtype=np.float64))
+        params = vectorizer.get_params()
+        metadata['vectorizer_type'] = 'tfidf'
+        metadata['vectorizer_params'] = {name: params[name] for name in VECTORIZER_PARAMS}
+        metadata['vectorizer_dtype'] = np.dtype(params['dtype']).name
+        vectorizer_files = [VOCABULARY_FILE, IDF_FILE]
+
+    metadata['files'] = {name: file_sha256(os.path.join(directory, name))
+                         for name in [NATIVE_MODEL_FILE] + vectorizer_files}
+    # Written last: a directory without metadata is never picked up
+    with open(os.path.join(directory, METADATA_FILE), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+    return metadata
+
+def load_native_artifacts(directory=NATIVE_ARTIFACTS_DIR):
+    """
+    Returns (model, vectorizer, metadata). The vectorizer is a regular
+    TfidfVectorizer whose idf_ is a read-only memory map of idf.npy, or a
+    HashingTfidfFeaturizer over a memory-mapped document-frequency array.
+    """
+    import numpy as np
+    from catboost import CatBoostClassifier
+
+    with open(os.path.join(directory, METADATA_FILE), encoding='utf-8') as f:
+        metadata = json.load(f)
+
+    model = CatBoostClassifier()
+    model.load_model(os.path.join(directory, NATIVE_MODEL_FILE), format='cbm')
+
+    if metadata.get('vectorizer_type') == 'catboost_pool':
+        from featurizers import CatBoostPoolFeaturizer
+        vectorizer = CatBoostPoolFeaturizer(**metadata['vectorizer_params'])
+    elif metadata.get('vectorizer_type') == 'hashing':
+        from featurizers import HashingTfidfFeaturizer
+        vectorizer = HashingTfidfFeaturizer(**metadata['vectorizer_params'])
+        vectorizer.document_frequencies = np.load(os.path.join(directory, DOCUMENT_FREQUENCIES_FILE), mmap_mode='r')
+        vectorizer.n_documents = metadata['n_documents']
+    else:
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        with open(os.path.join(directory, VOCABULARY_FILE), encoding='utf-8') as f:
+            terms = json.load(f)
+        params = dict(metadata['vectorizer_params'])
+        params['ngram_range'] = tuple(params['ngram_range'])
+        vectorizer = TfidfVectorizer(vocabulary={term: index for index, term in enumerate(terms)},
+                                     dtype=np.dtype(metadata['vectorizer_dtype']), **params)
+        vectorizer.idf_ = np.load(os.path.join(directory, IDF_FILE), mmap_mode='r')
+    return model, vectorizer, metadata
+
+def convert_pickles(model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE, directory=NATIVE_ARTIFACTS_DIR):
+    import joblib
+
+    model = joblib.load(model_path)
+    vectorizer = joblib.load(vectorizer_path)
+    # Keeps calibration.json (fitted against the .pkl) valid for the converted model
+    return save_native_artifacts(model, vectorizer, directory, source_model_sha256=file_sha256(model_path))
+
+def main():
+    parser = argparse.ArgumentParser(description='Model artifact maintenance')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    convert_parser = subparsers.add_parser('convert', help='Convert the joblib pickles to the native format')
+    convert_parser.add_argument('--model', default=MODEL_FILE)
+    convert_parser.add_argument('--vectorizer', default=VECTORIZER_FILE)
+    convert_parser.add_argument('--out', default=NATIVE_ARTIFACTS_DIR)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'convert':
+        metadata = convert_pickles(args.model, args.vectorizer, args.out)
+        logging.info(f"Wrote native artifacts to {args.out}: {sorted(metadata['files'])}")
+
+if __name__ == '__main__':
+    main()
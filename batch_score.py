@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from domain_reputation import lookups_enabled, set_lookups_enabled
+from pipeline import score_postings, normalize_job_data, warm_up
+
+# Historical exports contain very long descriptions
+csv.field_size_limit(2 ** 31 - 1)
+
+# Jobs.csv / userinputs.csv headers for list-valued fields
+CSV_LIST_FIELDS = {
+    'company_social_media_links__-': 'company_social_media_links',
+    'attachments__-': 'attachments'
+}
+
+OUTPUT_FIELDS = [
+    'row', 'job_title', 'job_id_or_ref_code', 'company_name', 'label',
+    'model_prediction', 'final_prediction', 'override_applied', 'real_probability',
+    'score', 'critical_issues_count', 'total_issues_count', 'issues', 'reasons'
+]
+
+def detect_format(path, explicit=None):
+    if explicit:
+        return explicit
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+def read_csv_rows(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            job_data = {}
+            for field, value in row.items():
+                if not field:
+                    continue
+                if field in CSV_LIST_FIELDS:
+                    job_data[CSV_LIST_FIELDS[field]] = [item.strip() for item in (value or '').replace(';', ',').split(',')
+                                                        if item.strip()]
+                else:
+                    job_data[field] = value or ''
+            yield job_data
+
+def read_jsonl_rows(path):
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job_data = json.loads(line)
+            except ValueError as e:
+                logging.warning(f"Skipping line {line_number}: {e}")
+                continue
+            if isinstance(job_data, dict):
+                yield job_data
+            else:
+                logging.warning(f"Skipping line {line_number}: not a JSON object")
+
+def read_rows(path, input_format):
+    return read_csv_rows(path) if input_format == 'csv' else read_jsonl_rows(path)
+
+def chunked(rows, chunk_size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+class ResultWriter:
+    """
+    Writes scored rows incrementally as JSON lines or CSV
+    """
+
+    def __init__(self, path, output_format):
+        self.output_format = output_format
+        self._file = open(path, 'w', newline='', encoding='utf-8') if path != '-' else sys.stdout
+        self._csv = None
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS)
+            self._csv.writeheader()
+
+    def write(self, records):
+        for record in records:
+            if self._csv:
+                self._csv.writerow({**record,
+                                    'issues': '; '.join(record['issues']),
+                                    'reasons': '; '.join(record['reasons'])})
+            else:
+                self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
+
+def output_record(job_data, result):
+    return {
+        'job_title': job_data.get('job_title', ''),
+        'job_id_or_ref_code': job_data.get('job_id_or_ref_code', ''),
+        'company_name': job_data.get('company_name', ''),
+        'label': job_data.get('is_real', ''),
+        **{field: result[field] for field in OUTPUT_FIELDS if field in result}
+    }
+
+def score_chunk(chunk):
+    postings = [normalize_job_data(job_data) for job_data in chunk]
+    results = score_postings(postings, use_cache=False)
+    return [output_record(job_data, result) for job_data, result in zip(postings, results)]
+
+def init_worker(domain_lookups):
+    # Spawned workers do not inherit the parent's settings
+    set_lookups_enabled(domain_lookups)
+    # Load the model, vectorizer and spelling dictionary (preload_spell_checker) up front so no task pays for them
+    warm_up()
+
+def score_chunks(chunks, workers=1):
+    """
+    Yields scored chunks in input order. With workers > 1 the chunks are
+    fanned out to a process pool, keeping at most two chunks per worker in
+    flight so memory stays bounded. Workers use this process's domain lookup setting.
+    """
+    if workers <= 1:
+        for chunk in chunks:
+            yield score_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(lookups_enabled(),)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(score_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def score_file(input_path, output_path, input_format, output_format, chunk_size, workers=1, domain_lookups=None):
+    """
+    STREAMING SCORER:
+    Reads fixed-size chunks, scores each chunk with one vectorizer/CatBoost
+    pass and writes its results before reading the next, so memory stays
+    bounded by the chunk size regardless of file size. domain_lookups=False
+    skips the DNS/WHOIS checks, so verdicts do not depend on the network.
+    """
+    if domain_lookups is not None:
+        set_lookups_enabled(domain_lookups)
+    writer = ResultWriter(output_path, output_format)
+    scored = 0
+    start = time.perf_counter()
+    try:
+        for records in score_chunks(chunked(read_rows(input_path, input_format), chunk_size), workers):
+            for record in records:
+                scored += 1
+                record['row'] = scored
+            writer.write(records)
+            elapsed = time.perf_counter() - start
+            logging.info(f"Scored {scored} postings ({scored / elapsed:.1f}/s)")
+    finally:
+        writer.close()
+    return scored
+
+def main():
+    parser = argparse.ArgumentParser(description='Score a CSV or JSON-lines file of job postings')
+    parser.add_argument('input', help='Input file (Jobs.csv/userinputs.csv schema, or JSON lines)')
+    parser.add_argument('-o', '--output', default='-', help='Output file (.csv or .jsonl), default stdout')
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'], help='Override format detection')
+    parser.add_argument('--output-format', choices=['csv', 'jsonl'], help='Override format detection')
+    parser.add_argument('--chunk-size', type=int, default=500, help='Postings scored per model call')
+    parser.add_argument('--workers', type=int, default=1,
+                        help=f'Scoring processes (default 1, this machine has {os.cpu_count()} CPUs)')
+    parser.add_argument('--no-domain-lookups', action='store_true',
+                        help='Skip DNS/WHOIS lookups of contact domains (offline or reproducible runs)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s',
+                        stream=sys.stderr)
+    if not os.path.isfile(args.input):
+        parser.error(f"Input file not found: {args.input}")
+
+    input_format = detect_format(args.input, args.input_format)
+    output_format = detect_format(args.output, args.output_format) if args.output != '-' else (args.output_format or 'jsonl')
+    scored = score_file(args.input, args.output, input_format, output_format,
+                        max(1, args.chunk_size), max(1, args.workers),
+                        False if args.no_domain_lookups else None)
+    logging.info(f"Done: {scored} postings written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,556 @@
+import argparse
+import html
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+def load_postings(path='Job.json', limit=None):
+    with open(path, encoding='utf-8') as f:
+        postings = json.load(f)
+    return postings[:limit] if limit else postings
+
+def combined_text(job_data):
+    return ' '.join([
+        job_data.get('job_title', ''),
+        job_data.get('job_description', ''),
+        job_data.get('requirements', ''),
+        job_data.get('benefits', '')
+    ])
+
+def time_per_posting(fn, postings, clock=time.perf_counter):
+    """
+    Runs fn on every posting and returns latency statistics in milliseconds
+    (CPU time with clock=time.process_time)
+    """
+    timings = []
+    for job_data in postings:
+        start = clock()
+        fn(job_data)
+        timings.append((clock() - start) * 1000)
+    timings.sort()
+    return {
+        'postings': len(timings),
+        'mean_ms': round(statistics.mean(timings), 3),
+        'p50_ms': round(timings[len(timings) // 2], 3),
+        'p99_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.99))], 3),
+        'total_s': round(sum(timings) / 1000, 3)
+    }
+
+def report(name, stats):
+    print(f"{name:<40} mean={stats['mean_ms']:>9.3f}ms  p50={stats['p50_ms']:>9.3f}ms  "
+          f"p99={stats['p99_ms']:>9.3f}ms  total={stats['total_s']:>8.3f}s")
+
+def bench_spelling(postings, args):
+    from spellchecker import SpellChecker
+    from spelling import unknown_words, get_spell_checker
+    from verify import enhanced_scam_detection
+
+    def per_call_checker(job_data):
+        # Previous behaviour: a fresh dictionary load for every posting
+        words = re.findall(r'\b[a-zA-Z]{3,}\b', combined_text(job_data).lower())
+        SpellChecker().unknown(words)
+
+    def shared_checker(job_data):
+        words = re.findall(r'\b[a-zA-Z]{3,}\b', combined_text(job_data).lower())
+        unknown_words(words)
+
+    start = time.perf_counter()
+    get_spell_checker()
+    print(f"Shared dictionary load: {(time.perf_counter() - start) * 1000:.1f}ms (once per process)")
+
+    report('spelling: SpellChecker() per call', time_per_posting(per_call_checker, postings))
+    report('spelling: shared + LRU', time_per_posting(shared_checker, postings))
+    report('enhanced_scam_detection', time_per_posting(enhanced_scam_detection, postings))
+
+def bench_phrases(postings, args):
+    from verify import PHRASE_INDEX, RULE_PLAN, RED_FLAG_CATEGORIES, find_phrases, clean_text
+
+    phrase_rules = [rule for rule in RULE_PLAN.rules if rule.type == 'phrases']
+
+    def per_list_scans(job_data):
+        # Previous behaviour: one substring scan per phrase, lowercasing each time
+        text = clean_text(combined_text(job_data))
+        for rule in phrase_rules:
+            for phrase in rule.matches:
+                phrase in text.lower()
+        for category in RED_FLAG_CATEGORIES:
+            sum(1 for term, _ in RULE_PLAN.terms[category] if term in text.lower())
+
+    def single_pass(job_data):
+        find_phrases(clean_text(combined_text(job_data)))
+
+    print(f"Phrase index: {len(PHRASE_INDEX.categories)} categories")
+    report('phrases: per-list substring scans', time_per_posting(per_list_scans, postings))
+    report('phrases: single-pass automaton', time_per_posting(single_pass, postings))
+
+def edited_copy(job_data, rng, fraction=0.05):
+    # A scam re-posted with small edits: another company and a few words changed
+    words = job_data.get('job_description', '').split()
+    for _ in range(max(1, int(len(words) * fraction))):
+        if words:
+            words[rng.randrange(len(words))] = rng.choice(['acme', 'globex', 'initech', 'umbrella'])
+    return {**job_data, 'job_description': ' '.join(words), 'company_name': 'Copycat Ltd'}
+
+def bench_near_duplicates(postings, args):
+    import random
+    import numpy as np
+    from near_duplicates import NearDuplicateIndex, posting_text, shingle_hashes
+
+    fakes = [job_data for job_data in postings if str(job_data.get('is_real')) == '0']
+    reals = [job_data for job_data in postings if str(job_data.get('is_real')) == '1']
+    index = NearDuplicateIndex(':memory:')
+    start = time.perf_counter()
+    index.add_many(fakes, 'benchmark')
+    print(f"Indexed {len(index)} of {len(fakes)} fake postings in {(time.perf_counter() - start) * 1000:.1f}ms "
+          f"({index.bands} bands x {index.rows_per_band} rows)")
+
+    rng = random.Random(0)
+    edited = [edited_copy(job_data, rng) for job_data in fakes if shingle_hashes(posting_text(job_data)) is not None]
+    shingle_sets = [shingle_hashes(posting_text(job_data)) for job_data in fakes]
+    shingle_sets = [hashes for hashes in shingle_sets if hashes is not None]
+
+    def exact_scan(job_data):
+        # Reference: exact Jaccard similarity against every indexed posting
+        hashes = shingle_hashes(posting_text(job_data))
+        if hashes is None:
+            return
+        max(len(np.intersect1d(hashes, other, assume_unique=True)) / len(np.union1d(hashes, other))
+            for other in shingle_sets)
+
+    found = sum(1 for job_data in edited if index.query(job_data))
+    false_matches = sum(1 for job_data in reals if index.query(job_data))
+    print(f"Edited copies of known scams matched: {found}/{len(edited)}; "
+          f"real postings matched: {false_matches}/{len(reals)}")
+    report('near-duplicates: exact Jaccard scan', time_per_posting(exact_scan, edited + reals))
+    report('near-duplicates: MinHash/LSH query', time_per_posting(index.query, edited + reals))
+
+def bench_context(postings, args):
+    from pipeline import (
+        build_combined_text, normalize_job_data, check_suspicious_phrases, check_urgency_indicators
+    )
+    from verify import (
+        PostingContext, check_dummy_domains, check_scam_phrases, check_salary_range,
+        check_red_flag_density, enhanced_spelling_grammar_check, extract_domains,
+        determine_experience_level, find_phrases
+    )
+
+    postings = [normalize_job_data(job_data) for job_data in postings]
+
+    def per_check_derivation(job_data):
+        # Previous behaviour: every check rebuilds, cleans and scans the text it needs
+        contact = job_data.get('application_link_or_email', '') or job_data.get('company_website', '')
+        build_combined_text(job_data)
+        check_dummy_domains(contact, extract_domains(contact))
+        check_scam_phrases(job_data)
+        check_salary_range(job_data)
+        find_phrases(combined_text(job_data))
+        determine_experience_level(job_data.get('required_experience', ''))
+        enhanced_spelling_grammar_check(combined_text(job_data))
+        check_red_flag_density(job_data)
+        check_suspicious_phrases(combined_text(job_data))
+        check_urgency_indicators(combined_text(job_data))
+
+    def shared_context(job_data):
+        context = PostingContext(job_data)
+        context.text
+        check_dummy_domains(context.contact_info, context.domains)
+        check_scam_phrases(context)
+        check_salary_range(context)
+        context.text_phrase_hits
+        context.experience_level
+        enhanced_spelling_grammar_check(context)
+        check_red_flag_density(context)
+        check_suspicious_phrases(context)
+        check_urgency_indicators(context)
+
+    # Warm the spelling dictionary and its word cache so both runs see the same state
+    for job_data in postings:
+        shared_context(job_data)
+    before = time_per_posting(per_check_derivation, postings, time.process_time)
+    after = time_per_posting(shared_context, postings, time.process_time)
+    report('context: per-check derivation (CPU)', before)
+    report('context: shared PostingContext (CPU)', after)
+    print(f"CPU time per posting reduced by {(1 - after['mean_ms'] / before['mean_ms']) * 100:.0f}%")
+    return {'per_check_cpu_ms': before, 'shared_context_cpu_ms': after}
+
+def bench_rules(postings, args):
+    from pipeline import normalize_job_data
+    from verify import PostingContext, RULES, enhanced_scam_detection
+
+    postings = [normalize_job_data(job_data) for job_data in postings]
+    # Warm the spelling dictionary and its word cache so every run sees the same state
+    for job_data in postings:
+        enhanced_scam_detection(job_data)
+
+    def warm_context(job_data):
+        # Text every check reads, so each check is timed for its own work only
+        context = PostingContext(job_data)
+        context.clean_text, context.lower_text, context.domains
+        return context
+
+    # RULE_COSTS_MS; with lookups off domain_reputation is timed without DNS/WHOIS
+    costs = {}
+    for rule in RULES:
+        contexts = {id(job_data): warm_context(job_data) for job_data in postings}
+        costs[rule.name] = time_per_posting(lambda job_data: rule.check(contexts[id(job_data)]), postings)
+        report(f'rule: {rule.name}', costs[rule.name])
+
+    # Best of three alternating runs; the difference is small next to timer noise
+    runs = [(time_per_posting(enhanced_scam_detection, postings),
+             time_per_posting(lambda job_data: enhanced_scam_detection(job_data, early_exit=True), postings))
+            for _ in range(3)]
+    full = min((run[0] for run in runs), key=lambda stats: stats['mean_ms'])
+    early = min((run[1] for run in runs), key=lambda stats: stats['mean_ms'])
+    report('rules: all checks', full)
+    report('rules: early exit', early)
+
+    checks_run = []
+    skipped = {rule.name: 0 for rule in RULES}
+    agree = 0
+    for job_data in postings:
+        result = enhanced_scam_detection(job_data, early_exit=True)
+        checks_run.append(len(result['checks_run']))
+        for name in result['checks_skipped']:
+            skipped[name] += 1
+        agree += result['is_scam'] == enhanced_scam_detection(job_data)['is_scam']
+    average_checks = statistics.mean(checks_run)
+    print(f"Checks per posting: {average_checks:.2f} of {len(RULES)}; "
+          f"latency saved {full['mean_ms'] - early['mean_ms']:.3f}ms "
+          f"({(1 - early['mean_ms'] / full['mean_ms']) * 100:.0f}%) per posting; "
+          f"same verdict for {agree}/{len(postings)}")
+    print("Postings skipping each check: " + ', '.join(f"{name} {count}" for name, count in skipped.items()))
+    return {
+        'rule_cost_ms': {name: stats['mean_ms'] for name, stats in costs.items()},
+        'all_checks_ms': full,
+        'early_exit_ms': early,
+        'average_checks_run': round(average_checks, 2),
+        'checks_skipped': skipped,
+        'same_verdict': agree
+    }
+
+def bench_parallel(postings, args, chunk_size=50):
+    from batch_score import chunked, score_chunks
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= (os.cpu_count() or 1):
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != os.cpu_count():
+        worker_counts.append(os.cpu_count())
+
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        scored = sum(len(records) for records in score_chunks(chunked(postings, chunk_size), workers))
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"parallel: {workers:>3} workers  {scored / elapsed:>9.1f} postings/s  "
+              f"speedup={baseline / elapsed:.2f}x  (includes pool start-up)")
+
+def render_linkedin_page(job_data):
+    """
+    Synthetic LinkedIn job page with the markup the scraper reads, used when
+    no saved pages are available
+    """
+    esc = html.escape
+    criteria = ''.join(
+        f'<li class="description__job-criteria-item"><h3 class="description__job-criteria-subheader">{header}</h3>'
+        f'<span class="description__job-criteria-text">{esc(str(job_data.get(field, "")))}</span></li>'
+        for header, field in [('Seniority level', 'required_experience'), ('Employment type', 'employment_type'),
+                              ('Job function', 'job_function'), ('Industries', 'industry')])
+    description = ''.join(f'<p>{esc(str(job_data.get(field, "")))}</p>'
+                          for field in ('job_description', 'requirements', 'benefits'))
+    filler = ''.join(f'<div class="related-job"><a href="/jobs/view/{i}"><span>Related job {i}</span></a></div>'
+                     for i in range(40))
+    return (
+        '<!DOCTYPE html><html><head><title>Job</title><script>var tracking = {};</script></head><body>'
+        '<section class="top-card-layout">'
+        f'<h1 class="top-card-layout__title topcard__title">{esc(str(job_data.get("job_title", "")))}</h1>'
+        f'<a class="topcard__org-name-link topcard__flavor--black-link" href="https://www.linkedin.com/company/example">'
+        f'{esc(str(job_data.get("company_name", "")))}</a>'
+        f'<span class="topcard__flavor topcard__flavor--bullet">{esc(str(job_data.get("job_location", "")))}</span>'
+        '<span class="posted-time-ago__text">2 days ago</span></section>'
+        f'<div class="description__text"><div class="show-more-less-html__markup">{description}</div></div>'
+        f'<ul class="description__job-criteria-list">{criteria}</ul>'
+        f'<section class="similar-jobs">{filler}</section></body></html>'
+    )
+
+def load_pages(pages_dir, postings):
+    if pages_dir and os.path.isdir(pages_dir):
+        pages = []
+        for name in sorted(os.listdir(pages_dir)):
+            if name.endswith(('.html', '.htm')):
+                with open(os.path.join(pages_dir, name), encoding='utf-8', errors='replace') as f:
+                    pages.append(f.read())
+        if pages:
+            return pages
+    print("No saved pages found, using synthetic pages rendered from the postings")
+    return [render_linkedin_page(job_data) for job_data in postings]
+
+def bench_html(postings, args):
+    from scraper import parse_linkedin_job, lxml
+
+    pages = load_pages(args.pages, postings)
+    report('html: BeautifulSoup (html.parser)', time_per_posting(lambda page: parse_linkedin_job(page, parser='bs4'), pages))
+    if lxml is None:
+        print("html: lxml is not installed, skipping the fast path")
+        return
+    report('html: lxml single pass', time_per_posting(lambda page: parse_linkedin_job(page, parser='lxml'), pages))
+
+    mismatches = sum(parse_linkedin_job(page, parser='bs4') != parse_linkedin_job(page, parser='lxml') for page in pages)
+    print(f"html: {len(pages) - mismatches}/{len(pages)} pages parsed identically by both paths")
+
+STARTUP_IMPORTS = [
+    'flask', 'requests', 'bs4', 'lxml.html', 'nltk', 'textblob', 'spellchecker', 'joblib',
+    'sklearn', 'catboost', 'pandas', 'numpy', 'dns.resolver', 'whois',
+    'verify', 'pipeline', 'scraper', 'app'
+]
+
+def run_fresh(code):
+    # Each measurement runs in a new interpreter so nothing is already imported
+    env = {**os.environ, 'STARTUP_MODE': 'lazy'}
+    completed = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    if completed.returncode != 0:
+        return None, completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'failed'
+    return completed.stdout.strip().splitlines()[-1], None
+
+def bench_startup(postings, args):
+    for module in STARTUP_IMPORTS:
+        output, error = run_fresh(f"import time; start = time.perf_counter(); import {module}; "
+                                  f"print((time.perf_counter() - start) * 1000)")
+        if error:
+            print(f"startup: import {module:<20} unavailable ({error})")
+        else:
+            print(f"startup: import {module:<20} {float(output):>9.1f}ms")
+
+    output, error = run_fresh("import json, time, pipeline; start = time.perf_counter(); pipeline.warm_up(); "
+                              "timings = pipeline.readiness()['timings_ms']; "
+                              "timings['total'] = round((time.perf_counter() - start) * 1000, 1); print(json.dumps(timings))")
+    if error:
+        print(f"startup: artifact load failed ({error})")
+        return
+    for component, elapsed in json.loads(output).items():
+        print(f"startup: load {component:<22} {elapsed:>9.1f}ms")
+
+ARTIFACT_LOADERS = {
+    'pickle': "import joblib; from values import MODEL_FILE, VECTORIZER_FILE; "
+              "joblib.load(MODEL_FILE); joblib.load(VECTORIZER_FILE)",
+    'native': "from artifacts import load_native_artifacts; load_native_artifacts()"
+}
+
+def bench_artifacts(postings, args):
+    from artifacts import has_native_artifacts
+
+    for name, loader in ARTIFACT_LOADERS.items():
+        if name == 'native' and not has_native_artifacts():
+            print("artifacts: no native artifacts, run `python artifacts.py convert` first")
+            continue
+        # RSS is read after importing numpy/sklearn/catboost so only the artifacts themselves are counted
+        output, error = run_fresh(
+            "import resource, time, warnings, numpy, sklearn.feature_extraction.text, catboost; "
+            "warnings.simplefilter('ignore'); "
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; start = time.perf_counter(); "
+            f"{loader}; "
+            "print((time.perf_counter() - start) * 1000, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before)")
+        if error:
+            print(f"artifacts: {name} load failed ({error})")
+            continue
+        elapsed_ms, rss_kb = output.split()
+        print(f"artifacts: {name:<8} load={float(elapsed_ms):>8.1f}ms  rss_growth={int(rss_kb) / 1024:>7.1f}MB")
+
+def bench_featurizers(postings, args):
+    import tempfile
+    from artifacts import save_native_artifacts
+    from model import evaluate_model, load_dataset, train
+    from pipeline import featurize
+
+    df = load_dataset('Jobs.csv')
+    records = df.to_dict('records')
+    for featurizer in ('tfidf', 'hashing', 'catboost'):
+        start = time.perf_counter()
+        model, vectorizer, X_test, y_test = train(df, featurizer, verbose=0)
+        train_s = time.perf_counter() - start
+        metrics = evaluate_model(model, X_test, y_test)
+
+        # Featurize + predict over every row, the work /predict does per posting
+        start = time.perf_counter()
+        for _ in range(3):
+            model.predict_proba(featurize(vectorizer, records))
+        score_rate = 3 * len(records) / (time.perf_counter() - start)
+        single = time_per_posting(lambda record: model.predict_proba(featurize(vectorizer, [record])), records[:200])
+
+        with tempfile.TemporaryDirectory() as directory:
+            metadata = save_native_artifacts(model, vectorizer, directory)
+            vectorizer_bytes = sum(os.path.getsize(os.path.join(directory, name))
+                                   for name in metadata['files'] if name != 'model.cbm')
+
+        print(f"featurizers: {featurizer:<8} accuracy={metrics['accuracy']:.4f}  f1={metrics['f1']:.4f}  "
+              f"auc={metrics['auc']:.4f}  train={train_s:.1f}s  batch={score_rate:,.0f} postings/s  "
+              f"single_p50={single['p50_ms']:.2f}ms  vectorizer_size={vectorizer_bytes / 1024:.1f}KB")
+
+def bench_training(postings, args):
+    """
+    Held-out and cross-validated quality, training time, and latency/memory
+    of the full scoring pipeline. Returns the results for --json.
+    """
+    import platform
+    import tempfile
+    import joblib
+    import numpy as np
+    from sklearn.model_selection import StratifiedKFold
+    from model import evaluate_model, featurize_frame, fit_model, load_dataset, train
+    from domain_reputation import lookups_enabled
+    from pipeline import cache_fields, normalize_job_data, score_postings
+
+    df = load_dataset('Jobs.csv')
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'featurizer': args.featurizer,
+        'dataset_rows': len(df)
+    }
+    try:
+        results['git_commit'] = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True,
+                                               text=True).stdout.strip() or None
+    except OSError:
+        results['git_commit'] = None
+
+    # Held-out split used by model.py
+    start = time.perf_counter()
+    model, vectorizer, X_test, y_test = train(df, args.featurizer, verbose=0)
+    results['training_seconds'] = round(time.perf_counter() - start, 3)
+    results['holdout'] = evaluate_model(model, X_test, y_test)
+    print(f"training: holdout {json.dumps(results['holdout'])}  train={results['training_seconds']}s")
+
+    # Cross-validation: the featurizer is fitted on the training folds only
+    folds = []
+    splitter = StratifiedKFold(n_splits=args.folds, shuffle=True, random_state=42)
+    for fold, (train_index, test_index) in enumerate(splitter.split(df, df['is_real']), 1):
+        fold_model, fold_vectorizer = fit_model(df.iloc[train_index], args.featurizer)
+        test_df = df.iloc[test_index]
+        metrics = evaluate_model(fold_model, featurize_frame(fold_vectorizer, test_df), test_df['is_real'])
+        folds.append(metrics)
+        print(f"training: fold {fold}/{args.folds} {json.dumps(metrics)}")
+    results['cross_validation'] = {
+        'folds': folds,
+        **{f"{name}_mean": round(float(np.mean([fold[name] for fold in folds if fold[name] is not None])), 4)
+           for name in ('accuracy', 'precision', 'recall', 'f1', 'auc')},
+        **{f"{name}_std": round(float(np.std([fold[name] for fold in folds if fold[name] is not None])), 4)
+           for name in ('accuracy', 'precision', 'recall', 'f1', 'auc')}
+    }
+
+    # Full pipeline as /predict runs it (rule engine, score, no cache), with the model trained above
+    # rather than the served one, so the numbers belong to --featurizer; calibration is not fitted for it
+    trained = {'model': model, 'vectorizer': vectorizer, 'calibration': None,
+               'version': f"benchmark-{args.featurizer}", 'cache_fields': cache_fields(vectorizer)}
+    pipeline_postings = [normalize_job_data(job_data) for job_data in postings]
+    score_postings(pipeline_postings[:1], artifacts=trained)
+    latency = time_per_posting(lambda job_data: score_postings([job_data], artifacts=trained), pipeline_postings)
+    results['inference'] = {'model': trained['version'], **latency}
+    report('training: /predict pipeline', latency)
+
+    # This process has trained several models, so serving memory is measured in a fresh one
+    # that only loads the trained model and scores every posting
+    with tempfile.TemporaryDirectory() as directory:
+        joblib.dump((model, vectorizer), os.path.join(directory, 'trained.joblib'))
+        with open(os.path.join(directory, 'postings.json'), 'w', encoding='utf-8') as f:
+            json.dump(postings, f)
+        output, error = run_fresh(
+            "import json, os, resource, joblib, domain_reputation; "
+            "from pipeline import cache_fields, normalize_job_data, score_postings; "
+            f"domain_reputation.set_lookups_enabled({lookups_enabled()}); directory = {directory!r}; "
+            "model, vectorizer = joblib.load(os.path.join(directory, 'trained.joblib')); "
+            "trained = {'model': model, 'vectorizer': vectorizer, 'calibration': None, "
+            f"'version': {trained['version']!r}, 'cache_fields': cache_fields(vectorizer)}}; "
+            "postings = [normalize_job_data(job_data) for job_data in "
+            "json.load(open(os.path.join(directory, 'postings.json'), encoding='utf-8'))]; "
+            # ru_maxrss only ever grows, so the baseline is the current RSS (Linux), else the peak so far
+            "before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; "
+            "before = int(open('/proc/self/statm').read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024 "
+            "if os.path.exists('/proc/self/statm') else before; "
+            "[score_postings([job_data], artifacts=trained) for job_data in postings]; "
+            "peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss; print(peak, peak - before)")
+    if error:
+        print(f"training: serving memory not measured ({error})")
+        return results
+    peak_kb, growth_kb = output.split()
+    # serving_peak_rss_mb includes imports and the loaded model; scoring_rss_growth_mb is how far scoring
+    # pushed the peak above the RSS after loading
+    results['inference']['serving_peak_rss_mb'] = round(int(peak_kb) / 1024, 1)
+    results['inference']['scoring_rss_growth_mb'] = round(int(growth_kb) / 1024, 1)
+    print(f"training: serving process peak rss={results['inference']['serving_peak_rss_mb']}MB  "
+          f"growth while scoring {len(postings)} postings={results['inference']['scoring_rss_growth_mb']}MB")
+    return results
+
+def flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+def compare_to_baseline(results, baseline_path):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = flatten(json.load(f))
+    for name, value in sorted(flatten(results).items()):
+        if name in baseline and baseline[name] != value:
+            change = f" ({(value - baseline[name]) / baseline[name]:+.1%})" if baseline[name] else ''
+            print(f"  {name:<50} {baseline[name]} -> {value}{change}")
+
+BENCHMARKS = {
+    'featurizers': bench_featurizers,
+    'artifacts': bench_artifacts,
+    'context': bench_context,
+    'html': bench_html,
+    'parallel': bench_parallel,
+    'near_duplicates': bench_near_duplicates,
+    'phrases': bench_phrases,
+    'rules': bench_rules,
+    'spelling': bench_spelling,
+    'startup': bench_startup,
+    'training': bench_training,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake job detection benchmarks')
+    parser.add_argument('benchmark', choices=sorted(BENCHMARKS) + ['all'])
+    parser.add_argument('--data', default='Job.json', help='JSON array of postings')
+    parser.add_argument('--limit', type=int, default=None, help='Only use the first N postings')
+    parser.add_argument('--pages', default='saved_pages', help='Directory of saved job page HTML (html benchmark)')
+    parser.add_argument('--featurizer', choices=['tfidf', 'hashing', 'catboost'], default='tfidf',
+                        help='Featurizer to train (training benchmark)')
+    parser.add_argument('--folds', type=int, default=5, help='Cross-validation folds (training benchmark)')
+    parser.add_argument('--json', help='Write the results of benchmarks that report them to this file')
+    parser.add_argument('--baseline', help='Earlier --json file to compare the results against')
+    parser.add_argument('--domain-lookups', action='store_true',
+                        help='Keep DNS/WHOIS lookups on (off by default so timings do not depend on the network)')
+    args = parser.parse_args()
+
+    if not args.domain_lookups:
+        from domain_reputation import set_lookups_enabled
+        set_lookups_enabled(False)
+
+    postings = load_postings(args.data, args.limit)
+    names = sorted(BENCHMARKS) if args.benchmark == 'all' else [args.benchmark]
+    all_results = {}
+    for name in names:
+        print(f"== {name} ==")
+        results = BENCHMARKS[name](postings, args)
+        if results is not None:
+            all_results[name] = results
+
+    if args.json and all_results:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2)
+        print(f"Results written to {args.json}")
+    if args.baseline and all_results:
+        print(f"Changes against {args.baseline}:")
+        compare_to_baseline(all_results, args.baseline)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+import json
+import numpy as np
+import pandas as pd
+import joblib
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import brier_score_loss
+from sklearn.model_selection import train_test_split
+from scoring import file_sha256
+from values import CALIBRATION_FILE, MODEL_FILE, VECTORIZER_FILE
+
+model = joblib.load(MODEL_FILE)
+vectorizer = joblib.load(VECTORIZER_FILE)
+
+df = pd.read_csv('Jobs.csv')
+
+text_features = ['job_title', 'job_description', 'requirements', 'benefits']
+df['combined_text'] = df[text_features].apply(lambda x: ' '.join(x.dropna().astype(str)), axis=1)
+X_vec = vectorizer.transform(df['combined_text'])
+y = df['is_real']
+
+# Same split as model.py, so the calibration is fitted on rows the model never saw
+_, X_test, _, y_test = train_test_split(X_vec, y, test_size=0.2, random_state=42)
+
+real_index = list(model.classes_).index(1)
+raw_probability = np.clip(model.predict_proba(X_test)[:, real_index], 1e-6, 1 - 1e-6)
+logits = np.log(raw_probability / (1 - raw_probability)).reshape(-1, 1)
+
+platt = LogisticRegression()
+platt.fit(logits, y_test)
+calibrated_probability = platt.predict_proba(logits)[:, list(platt.classes_).index(1)]
+
+calibration = {
+    'method': 'platt',
+    'slope': float(platt.coef_[0][0]),
+    'intercept': float(platt.intercept_[0]),
+    'model_sha256': file_sha256(MODEL_FILE),
+    'samples': int(len(y_test)),
+    'brier_raw': float(brier_score_loss(y_test, raw_probability)),
+    'brier_calibrated': float(brier_score_loss(y_test, calibrated_probability))
+}
+
+with open(CALIBRATION_FILE, 'w', encoding='utf-8') as f:
+    json.dump(calibration, f, indent=2)
+
+print(json.dumps(calibration, indent=2))
@@ -0,0 +1,243 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from values import (
+    DOMAIN_REPUTATION_ENABLED, DOMAIN_CACHE_DB, DOMAIN_CACHE_TTL_SECONDS, DOMAIN_NEGATIVE_TTL_SECONDS,
+    DOMAIN_ERROR_TTL_SECONDS, DOMAIN_LOOKUP_TIMEOUT_SECONDS, DOMAIN_LOOKUP_BUDGET_SECONDS, DOMAIN_LOOKUP_WORKERS, DOMAIN_DNS_NAMESERVERS
+)
+
+# Each domain is looked up three ways; every lookup is cached on its own
+LOOKUP_KINDS = ('mx', 'a', 'whois')
+
+class DomainCache:
+    """
+    DOMAIN CACHE:
+    On-disk store of DNS and WHOIS lookup results keyed by (domain, kind).
+    Answers are kept for ttl_seconds, definite negatives (NXDOMAIN, no
+    records, no WHOIS entry) for negative_ttl_seconds and failures
+    (timeouts, unreachable servers) for error_ttl_seconds, so a dead domain
+    or a flaky server is not queried on every request.
+    """
+
+    def __init__(self, db_path, ttl_seconds=DOMAIN_CACHE_TTL_SECONDS,
+                 negative_ttl_seconds=DOMAIN_NEGATIVE_TTL_SECONDS, error_ttl_seconds=DOMAIN_ERROR_TTL_SECONDS):
+        self.ttls = {'ok': ttl_seconds, 'negative': negative_ttl_seconds, 'error': error_ttl_seconds}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS lookups (
+                domain TEXT,
+                kind TEXT,
+                status TEXT,
+                value TEXT,
+                checked_at REAL,
+                expires_at REAL,
+                PRIMARY KEY (domain, kind)
+            )''')
+        self._db.commit()
+
+    def get(self, domain, kind):
+        """
+        Returns the unexpired entry as {'status', 'value', 'checked_at'} or None
+        """
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    'SELECT status, value, checked_at FROM lookups WHERE domain = ? AND kind = ? AND expires_at > ?',
+                    (domain, kind, time.time())).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Domain cache read failed: {e}")
+                return None
+        if row is None:
+            return None
+        status, value, checked_at = row
+        return {'status': status, 'value': json.loads(value), 'checked_at': checked_at}
+
+    def put(self, domain, kind, status, value):
+        now = time.time()
+        with self._lock:
+            try:
+                self._db.execute('INSERT OR REPLACE INTO lookups VALUES (?, ?, ?, ?, ?, ?)', (
+                    domain, kind, status, json.dumps(value), now, now + self.ttls[status]
+                ))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Domain cache write failed: {e}")
+
+def build_resolver(nameservers=DOMAIN_DNS_NAMESERVERS, port=53):
+    import dns.resolver
+
+    if not nameservers:
+        return dns.resolver.Resolver()
+    # A fixed server list, e.g. a local stub resolver in tests
+    resolver = dns.resolver.Resolver(configure=False)
+    resolver.nameservers = list(nameservers)
+    resolver.port = port
+    return resolver
+
+def lookup_dns(resolver, domain, rdtype, timeout):
+    """
+    Returns (status, records) for an MX or A query. NXDOMAIN and empty
+    answers are 'negative'; timeouts and server failures are 'error'.
+    """
+    import dns.exception
+    import dns.resolver
+
+    try:
+        answer = resolver.resolve(domain, rdtype, lifetime=timeout)
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return 'negative', []
+    except (dns.exception.Timeout, dns.resolver.NoNameservers) as e:
+        return 'error', str(e) or type(e).__name__
+    if rdtype == 'MX':
+        return 'ok', sorted(str(record.exchange).rstrip('.') for record in answer)
+    return 'ok', sorted(record.address for record in answer)
+
+def python_whois_lookup(domain, timeout):
+    import whois
+
+    return whois.whois(domain, quiet=True, timeout=timeout)
+
+def first_date(value):
+    # python-whois returns a datetime, a list of them (one per registry record) or a string
+    if isinstance(value, (list, tuple)):
+        dates = [first_date(item) for item in value]
+        dates = [date for date in dates if date]
+        return min(dates) if dates else None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    return None
+
+def lookup_whois(whois_lookup, domain, timeout):
+    """
+    Returns (status, {'creation_date': ISO date or None, 'registrar': ...}).
+    whois_lookup(domain, timeout) returns a mapping like python-whois does,
+    so canned responses can be plugged in for testing.
+    """
+    try:
+        entry = whois_lookup(domain, timeout)
+    except Exception as e:
+        # python-whois raises PywhoisError for "no match" answers, socket errors otherwise
+        if 'no match' in str(e).lower() or 'not found' in str(e).lower():
+            return 'negative', {}
+        return 'error', str(e) or type(e).__name__
+    if not entry or not entry.get('domain_name'):
+        return 'negative', {}
+    created = first_date(entry.get('creation_date'))
+    registrar = entry.get('registrar')
+    return 'ok', {
+        'creation_date': created.isoformat() if created else None,
+        'registrar': registrar[0] if isinstance(registrar, list) else registrar
+    }
+
+class DomainReputation:
+    """
+    DOMAIN REPUTATION:
+    Resolves MX and A records and the WHOIS creation date of domains on a
+    thread pool. check() waits at most `budget` seconds for all of them
+    together; lookups still running after that keep going in the background
+    and land in the cache for the next request. Concurrent requests for the
+    same domain share one in-flight lookup.
+    """
+
+    def __init__(self, cache, resolver=None, whois_lookup=python_whois_lookup,
+                 timeout=DOMAIN_LOOKUP_TIMEOUT_SECONDS, budget=DOMAIN_LOOKUP_BUDGET_SECONDS,
+                 max_workers=DOMAIN_LOOKUP_WORKERS):
+        self.cache = cache
+        self.resolver = resolver
+        self.whois_lookup = whois_lookup
+        self.timeout = timeout
+        self.budget = budget
+        self.stats = {'cache_hits': 0, 'lookups': 0, 'pending': 0, 'errors': 0}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='domain-lookup')
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def _lookup(self, domain, kind):
+        try:
+            if kind == 'whois':
+                status, value = lookup_whois(self.whois_lookup, domain, self.timeout)
+            else:
+                if self.resolver is None:
+                    self.resolver = build_resolver()
+                status, value = lookup_dns(self.resolver, domain, kind.upper(), self.timeout)
+        except Exception as e:
+            status, value = 'error', str(e) or type(e).__name__
+        if status == 'error':
+            self.record('errors')
+            logging.warning(f"{kind.upper()} lookup for {domain} failed: {value}")
+        self.cache.put(domain, kind, status, value)
+        return {'status': status, 'value': value, 'checked_at': time.time()}
+
+    def _submit(self, domain, kind):
+        with self._lock:
+            future = self._in_flight.get((domain, kind))
+            if future is None:
+                self.stats['lookups'] += 1
+                future = self._executor.submit(self._lookup, domain, kind)
+                self._in_flight[(domain, kind)] = future
+                future.add_done_callback(lambda _, key=(domain, kind): self._in_flight.pop(key, None))
+            return future
+
+    def record(self, outcome, count=1):
+        with self._lock:
+            self.stats[outcome] += count
+
+    def check(self, domains, budget=None):
+        """
+        Returns {domain: {kind: entry or None}}; None means the lookup did not
+        finish within the budget.
+        """
+        budget = self.budget if budget is None else budget
+        results = {domain: {} for domain in domains}
+        futures = {}
+        for domain in domains:
+            for kind in LOOKUP_KINDS:
+                entry = self.cache.get(domain, kind)
+                if entry is not None:
+                    self.record('cache_hits')
+                    results[domain][kind] = entry
+                else:
+                    futures[self._submit(domain, kind)] = (domain, kind)
+
+        if futures:
+            done, not_done = wait(futures, timeout=budget)
+            for future in done:
+                domain, kind = futures[future]
+                results[domain][kind] = future.result()
+            for future in not_done:
+                domain, kind = futures[future]
+                results[domain][kind] = None
+            if not_done:
+                self.record('pending', len(not_done))
+        return results
+
+_default_reputation = None
+_default_lock = threading.Lock()
+_lookups_enabled = DOMAIN_REPUTATION_ENABLED
+
+def set_lookups_enabled(enabled):
+    """
+    Turns the lookups on or off for this process, e.g. for batch runs whose
+    verdicts must not depend on the network
+    """
+    global _lookups_enabled
+    _lookups_enabled = bool(enabled)
+
+def lookups_enabled():
+    return _lookups_enabled
+
+def get_default_reputation():
+    global _default_reputation
+    if not _lookups_enabled:
+        return None
+    with _default_lock:
+        if _default_reputation is None:
+            # Without a cache file the cache lives in memory for the life of the process
+            _default_reputation = DomainReputation(DomainCache(DOMAIN_CACHE_DB or ':memory:'))
+        return _default_reputation
@@ -0,0 +1,100 @@
+import numpy as np
+from values import HASHING_N_FEATURES, POOL_TEXT_FEATURES, POOL_CAT_FEATURES
+
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+class HashingTfidfFeaturizer:
+    """
+    HASHING FEATURIZER:
+    TF-IDF over hashed term counts. There is no vocabulary: terms map to one
+    of n_features columns by hash, and IDF comes from per-column document
+    frequencies that partial_fit() keeps updating, so the featurizer can
+    learn from a stream of postings in fixed memory. Weighting matches
+    TfidfVectorizer's defaults (raw counts, smoothed IDF, L2 norm).
+    """
+
+    def __init__(self, n_features=HASHING_N_FEATURES, token_pattern=TOKEN_PATTERN, lowercase=True):
+        # sklearn is imported here so Pool-mode serving never loads it
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.n_features = n_features
+        self.token_pattern = token_pattern
+        self.lowercase = lowercase
+        self.document_frequencies = np.zeros(n_features, dtype=np.int64)
+        self.n_documents = 0
+        self._hasher = HashingVectorizer(n_features=n_features, token_pattern=token_pattern, lowercase=lowercase,
+                                         alternate_sign=False, norm=None, dtype=np.float64)
+
+    def term_counts(self, texts):
+        return self._hasher.transform(texts)
+
+    def partial_fit(self, texts):
+        counts = self.term_counts(texts)
+        if not self.document_frequencies.flags.writeable:
+            # Loaded from a memory map; take a private copy before updating
+            self.document_frequencies = np.array(self.document_frequencies)
+        # CSR rows hold each column at most once, so counting indices counts documents
+        self.document_frequencies += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_documents += counts.shape[0]
+        return self
+
+    def fit(self, texts):
+        self.document_frequencies = np.zeros(self.n_features, dtype=np.int64)
+        self.n_documents = 0
+        return self.partial_fit(texts)
+
+    @property
+    def idf_(self):
+        return np.log((1 + self.n_documents) / (1 + self.document_frequencies)) + 1
+
+    def weight(self, counts):
+        from sklearn.preprocessing import normalize
+
+        counts.data *= self.idf_[counts.indices]
+        return normalize(counts, norm='l2', copy=False)
+
+    def transform(self, texts):
+        return self.weight(self.term_counts(texts))
+
+    def fit_transform(self, texts):
+        counts = self.term_counts(texts)
+        self.document_frequencies = np.bincount(counts.indices, minlength=self.n_features).astype(np.int64)
+        self.n_documents = counts.shape[0]
+        return self.weight(counts)
+
+def column_value(value):
+    # Missing values (None, NaN from pandas) become '' so CatBoost sees one "missing" token/category
+    if value is None or value != value:
+        return ''
+    return str(value).strip()
+
+class CatBoostPoolFeaturizer:
+    """
+    POOL FEATURIZER:
+    Passes posting columns to CatBoost as-is in a Pool: free text as
+    text_features (tokenized and featurized inside CatBoost) and structured
+    columns as cat_features. It takes posting dicts rather than the combined
+    text and has nothing to fit.
+    """
+
+    uses_postings = True
+
+    def __init__(self, text_features=POOL_TEXT_FEATURES, cat_features=POOL_CAT_FEATURES):
+        self.text_features = list(text_features)
+        self.cat_features = list(cat_features)
+
+    @property
+    def input_fields(self):
+        return self.text_features + self.cat_features
+
+    def transform(self, postings, label=None):
+        from catboost import Pool
+
+        rows = [[column_value(posting.get(field)) for field in self.input_fields] for posting in postings]
+        n_text = len(self.text_features)
+        return Pool(rows, label=label, feature_names=self.input_fields,
+                    text_features=list(range(n_text)),
+                    cat_features=list(range(n_text, n_text + len(self.cat_features))))
+
+    def fit_transform(self, postings, label=None):
+        return self.transform(postings, label)
@@ -0,0 +1,179 @@
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Seconds; /predict stages range from microseconds (phrase scan) to seconds (cold model load)
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+                   0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        # Unlabeled counters are exported as 0 before the first increment
+        self._values = {} if self.label_names else {(): 0}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f'{self.name}{format_labels(self.label_names, key)} {format_value(value)}')
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels.get(name, '') for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+                    break
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            series_items = sorted((key, dict(series, counts=list(series['counts'])))
+                                  for key, series in self._series.items())
+        for key, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                labels = format_labels(self.label_names, key, [('le', format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.label_names, key, [('le', '+Inf')])
+            lines.append(f'{self.name}_bucket{labels} {series["count"]}')
+            lines.append(f'{self.name}_sum{format_labels(self.label_names, key)} {format_value(series["sum"])}')
+            lines.append(f'{self.name}_count{format_labels(self.label_names, key)} {series["count"]}')
+        return lines
+
+class CallbackMetric:
+    """
+    Counter or gauge whose values are read from existing stats (e.g. the
+    result cache) when /metrics is scraped. fn returns {label_tuple: value}.
+    """
+
+    def __init__(self, name, help_text, metric_type, fn, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.metric_type = metric_type
+        self.fn = fn
+        self.label_names = tuple(label_names)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.metric_type}']
+        for key, value in sorted(self.fn().items()):
+            lines.append(f'{self.name}{format_labels(self.label_names, key)} {format_value(value)}')
+        return lines
+
+class MetricsRegistry:
+    """
+    METRICS:
+    In-process counters and histograms rendered in the Prometheus text
+    exposition format. Each worker process keeps its own values.
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self.register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, label_names, buckets))
+
+    def callback(self, name, help_text, metric_type, fn, label_names=()):
+        return self.register(CallbackMetric(name, help_text, metric_type, fn, label_names))
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception as e:
+                lines.append(f'# {metric.name} unavailable: {e}')
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'fakejob_stage_seconds', 'Time spent in each stage of the scoring path', ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'fakejob_request_seconds', 'HTTP request latency by endpoint', ['endpoint', 'status'])
+PREDICTIONS = REGISTRY.counter(
+    'fakejob_predictions_total', 'Scored postings by model and final verdict',
+    ['model_prediction', 'final_prediction'])
+OVERRIDES = REGISTRY.counter(
+    'fakejob_overrides_total', 'Postings whose CatBoost verdict was overridden by the rule engine')
+RULE_CHECKS = REGISTRY.counter(
+    'fakejob_rule_checks_total', 'Rule-engine checks run or skipped once the verdict was settled',
+    ['check', 'outcome'])
+RULE_HITS = REGISTRY.counter(
+    'fakejob_rule_hits_total', 'Postings matched by each rule of the rule definitions file', ['rule'])
+RULE_SECONDS = REGISTRY.counter(
+    'fakejob_rule_seconds_total', 'Time spent evaluating each rule of the rule definitions file', ['rule'])
+
+@contextmanager
+def time_stage(stage):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+def timed_stage(stage):
+    """
+    Decorator form of time_stage
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+        return wrapper
+    return decorator
+
+def record_prediction(result):
+    PREDICTIONS.inc(model_prediction=result['model_prediction'], final_prediction=result['final_prediction'])
+    if result['override_applied']:
+        OVERRIDES.inc()
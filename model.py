@@ -1,30 +1,100 @@
+import argparse
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from catboost import CatBoostClassifier
 from sklearn.feature_extraction.text import TfidfVectorizer
 import joblib
+from artifacts import save_native_artifacts
+from featurizers import HashingTfidfFeaturizer, CatBoostPoolFeaturizer
+from scoring import file_sha256
+from values import FEATURIZER, HASHING_N_FEATURES, MODEL_FILE, VECTORIZER_FILE
 
-df = pd.read_csv('Jobs.csv')
+text_features = ['job_title', 'job_description', 'requirements', 'benefits']
 
+CATBOOST_PARAMS = {
+    'iterations': 500,
+    'learning_rate': 0.1,
+    'depth': 6,
+    'random_seed': 42
+}
 
-text_features = ['job_title', 'job_description', 'requirements', 'benefits']
-df['combined_text'] = df[text_features].apply(lambda x: ' '.join(x.dropna().astype(str)), axis=1)
-X = df['combined_text']
-y = df['is_real']
+def load_dataset(path='Jobs.csv'):
+    df = pd.read_csv(path)
+    df['combined_text'] = df[text_features].apply(lambda x: ' '.join(x.dropna().astype(str)), axis=1)
+    return df
+
+def build_featurizer(featurizer=FEATURIZER):
+    if featurizer == 'hashing':
+        return HashingTfidfFeaturizer(n_features=HASHING_N_FEATURES)
+    if featurizer == 'catboost':
+        return CatBoostPoolFeaturizer()
+    return TfidfVectorizer(max_features=1000)
+
+def featurize_frame(vectorizer, df):
+    if getattr(vectorizer, 'uses_postings', False):
+        return vectorizer.transform(df.to_dict('records'))
+    return vectorizer.transform(df['combined_text'])
+
+def fit_model(df, featurizer=FEATURIZER, verbose=0):
+    """
+    Fits a fresh featurizer and CatBoost on every row of df (no split)
+    """
+    vectorizer = build_featurizer(featurizer)
+    model = CatBoostClassifier(**CATBOOST_PARAMS, verbose=verbose)
+    if getattr(vectorizer, 'uses_postings', False):
+        model.fit(vectorizer.fit_transform(df.to_dict('records'), label=df['is_real'].tolist()))
+    else:
+        model.fit(vectorizer.fit_transform(df['combined_text']), df['is_real'])
+    return model, vectorizer
+
+def train(df, featurizer=FEATURIZER, verbose=100):
+    """
+    Fits the featurizer and CatBoost on an 80/20 split (random_state=42) and
+    returns (model, vectorizer, X_test, y_test)
+    """
+    vectorizer = build_featurizer(featurizer)
+    model = CatBoostClassifier(**CATBOOST_PARAMS, verbose=verbose)
+
+    if getattr(vectorizer, 'uses_postings', False):
+        # Same rows as the TF-IDF split: train_test_split permutes by row count and seed only
+        train_df, test_df = train_test_split(df, test_size=0.2, random_state=42)
+        model.fit(vectorizer.fit_transform(train_df.to_dict('records'), label=train_df['is_real'].tolist()))
+        return model, vectorizer, vectorizer.transform(test_df.to_dict('records')), test_df['is_real']
+
+    X_vec = vectorizer.fit_transform(df['combined_text'])
+
+    X_train, X_test, y_train, y_test = train_test_split(X_vec, df['is_real'], test_size=0.2, random_state=42)
+
+    model.fit(X_train, y_train)
+    return model, vectorizer, X_test, y_test
 
+def evaluate_model(model, X, y):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
 
-vectorizer = TfidfVectorizer(max_features=1000)
-X_vec = vectorizer.fit_transform(X)
+    probabilities = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    predictions = (probabilities >= 0.5).astype(int)
+    metrics = {
+        'samples': int(len(y)),
+        'accuracy': float(accuracy_score(y, predictions)),
+        'precision': float(precision_score(y, predictions, zero_division=0)),
+        'recall': float(recall_score(y, predictions, zero_division=0)),
+        'f1': float(f1_score(y, predictions, zero_division=0))
+    }
+    # AUC is undefined when the evaluation set holds a single class
+    metrics['auc'] = float(roc_auc_score(y, probabilities)) if len(set(y)) > 1 else None
+    return metrics
 
-X_train, X_test, y_train, y_test = train_test_split(X_vec, y, test_size=0.2, random_state=42)
+def main():
+    parser = argparse.ArgumentParser(description='Train the CatBoost job classifier')
+    parser.add_argument('--data', default='Jobs.csv')
+    parser.add_argument('--featurizer', choices=['tfidf', 'hashing', 'catboost'], default=FEATURIZER)
+    args = parser.parse_args()
 
-model = CatBoostClassifier(iterations=500, 
-                          learning_rate=0.1, 
-                          depth=6, 
-                          random_seed=42,
-                          verbose=100)
-model.fit(X_train, y_train)
+    model, vectorizer, _, _ = train(load_dataset(args.data), args.featurizer)
 
+    joblib.dump(model, MODEL_FILE)
+    joblib.dump(vectorizer, VECTORIZER_FILE)
+    save_native_artifacts(model, vectorizer, source_model_sha256=file_sha256(MODEL_FILE))
 
-joblib.dump(model, 'job_model_catboost.pkl')
-joblib.dump(vectorizer, 'vectorizer_catboost.pkl')
\ No newline at end of file
+if __name__ == '__main__':
+    main()
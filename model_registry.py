@@ -0,0 +1,173 @@
+import argparse
+import json
+import logging
+import os
+import shutil
+import time
+from artifacts import save_native_artifacts, load_native_artifacts, METADATA_FILE
+from scoring import file_sha256, load_calibration
+from values import MODEL_REGISTRY_DIR, MODEL_FILE, VECTORIZER_FILE, CALIBRATION_FILE
+
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+VERSION_CALIBRATION_FILE = 'calibration.json'
+REPORT_FILE = 'report.json'
+
+class RegistryError(Exception):
+    pass
+
+def versions_dir(registry_dir=MODEL_REGISTRY_DIR):
+    return os.path.join(registry_dir, 'versions')
+
+def version_dir(version, registry_dir=MODEL_REGISTRY_DIR):
+    return os.path.join(versions_dir(registry_dir), version)
+
+def list_versions(registry_dir=MODEL_REGISTRY_DIR):
+    directory = versions_dir(registry_dir)
+    if not os.path.isdir(directory):
+        return []
+    return sorted(name for name in os.listdir(directory)
+                  if not name.startswith('.') and os.path.isfile(os.path.join(directory, name, MANIFEST_FILE)))
+
+def read_manifest(version, registry_dir=MODEL_REGISTRY_DIR):
+    path = os.path.join(version_dir(version, registry_dir), MANIFEST_FILE)
+    if not os.path.isfile(path):
+        raise RegistryError(f"Unknown model version: {version}")
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def current_version(registry_dir=MODEL_REGISTRY_DIR):
+    try:
+        with open(os.path.join(registry_dir, CURRENT_FILE), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def activate(version, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    Points CURRENT at version. The pointer is replaced atomically, so readers
+    see either the old or the new version, never a partial write.
+    """
+    verify_version(version, registry_dir)
+    pointer = os.path.join(registry_dir, CURRENT_FILE)
+    temp_pointer = f"{pointer}.{os.getpid()}.tmp"
+    with open(temp_pointer, 'w', encoding='utf-8') as f:
+        f.write(version)
+    os.replace(temp_pointer, pointer)
+    logging.info(f"Activated model version {version}")
+
+def verify_version(version, registry_dir=MODEL_REGISTRY_DIR):
+    manifest = read_manifest(version, registry_dir)
+    directory = version_dir(version, registry_dir)
+    for name, expected in manifest['files'].items():
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            raise RegistryError(f"Model version {version} is missing {name}")
+        if file_sha256(path) != expected:
+            raise RegistryError(f"Checksum mismatch for {name} in model version {version}")
+    return manifest
+
+def register(model, vectorizer, version=None, calibration=None, source_model_sha256=None,
+             metrics=None, report=None, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    VERSIONED REGISTRY:
+    Writes a model/vectorizer pair (native format) with a manifest of file
+    checksums into versions/<version>/. The version is built in a staging
+    directory and renamed into place, so a half-written version is never
+    visible. Returns the manifest; the version is not activated.
+    """
+    version = version or time.strftime('%Y%m%d-%H%M%S')
+    final_dir = version_dir(version, registry_dir)
+    if os.path.exists(final_dir):
+        raise RegistryError(f"Model version {version} already exists")
+    staging_dir = os.path.join(versions_dir(registry_dir), f".staging-{version}-{os.getpid()}")
+    os.makedirs(staging_dir)
+    try:
+        metadata = save_native_artifacts(model, vectorizer, staging_dir, source_model_sha256)
+        files = dict(metadata['files'])
+        files[METADATA_FILE] = file_sha256(os.path.join(staging_dir, METADATA_FILE))
+        if calibration:
+            with open(os.path.join(staging_dir, VERSION_CALIBRATION_FILE), 'w', encoding='utf-8') as f:
+                json.dump(calibration, f, indent=2)
+            files[VERSION_CALIBRATION_FILE] = file_sha256(os.path.join(staging_dir, VERSION_CALIBRATION_FILE))
+        if report:
+            with open(os.path.join(staging_dir, REPORT_FILE), 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            files[REPORT_FILE] = file_sha256(os.path.join(staging_dir, REPORT_FILE))
+        manifest = {
+            'version': version,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'source_model_sha256': source_model_sha256,
+            'metrics': metrics or {},
+            'files': files
+        }
+        with open(os.path.join(staging_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.rename(staging_dir, final_dir)
+    except Exception:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+    logging.info(f"Registered model version {version}")
+    return manifest
+
+def register_pickles(model_path=MODEL_FILE, vectorizer_path=VECTORIZER_FILE, version=None,
+                     registry_dir=MODEL_REGISTRY_DIR):
+    import joblib
+
+    model_sha256 = file_sha256(model_path)
+    # calibration.json is carried over only if it was fitted for this model
+    calibration = load_calibration(CALIBRATION_FILE, model_sha256=model_sha256)
+    return register(joblib.load(model_path), joblib.load(vectorizer_path), version, calibration,
+                    model_sha256, registry_dir=registry_dir)
+
+def load_version(version, registry_dir=MODEL_REGISTRY_DIR):
+    """
+    Verifies the checksums of a version and returns (model, vectorizer, calibration, manifest)
+    """
+    manifest = verify_version(version, registry_dir)
+    directory = version_dir(version, registry_dir)
+    model, vectorizer, _ = load_native_artifacts(directory)
+    calibration = None
+    if VERSION_CALIBRATION_FILE in manifest['files']:
+        with open(os.path.join(directory, VERSION_CALIBRATION_FILE), encoding='utf-8') as f:
+            calibration = json.load(f)
+    return model, vectorizer, calibration, manifest
+
+def main():
+    parser = argparse.ArgumentParser(description='Versioned model registry')
+    parser.add_argument('--registry', default=MODEL_REGISTRY_DIR)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    register_parser = subparsers.add_parser('register', help='Register the joblib pickles as a new version')
+    register_parser.add_argument('--model', default=MODEL_FILE)
+    register_parser.add_argument('--vectorizer', default=VECTORIZER_FILE)
+    register_parser.add_argument('--version', help='Version name (default: timestamp)')
+    register_parser.add_argument('--activate', action='store_true', help='Make it the current version')
+    activate_parser = subparsers.add_parser('activate', help='Switch running workers to a version')
+    activate_parser.add_argument('version')
+    subparsers.add_parser('list', help='List versions')
+    verify_parser = subparsers.add_parser('verify', help='Check the checksums of a version')
+    verify_parser.add_argument('version')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        if args.command == 'register':
+            manifest = register_pickles(args.model, args.vectorizer, args.version, args.registry)
+            if args.activate:
+                activate(manifest['version'], args.registry)
+        elif args.command == 'activate':
+            activate(args.version, args.registry)
+        elif args.command == 'list':
+            current = current_version(args.registry)
+            for version in list_versions(args.registry):
+                manifest = read_manifest(version, args.registry)
+                marker = '*' if version == current else ' '
+                print(f"{marker} {version}  created={manifest['created_at']}  metrics={json.dumps(manifest['metrics'])}")
+        elif args.command == 'verify':
+            verify_version(args.version, args.registry)
+            logging.info(f"Model version {args.version} is intact")
+    except RegistryError as e:
+        parser.exit(1, f"error: {e}\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+import numpy as np
+from values import (
+    NEAR_DUPLICATE_ENABLED, NEAR_DUPLICATE_DB, NEAR_DUPLICATE_NUM_PERM, NEAR_DUPLICATE_BANDS,
+    NEAR_DUPLICATE_SHINGLE_SIZE, NEAR_DUPLICATE_THRESHOLD, NEAR_DUPLICATE_MIN_TOKENS,
+    NEAR_DUPLICATE_SEED_FILES, NEAR_DUPLICATE_REFRESH_SECONDS, SUBMISSIONS_DB
+)
+
+TEXT_FIELDS = ('job_title', 'job_description', 'requirements', 'benefits')
+# Source of submissions reviewed as fake
+LABELED_SOURCE = 'labeled_submission'
+TOKEN_RE = re.compile(r'\w+')
+
+# Odd multipliers that mix the token hashes of a shingle into one 64-bit value
+SHINGLE_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+
+def posting_text(job_data):
+    return ' '.join(str(job_data.get(field) or '') for field in TEXT_FIELDS)
+
+def shingle_hashes(text, size=NEAR_DUPLICATE_SHINGLE_SIZE):
+    """
+    Distinct 64-bit hashes of the word `size`-grams of the lowercased text,
+    or None when the text is too short to compare meaningfully. Each word is
+    hashed once; shingle hashes are combined from them with array arithmetic.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < max(NEAR_DUPLICATE_MIN_TOKENS, size):
+        return None
+    # crc32 rather than hash(): signatures are persisted, so hashes must not change between processes
+    token_hashes = np.fromiter((zlib.crc32(token.encode('utf-8')) for token in tokens),
+                               dtype=np.uint64, count=len(tokens))
+    count = len(tokens) - size + 1
+    combined = np.zeros(count, dtype=np.uint64)
+    for offset in range(size):
+        # uint64 arithmetic wraps around, which is what the mixing relies on
+        combined += token_hashes[offset:offset + count] * np.uint64(SHINGLE_MULTIPLIERS[offset % len(SHINGLE_MULTIPLIERS)])
+    return np.unique(combined)
+
+class MinHasher:
+    """
+    MINHASH:
+    num_perm random multiply-shift hash functions h(x) = (a * x + b) >> 32
+    over 64-bit integers; the signature is the minimum of each over the
+    shingle hashes. The fraction of equal positions in two signatures
+    estimates the Jaccard similarity of the shingle sets. The seed is fixed
+    so stored signatures stay comparable.
+    """
+
+    def __init__(self, num_perm=NEAR_DUPLICATE_NUM_PERM, seed=1):
+        generator = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self._a = generator.randint(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._b = generator.randint(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        with np.errstate(over='ignore'):
+            return ((np.outer(hashes, self._a) + self._b) >> np.uint64(32)).min(axis=0).astype(np.uint32)
+
+class NearDuplicateIndex:
+    """
+    NEAR-DUPLICATE INDEX:
+    MinHash signatures of known scam postings, split into `bands` bands
+    whose hashes are LSH buckets, so a query only compares against postings
+    sharing at least one band. Entries are stored in SQLite; each process
+    keeps the buckets in memory and picks up rows added by other processes
+    every NEAR_DUPLICATE_REFRESH_SECONDS.
+    """
+
+    def __init__(self, db_path=NEAR_DUPLICATE_DB, num_perm=NEAR_DUPLICATE_NUM_PERM, bands=NEAR_DUPLICATE_BANDS,
+                 threshold=NEAR_DUPLICATE_THRESHOLD):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = {}
+        self._entries = {}
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS postings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text_key TEXT UNIQUE,
+                source TEXT,
+                title TEXT,
+                company TEXT,
+                signature BLOB,
+                added_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+        self._db.commit()
+        self.refresh()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    @property
+    def generation(self):
+        # Changes whenever rows are added, so results that depend on the index can be cached per generation
+        return self._last_id
+
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes()
+
+    def refresh(self):
+        """
+        Loads rows added since the last refresh (by this or another process)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT id, source, title, company, signature FROM postings WHERE id > ? ORDER BY id',
+                (self._last_id,)).fetchall()
+            for posting_id, source, title, company, signature in rows:
+                signature = np.frombuffer(signature, dtype=np.uint32)
+                self._signatures[posting_id] = signature
+                self._entries[posting_id] = {'source': source, 'title': title, 'company': company}
+                for key in self._band_keys(signature):
+                    self._buckets.setdefault(key, []).append(posting_id)
+                self._last_id = posting_id
+            self._refreshed_at = time.monotonic()
+        return len(rows)
+
+    def refresh_if_due(self):
+        if time.monotonic() - self._refreshed_at >= NEAR_DUPLICATE_REFRESH_SECONDS:
+            self.refresh()
+
+    def add_many(self, postings, source):
+        """
+        Adds postings (job dicts); exact repeats of an indexed text are
+        skipped. Returns the number added.
+        """
+        now = time.time()
+        rows = []
+        for job_data in postings:
+            text = posting_text(job_data)
+            hashes = shingle_hashes(text)
+            if hashes is None:
+                continue
+            rows.append((hashlib.sha256(text.encode('utf-8')).hexdigest(), source,
+                         str(job_data.get('job_title') or ''), str(job_data.get('company_name') or ''),
+                         self.hasher.signature(hashes).tobytes(), now))
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._db.total_changes
+            with self._db:
+                self._db.executemany('INSERT OR IGNORE INTO postings (text_key, source, title, company, signature, '
+                                     'added_at) VALUES (?, ?, ?, ?, ?, ?)', rows)
+            added = self._db.total_changes - before
+        self.refresh()
+        return added
+
+    def query(self, job_data, threshold=None):
+        """
+        Returns the most similar indexed posting with estimated Jaccard
+        similarity >= threshold as {'source', 'title', 'company', 'similarity'},
+        or None
+        """
+        return self.query_text(posting_text(job_data), threshold)
+
+    def query_text(self, text, threshold=None):
+        threshold = self.threshold if threshold is None else threshold
+        self.refresh_if_due()
+        hashes = shingle_hashes(text)
+        if hashes is None:
+            return None
+        signature = self.hasher.signature(hashes)
+        with self._lock:
+            candidates = set()
+            for key in self._band_keys(signature):
+                candidates.update(self._buckets.get(key, ()))
+            best_id, best_similarity = None, threshold
+            for posting_id in candidates:
+                similarity = float(np.count_nonzero(self._signatures[posting_id] == signature)) / signature.size
+                if similarity >= best_similarity:
+                    best_id, best_similarity = posting_id, similarity
+            if best_id is None:
+                return None
+            return {**self._entries[best_id], 'similarity': round(best_similarity, 2)}
+
+    def get_state(self, key, default=None):
+        with self._lock:
+            row = self._db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        with self._lock, self._db:
+            self._db.execute('INSERT OR REPLACE INTO state VALUES (?, ?)', (key, json.dumps(value)))
+
+def read_fake_postings(path):
+    """
+    Fake (is_real == 0) rows of a labeled CSV or JSON array of postings
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            postings = list(csv.DictReader(f))
+    else:
+        with open(path, encoding='utf-8') as f:
+            postings = json.load(f)
+    return [job_data for job_data in postings if str(job_data.get('is_real', '')).strip() in ('0', '0.0')]
+
+def seed(index, paths=NEAR_DUPLICATE_SEED_FILES):
+    added = 0
+    for path in paths:
+        try:
+            added += index.add_many(read_fake_postings(path), path)
+        except OSError as e:
+            logging.warning(f"Could not seed the near-duplicate index from {path}: {e}")
+    index.set_state('seeded_from', list(paths))
+    return added
+
+def add_labeled_submissions(index, db_path=SUBMISSIONS_DB):
+    """
+    Adds submissions reviewed as fake (submission_store.set_label) since the
+    last call. Only reviewed labels are trusted: the app's own verdicts would
+    let one false positive flag every later copy of the posting.
+    """
+    if not db_path or not os.path.exists(db_path):
+        return 0
+    from submission_store import connect
+
+    labeled_after = index.get_state('submissions_labeled_at', 0)
+    columns = ', '.join(f'"{field}"' for field in TEXT_FIELDS + ('company_name',))
+    connection = connect(db_path)
+    try:
+        rows = connection.execute(f'SELECT labeled_at, {columns} FROM submissions '
+                                  'WHERE label = 0 AND COALESCE(labeled_at, 0) >= ?', (labeled_after,)).fetchall()
+    finally:
+        connection.close()
+    if not rows:
+        return 0
+    fields = TEXT_FIELDS + ('company_name',)
+    added = index.add_many([dict(zip(fields, row[1:])) for row in rows], LABELED_SOURCE)
+    index.set_state('submissions_labeled_at', max(row[0] or 0 for row in rows))
+    return added
+
+_default_index = None
+_default_lock = threading.Lock()
+
+def get_default_index():
+    """
+    The process-wide index, seeded from the labeled datasets the first time
+    the database is created, plus the submissions reviewed as fake
+    """
+    global _default_index
+    if not NEAR_DUPLICATE_ENABLED:
+        return None
+    with _default_lock:
+        if _default_index is None:
+            index = NearDuplicateIndex(NEAR_DUPLICATE_DB or ':memory:')
+            if index.get_state('seeded_from') is None:
+                added = seed(index)
+                logging.info(f"Seeded the near-duplicate index with {added} known scam postings")
+            add_labeled_submissions(index)
+            _default_index = index
+        return _default_index
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate index of known scam postings')
+    parser.add_argument('--db', default=NEAR_DUPLICATE_DB)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    seed_parser = subparsers.add_parser('seed', help='Add the fake rows of labeled datasets')
+    seed_parser.add_argument('paths', nargs='*', default=NEAR_DUPLICATE_SEED_FILES)
+    query_parser = subparsers.add_parser('query', help='Find the closest known scam for postings in a JSON array')
+    query_parser.add_argument('path')
+    query_parser.add_argument('--threshold', type=float, default=NEAR_DUPLICATE_THRESHOLD)
+    subparsers.add_parser('sync', help='Add the submissions reviewed as fake since the last sync')
+    subparsers.add_parser('stats', help='Number of indexed postings')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    index = NearDuplicateIndex(args.db)
+    if args.command == 'seed':
+        logging.info(f"Added {seed(index, args.paths)} postings; {len(index)} indexed")
+    elif args.command == 'sync':
+        logging.info(f"Added {add_labeled_submissions(index)} labeled submissions; {len(index)} indexed")
+    elif args.command == 'query':
+        with open(args.path, encoding='utf-8') as f:
+            postings = json.load(f)
+        for job_data in postings:
+            match = index.query(job_data, args.threshold)
+            print(json.dumps({'job_title': job_data.get('job_title', ''), 'match': match}))
+    elif args.command == 'stats':
+        print(json.dumps({'postings': len(index), 'bands': index.bands, 'rows_per_band': index.rows_per_band,
+                          'seeded_from': index.get_state('seeded_from')}))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+from collections import deque
+
+class PhraseIndex:
+    """
+    PHRASE INDEX:
+    Aho-Corasick automaton over every phrase table. Built once at import and
+    finds all (possibly overlapping) phrase occurrences in one pass over the text.
+    Matching is plain substring matching, the same as `phrase in text.lower()`.
+    """
+
+    def __init__(self, tables):
+        # tables: {category: [phrase, ...]}
+        self.categories = tuple(tables)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+        for category, phrases in tables.items():
+            for phrase in phrases:
+                self._add(phrase.lower(), category)
+        self._build_failure_links()
+
+    def _add(self, phrase, category):
+        if not phrase:
+            return
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        if (category, phrase) not in self._output[state]:
+            self._output[state] = self._output[state] + ((category, phrase),)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # Inherit matches that end at the failure state
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def scan(self, text):
+        """
+        Returns {category: set(phrases)} for every phrase found in the text
+        """
+        hits = {category: set() for category in self.categories}
+        if not text:
+            return hits
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        state = 0
+        for char in text.lower():
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                for category, phrase in output[state]:
+                    hits[category].add(phrase)
+        return hits
@@ -0,0 +1,635 @@
+import importlib
+import json
+import re
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlparse
+from values import *
+from verify import enhanced_scam_detection, find_phrases, PostingContext, posting_context, RULE_PLAN
+from scoring import compute_score, load_calibration, rank_issues, rank_reasons, file_sha256
+from result_cache import ResultCache, posting_cache_key
+from metrics import REGISTRY, time_stage, record_prediction
+from artifacts import has_native_artifacts, load_native_artifacts
+from model_registry import RegistryError, current_version, load_version
+from near_duplicates import get_default_index
+from domain_reputation import lookups_enabled
+
+_artifacts = None
+_artifacts_lock = threading.Lock()
+_reload_lock = threading.Lock()
+_load_state = {'status': 'not_started', 'error': None, 'timings_ms': {}}
+_reload_state = {'checked_at': 0.0, 'failed_version': None}
+_loader_thread = None
+
+result_cache = ResultCache(RESULT_CACHE_SIZE, RESULT_CACHE_TTL_SECONDS, RESULT_CACHE_DB)
+
+REGISTRY.callback('fakejob_result_cache_lookups_total', 'Result cache lookups by outcome', 'counter',
+                  lambda: {(outcome,): result_cache.stats[outcome] for outcome in ('hits', 'misses', 'disk_hits')},
+                  ['outcome'])
+REGISTRY.callback('fakejob_result_cache_entries', 'Entries in the in-process result cache', 'gauge',
+                  lambda: {(): result_cache.snapshot()['entries']})
+
+def timed(timings, name, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+def cache_fields(vectorizer):
+    # Pool-mode models read structured columns too, so those must be part of the cache key
+    extra_fields = [field for field in getattr(vectorizer, 'input_fields', []) if field not in VERDICT_FIELDS]
+    return VERDICT_FIELDS + extra_fields
+
+def featurize(vectorizer, postings, texts=None):
+    # texts: the postings' combined text when the caller already has it (PostingContext.text)
+    if getattr(vectorizer, 'uses_postings', False):
+        return vectorizer.transform(postings)
+    if texts is None:
+        texts = [build_combined_text(job_data) for job_data in postings]
+    return vectorizer.transform(texts)
+
+def load_registry_version(version, timings):
+    model, vectorizer, calibration, manifest = timed(timings, 'registry_version', load_version, version, MODEL_REGISTRY_DIR)
+    return {
+        'model': model,
+        'vectorizer': vectorizer,
+        'calibration': calibration,
+        # Cached results are only valid for the model, vectorizer and calibration that produced them
+        'cache_namespace': ':'.join([version] + [manifest['files'][name] for name in sorted(manifest['files'])]),
+        'format': 'registry',
+        'version': version,
+        'cache_fields': cache_fields(vectorizer)
+    }
+
+def load_unversioned(timings):
+    artifact_format = ARTIFACT_FORMAT
+    if artifact_format == 'auto':
+        artifact_format = 'native' if has_native_artifacts(NATIVE_ARTIFACTS_DIR) else 'pickle'
+
+    if artifact_format == 'native':
+        model, vectorizer, metadata = timed(timings, 'native_artifacts', load_native_artifacts, NATIVE_ARTIFACTS_DIR)
+        model_sha256 = metadata['source_model_sha256']
+        fingerprint = [metadata['files'][name] for name in sorted(metadata['files'])]
+    else:
+        joblib = timed(timings, 'import_joblib', importlib.import_module, 'joblib')
+        model = timed(timings, 'model', joblib.load, MODEL_FILE)
+        vectorizer = timed(timings, 'vectorizer', joblib.load, VECTORIZER_FILE)
+        model_sha256 = None
+        fingerprint = [file_sha256(MODEL_FILE), file_sha256(VECTORIZER_FILE)]
+
+    calibration = timed(timings, 'calibration', load_calibration, CALIBRATION_FILE, MODEL_FILE, model_sha256)
+    return {
+        'model': model,
+        'vectorizer': vectorizer,
+        'calibration': calibration,
+        'cache_namespace': ':'.join(fingerprint + [json.dumps(calibration, sort_keys=True)]),
+        'format': artifact_format,
+        'version': f"{artifact_format}-{fingerprint[0][:12]}",
+        'cache_fields': cache_fields(vectorizer)
+    }
+
+def load_artifacts():
+    """
+    MODEL ARTIFACTS:
+    Returns the model, vectorizer and calibration in use, loading them on
+    first use: the current model registry version if there is one, else the
+    native artifacts or the joblib pickles. joblib/sklearn/catboost are only
+    imported here, so importing this module stays cheap.
+    """
+    global _artifacts
+    if _artifacts is not None:
+        check_for_new_version()
+        return _artifacts
+    with _artifacts_lock:
+        if _artifacts is not None:
+            return _artifacts
+        _load_state['status'] = 'loading'
+        timings = _load_state['timings_ms']
+        try:
+            version = current_version(MODEL_REGISTRY_DIR)
+            artifacts = load_registry_version(version, timings) if version else load_unversioned(timings)
+        except Exception as e:
+            _load_state['status'] = 'failed'
+            _load_state['error'] = str(e)
+            logging.error(f"Failed to load model artifacts: {e}")
+            raise
+
+        _artifacts = artifacts
+        _load_state['status'] = 'ready'
+        _load_state['error'] = None
+        logging.info(f"Model artifacts {artifacts['version']} loaded: {timings}")
+    return _artifacts
+
+def reload_artifacts(version=None):
+    """
+    HOT SWAP:
+    Loads a registry version (default: the one CURRENT points at) next to the
+    one in use and swaps them in a single assignment. Requests that already
+    hold the old artifacts finish with them; on failure nothing changes.
+    """
+    global _artifacts
+    with _reload_lock:
+        version = version or current_version(MODEL_REGISTRY_DIR)
+        if not version:
+            raise RegistryError("No model version is active in the registry")
+        if _artifacts is not None and _artifacts['version'] == version:
+            return version
+        artifacts = load_registry_version(version, {})
+        _artifacts = artifacts
+        _reload_state['failed_version'] = None
+    logging.info(f"Swapped to model version {version}")
+    return version
+
+def check_for_new_version():
+    # Throttled: at most one small file read per MODEL_RELOAD_CHECK_SECONDS per process
+    now = time.monotonic()
+    if now - _reload_state['checked_at'] < MODEL_RELOAD_CHECK_SECONDS:
+        return
+    _reload_state['checked_at'] = now
+    version = current_version(MODEL_REGISTRY_DIR)
+    if not version or version == _artifacts['version'] or version == _reload_state['failed_version']:
+        return
+    if _reload_lock.locked():
+        return
+
+    def run():
+        try:
+            reload_artifacts(version)
+        except Exception as e:
+            _reload_state['failed_version'] = version
+            logging.error(f"Hot reload of model version {version} failed, keeping {_artifacts['version']}: {e}")
+    threading.Thread(target=run, name='model-reload', daemon=True).start()
+
+def warm_up():
+    load_artifacts()
+    # The spelling dictionary is the other large load on the request path. Preloading also freezes
+    # everything loaded so far out of the garbage collector, so forked workers share the pages
+    from spelling import preload_spell_checker
+    start = time.perf_counter()
+    preload_spell_checker()
+    _load_state['timings_ms']['spell_checker'] = round((time.perf_counter() - start) * 1000, 1)
+
+def start_background_load():
+    """
+    Loads the artifacts in a daemon thread so the server can accept
+    connections (and answer readiness probes) while they load
+    """
+    global _loader_thread
+
+    def run():
+        try:
+            warm_up()
+        except Exception:
+            pass  # Already logged and recorded by load_artifacts
+    _loader_thread = threading.Thread(target=run, name='artifact-loader', daemon=True)
+    _loader_thread.start()
+    return _loader_thread
+
+def _wait_for_loader():
+    # A fork (e.g. gunicorn --preload) waits for a background load, which would otherwise leave
+    # half-imported modules and held locks in the child; workers then share the loaded artifacts
+    if _loader_thread is not None and _loader_thread is not threading.current_thread():
+        _loader_thread.join()
+
+def _reset_after_fork():
+    # Threads of the parent do not exist in the child, but locks they held stay held
+    global _artifacts_lock, _reload_lock
+    _artifacts_lock = threading.Lock()
+    _reload_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_wait_for_loader, after_in_child=_reset_after_fork)
+
+def readiness():
+    return {
+        'ready': _artifacts is not None,
+        'model_version': _artifacts['version'] if _artifacts is not None else None,
+        'status': _load_state['status'],
+        'error': _load_state['error'],
+        'timings_ms': dict(_load_state['timings_ms'])
+    }
+
+def check_suspicious_phrases(text):
+    suspicious_found = []
+    reasons = []
+    phrase_hits = posting_context(text).text_phrase_hits['suspicious_phrase']
+    
+    for phrase, reason in RULE_PLAN.terms['suspicious_phrase']:
+        if phrase in phrase_hits:
+            suspicious_found.append(phrase)
+            reasons.append(reason)
+    
+    return suspicious_found, reasons
+
+def check_salary_anomalies(salary_info, required_exp):
+    issues = []
+    reasons = []
+    
+    if not salary_info:
+        return issues, reasons
+    
+    salary_lower = salary_info.lower()
+    salary_numbers = re.findall(r'[\d,]+\.?\d*', salary_info)
+    
+    if salary_numbers:
+        salaries = [float(num.replace(',', '')) for num in salary_numbers]
+        exp_lower = required_exp.lower() if required_exp else ""
+        
+        is_fresher = any(term in exp_lower for term in ['entry', 'fresher', '0', 'no experience'])
+        
+        for salary in salaries:
+            if 'day' in salary_lower and salary > SALARY_THRESHOLDS['daily_high']:
+                issues.append('unrealistic_daily_salary')
+                reasons.append(f"Unrealistically high daily salary ({salary} INR)")
+                break
+            elif ('month' in salary_lower or 'per month' in salary_lower) and is_fresher and salary > SALARY_THRESHOLDS['monthly_high_fresher']:
+                issues.append('unrealistic_monthly_salary')
+                reasons.append(f"Unrealistically high monthly salary ({salary} INR) for entry-level")
+                break
+            elif ('year' in salary_lower or 'annual' in salary_lower) and is_fresher and salary > SALARY_THRESHOLDS['yearly_high_fresher']:
+                issues.append('unrealistic_annual_salary')
+                reasons.append(f"Unrealistically high annual salary ({salary} INR) for entry-level")
+                break
+            elif 'hour' in salary_lower and salary > SALARY_THRESHOLDS['hourly_high']:
+                issues.append('unrealistic_hourly_salary')
+                reasons.append(f"Unrealistically high hourly rate ({salary} INR)")
+                break
+    
+    return issues, reasons
+
+def check_email_domains(email_or_website):
+    issues = []
+    reasons = []
+    
+    if not email_or_website:
+        return issues, reasons
+    
+    email_matches = re.findall(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', email_or_website)
+    url_matches = re.findall(r'https?://[\w\.-]+\.\w+', email_or_website)
+    
+    all_domains = []
+    
+    for email in email_matches:
+        domain = email.split('@')[1].lower()
+        all_domains.append(domain)
+        
+        if any(free_domain in domain for free_domain in FREE_EMAIL_DOMAINS):
+            issues.append('free_email_domain')
+            reasons.append(f'Use of free email domain: {domain}')
+    
+    for url in url_matches:
+        parsed_url = urlparse(url)
+        domain = parsed_url.netloc.lower()
+        all_domains.append(domain)
+    
+    for domain in all_domains:
+        if any(tld in domain for tld in SUSPICIOUS_TLDS):
+            issues.append('suspicious_tld')
+            reasons.append(f'Suspicious domain extension: {domain}')
+        
+        if any(keyword in domain for keyword in SUSPICIOUS_DOMAIN_KEYWORDS):
+            issues.append('suspicious_domain_keywords')
+            reasons.append(f'Suspicious domain with job-related keywords: {domain}')
+    
+    return issues, reasons
+
+def check_urgency_indicators(text):
+    issues = []
+    reasons = []
+    
+    urgency_hits = posting_context(text).text_phrase_hits['urgency_keyword']
+    urgency_count = sum(1 for keyword, _ in RULE_PLAN.terms['urgency_keyword'] if keyword in urgency_hits)
+    
+    if urgency_count >= 3:
+        issues.append('high_urgency')
+        reasons.append('Multiple urgency indicators suggest pressure tactics')
+    elif urgency_count >= 1:
+        issues.append('urgency_present')
+        reasons.append('Urgency language may indicate rushed hiring process')
+    
+    return issues, reasons
+
+def check_vague_descriptions(form_data):
+    issues = []
+    reasons = []
+    
+    vague_hits = (find_phrases(form_data.get('job_title', ''))['vague_term'] |
+                  find_phrases(form_data.get('job_description', ''))['vague_term'])
+    
+    vague_count = sum(1 for term, _ in RULE_PLAN.terms['vague_term'] if term in vague_hits)
+    
+    if vague_count >= 2:
+        issues.append('highly_vague')
+        reasons.append('Job description contains multiple vague terms')
+    elif vague_count >= 1:
+        issues.append('somewhat_vague')
+        reasons.append('Job description contains vague terminology')
+    
+    if not form_data.get('company_name') or len(form_data.get('company_name', '').strip()) < 3:
+        issues.append('missing_company_info')
+        reasons.append('Missing or insufficient company information')
+    
+    return issues, reasons
+
+def advanced_scam_detection(form_data):
+    all_issues = []
+    all_reasons = []
+    
+    context = posting_context(form_data)
+    form_data = context.job_data
+    
+    phrase_issues, phrase_reasons = check_suspicious_phrases(context)
+    all_issues.extend(phrase_issues)
+    all_reasons.extend(phrase_reasons)
+    
+    salary_issues, salary_reasons = check_salary_anomalies(
+        form_data.get('salary_info_raw', ''),
+        form_data.get('required_experience', '')
+    )
+    all_issues.extend(salary_issues)
+    all_reasons.extend(salary_reasons)
+    
+    email_issues, email_reasons = check_email_domains(context.contact_info)
+    all_issues.extend(email_issues)
+    all_reasons.extend(email_reasons)
+    
+    urgency_issues, urgency_reasons = check_urgency_indicators(context)
+    all_issues.extend(urgency_issues)
+    all_reasons.extend(urgency_reasons)
+    
+    vague_issues, vague_reasons = check_vague_descriptions(form_data)
+    all_issues.extend(vague_issues)
+    all_reasons.extend(vague_reasons)
+    
+    if form_data.get('remote_status', '').lower() == 'remote' and not form_data.get('job_location'):
+        all_issues.append('remote_no_location')
+        all_reasons.append('Remote job without company location specified')
+    
+    response_time = form_data.get('response_time_claimed', '').lower()
+    if any(term in response_time for term in ['immediate', 'within 24 hours', 'urgent']):
+        all_issues.append('unrealistic_response_time')
+        all_reasons.append('Unrealistically quick response time promised')
+    
+    # Not deduplicated, so each reason stays paired with the issue at the same position
+    return all_issues, all_reasons
+
+def analyze_suspicious_features(form_data):
+    suspicious_features = []
+    basic_reasons = []
+    
+    salary_info = form_data.get('salary_info_raw', '').lower()
+    if salary_info:
+        salary_numbers = re.findall(r'[\d,]+\.?\d*', salary_info)
+        if salary_numbers:
+            salaries = [float(num.replace(',', '')) for num in salary_numbers]
+            
+            required_exp = form_data.get('required_experience', '').lower()
+            if 'entry' in required_exp or 'fresher' in required_exp or '0' in required_exp:
+                for salary in salaries:
+                    if 'day' in salary_info and salary > 5000:
+                        suspicious_features.append('salary')
+                        basic_reasons.append(f"Unrealistically high daily salary ({salary} INR) for entry-level position")
+                        break
+                    elif ('month' in salary_info or 'per month' in salary_info) and salary > 100000:
+                        suspicious_features.append('salary')
+                        basic_reasons.append(f"Unrealistically high monthly salary ({salary} INR) for entry-level position")
+                        break
+                    elif ('year' in salary_info or 'annual' in salary_info) and salary > 3000000:
+                        suspicious_features.append('salary')
+                        basic_reasons.append(f"Unrealistically high annual salary ({salary} INR) for entry-level position")
+                        break
+    
+    text_fields = [
+        form_data.get('job_description', ''),
+        form_data.get('requirements', ''),
+        form_data.get('benefits', '')
+    ]
+    phrase_hits = find_phrases(' '.join(text_fields))['basic_suspicious_phrase']
+    
+    for phrase, reason in RULE_PLAN.terms['basic_suspicious_phrase']:
+        if phrase in phrase_hits:
+            if 'suspicious phrases' not in suspicious_features:
+                suspicious_features.append('suspicious phrases')
+                basic_reasons.append(reason)
+    
+    # Removed excessive capitalization and exclamation checks (grammar-related)
+    
+    email_or_website = form_data.get('application_link_or_email', '') or form_data.get('company_website', '')
+    if email_or_website:
+        if '@gmail.' in email_or_website or '@yahoo.' in email_or_website or '@hotmail.' in email_or_website:
+            suspicious_features.append('unprofessional contact')
+            basic_reasons.append('Use of free email domains (Gmail, Yahoo) instead of company domain')
+        
+        basic_suspicious_domains = [
+            '.ru', '.tk', '.ml', '.ga', '.cf', '.gq',
+            'job', 'career', 'recruit', 'hiring', 'work'
+        ]
+        
+        parsed_url = urlparse(email_or_website)
+        domain = parsed_url.netloc or parsed_url.path.split('@')[-1].split('/')[0]
+        
+        for d in basic_suspicious_domains:
+            if d in domain:
+                suspicious_features.append('suspicious domain')
+                basic_reasons.append(f'Suspicious domain detected: {domain}')
+                break
+    
+    if not form_data.get('company_name') or not form_data.get('company_website'):
+        suspicious_features.append('missing company info')
+        basic_reasons.append('Missing or incomplete company information')
+    
+    if form_data.get('remote_status', '').lower() == 'remote' and not form_data.get('job_location'):
+        suspicious_features.append('remote job with no location')
+        basic_reasons.append('Remote job postings should still specify company location')
+    
+    response_time = form_data.get('response_time_claimed', '').lower()
+    if 'immediate' in response_time or 'within 24 hours' in response_time or 'urgent' in response_time:
+        suspicious_features.append('urgent response time')
+        basic_reasons.append('Unrealistically quick response times are common in scams')
+    
+    # Removed payment request detection
+    
+    return suspicious_features, basic_reasons
+
+def build_combined_text(job_data):
+    return ' '.join(str(job_data.get(field, '') or '') for field in
+                    ('job_title', 'job_description', 'requirements', 'benefits'))
+
+def normalize_job_data(job_data):
+    normalized = JOB_DATA_STRUCTURE.copy()
+    normalized["company_social_media_links"] = []
+    normalized["attachments"] = []
+    for key, value in job_data.items():
+        if value is None:
+            continue
+        normalized[key] = value
+    for key, default in JOB_DATA_STRUCTURE.items():
+        if isinstance(default, str) and not isinstance(normalized.get(key), str):
+            normalized[key] = str(normalized[key])
+    return normalized
+
+def find_near_duplicate(context):
+    index = get_default_index()
+    if index is None:
+        return None
+    try:
+        return index.query_text(context.text)
+    except Exception as e:
+        logging.error(f"Near-duplicate lookup failed: {e}")
+        return None
+
+def real_class_index(model):
+    return list(model.classes_).index(1)
+
+def verify_posting(form_data, model_result, full_explanations=False):
+    """
+    Runs the rule engine on top of the CatBoost verdict and returns the final
+    verdict together with the issues and reasons used to explain it.
+    form_data may be a PostingContext, which every check then shares.
+    Unless full_explanations is set, rule checks that cannot change the
+    verdict are skipped and listed in checks_skipped.
+    """
+    context = posting_context(form_data)
+    form_data = context.job_data
+    final_result = model_result
+    all_suspicious_features = []
+    # {reason: issue it explains}, so reasons can be ranked with their issues
+    reason_issues = {}
+    enhanced_verification_used = False
+    critical_issues_count = 0
+    domain_lookups_pending = 0
+    checks_skipped = []
+    
+    if model_result == "Real Job":
+        try:
+            verification_result = enhanced_scam_detection(context, early_exit=not full_explanations)
+            enhanced_verification_used = True
+            checks_skipped = verification_result['checks_skipped']
+            critical_issues_count = verification_result.get('critical_issues', 0)
+            domain_lookups_pending = verification_result.get('domain_lookups_pending', 0)
+            
+            if (verification_result['is_scam'] or 
+                critical_issues_count >= 2 or 
+                verification_result['total_issues'] >= 5):
+                
+                final_result = "Fake Job"
+                all_suspicious_features = verification_result['issues']
+                reason_issues = dict(verification_result['reason_issues'])
+                logging.info(f"CatBoost prediction OVERRIDDEN: {form_data.get('job_title', '')} - "
+                             f"Critical issues: {critical_issues_count}, "
+                             f"Total issues: {verification_result['total_issues']}")
+            else:
+                all_suspicious_features = verification_result['issues']
+                reason_issues = dict(verification_result['reason_issues'])
+        except Exception as e:
+            logging.error(f"Enhanced verification failed: {e}")
+            basic_suspicious_features, basic_reasons = analyze_suspicious_features(form_data)
+            all_suspicious_features = basic_suspicious_features
+            reason_issues = dict(zip(basic_reasons, basic_suspicious_features))
+    else:
+        basic_suspicious_features, basic_reasons = analyze_suspicious_features(form_data)
+        advanced_issues, advanced_reasons = advanced_scam_detection(context)
+        all_suspicious_features = list(set(basic_suspicious_features + advanced_issues))
+        reason_issues = dict(zip(basic_reasons + advanced_reasons, basic_suspicious_features + advanced_issues))
+    
+    # Copies of known scams with small edits (another company name, a new contact)
+    with time_stage('near_duplicate'):
+        near_duplicate = find_near_duplicate(context)
+    if near_duplicate:
+        all_suspicious_features = list(all_suspicious_features) + ['near_duplicate_scam']
+        reason_issues[
+            f'Near-duplicate of known scam "{near_duplicate["title"]}"'
+            f'{" at " + near_duplicate["company"] if near_duplicate["company"] else ""} '
+            f'(similarity {near_duplicate["similarity"]:.2f})'
+        ] = 'near_duplicate_scam'
+    
+    return {
+        'final_result': final_result,
+        'issues': rank_issues(all_suspicious_features),
+        'reasons': rank_reasons(reason_issues),
+        'reason_issues': reason_issues,
+        'enhanced_verification_used': enhanced_verification_used,
+        'critical_issues_count': critical_issues_count,
+        'domain_lookups_pending': domain_lookups_pending,
+        'checks_skipped': checks_skipped,
+        'near_duplicate': near_duplicate
+    }
+
+def evaluate_posting(job_data, real_probability, calibration=None, model_version=None, full_explanations=False):
+    model_result = "Real Job" if real_probability >= 0.5 else "Fake Job"
+    verification = verify_posting(job_data, model_result, full_explanations)
+    return {
+        'model_prediction': model_result,
+        'final_prediction': verification['final_result'],
+        'override_applied': model_result != verification['final_result'],
+        'real_probability': round(real_probability, 4),
+        'model_version': model_version,
+        'score': compute_score(real_probability, verification['issues'],
+                               verification['final_result'], calibration),
+        'enhanced_verification_used': verification['enhanced_verification_used'],
+        'critical_issues_count': verification['critical_issues_count'],
+        'domain_lookups_pending': verification['domain_lookups_pending'],
+        'checks_skipped': verification['checks_skipped'],
+        'near_duplicate': verification['near_duplicate'],
+        'total_issues_count': len(verification['issues']),
+        'issues': verification['issues'],
+        'reasons': verification['reasons'],
+        'reason_issues': verification['reason_issues']
+    }
+
+def score_postings(postings, use_cache=True, full_explanations=None, artifacts=None):
+    """
+    Returns one result per posting, served from the result cache when the
+    verdict-relevant fields were seen before. Misses are vectorized and
+    scored together in a single CatBoost call. full_explanations defaults
+    to RULE_FULL_EXPLANATIONS. artifacts (shaped like load_artifacts())
+    scores with another model than the served one; those results are not
+    cached.
+    """
+    if full_explanations is None:
+        full_explanations = RULE_FULL_EXPLANATIONS
+    if artifacts is None:
+        artifacts = load_artifacts()
+    else:
+        use_cache = False
+    if use_cache:
+        # Full and early-exit results explain the same verdict differently, so they are cached apart;
+        # results also depend on the rule definitions, the known scams and on whether domains are looked up
+        index = get_default_index()
+        if index is not None:
+            index.refresh_if_due()
+        namespace = ':'.join([f"format-{RESULT_FORMAT}", artifacts['cache_namespace'], RULE_PLAN.fingerprint]
+                             + (['full'] if full_explanations else [])
+                             + ([f"near-duplicates-{index.generation}"] if index is not None else [])
+                             + ([] if lookups_enabled() else ['no-domain-lookups']))
+        with time_stage('cache_lookup'):
+            keys = [posting_cache_key(job_data, artifacts['cache_fields'], namespace)
+                    for job_data in postings]
+            results = [result_cache.get(key) for key in keys]
+    else:
+        keys = None
+        results = [None] * len(postings)
+    missing = [i for i, result in enumerate(results) if result is None]
+    
+    if missing:
+        model = artifacts['model']
+        # Derived text is computed once per posting and shared by the vectorizer and every rule
+        contexts = {i: PostingContext(postings[i]) for i in missing}
+        with time_stage('vectorization'):
+            features = featurize(artifacts['vectorizer'], [postings[i] for i in missing],
+                                 [contexts[i].text for i in missing])
+        with time_stage('inference'):
+            probabilities = model.predict_proba(features)[:, real_class_index(model)]
+        for i, real_probability in zip(missing, probabilities):
+            with time_stage('rule_engine'):
+                results[i] = evaluate_posting(contexts[i], float(real_probability), artifacts['calibration'],
+                                              artifacts['version'], full_explanations)
+            # A verdict reached before all DNS/WHOIS lookups finished is not final
+            if use_cache and not results[i]['domain_lookups_pending']:
+                result_cache.put(keys[i], results[i])
+    
+    for result in results:
+        record_prediction(result)
+    return results
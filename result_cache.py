@@ -0,0 +1,115 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    """
+    RESULT CACHE:
+    In-process LRU with TTL for scoring results, optionally backed by a local
+    SQLite file so warm entries survive restarts and are shared by workers
+    on the same host.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600, db_path=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'disk_hits': 0, 'evictions': 0, 'expirations': 0}
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5)
+                self._db.execute('PRAGMA journal_mode=WAL')
+                self._db.execute('CREATE TABLE IF NOT EXISTS results '
+                                 '(key TEXT PRIMARY KEY, stored_at REAL, value TEXT)')
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Result cache disk store disabled: {e}")
+                self._db = None
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.stats['hits'] += 1
+                    return value
+                del self._entries[key]
+                self.stats['expirations'] += 1
+
+            value = self._get_from_disk(key, now)
+            if value is not None:
+                self._store(key, value, now)
+                self.stats['hits'] += 1
+                self.stats['disk_hits'] += 1
+                return value
+
+            self.stats['misses'] += 1
+            return None
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._store(key, value, now)
+            if self._db is not None:
+                try:
+                    self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)',
+                                     (key, now, json.dumps(value)))
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logging.warning(f"Result cache disk write failed: {e}")
+
+    def _store(self, key, value, stored_at):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _get_from_disk(self, key, now):
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute('SELECT stored_at, value FROM results WHERE key = ?', (key,)).fetchone()
+        except sqlite3.Error as e:
+            logging.warning(f"Result cache disk read failed: {e}")
+            return None
+        if row is None:
+            return None
+        if now - row[0] > self.ttl_seconds:
+            self.stats['expirations'] += 1
+            return None
+        return json.loads(row[1])
+
+    def snapshot(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+def normalize_field(value):
+    if isinstance(value, (list, tuple)):
+        value = ', '.join(str(item) for item in value)
+    return re.sub(r'\s+', ' ', str(value or '')).strip()
+
+def posting_cache_key(job_data, fields, namespace=''):
+    """
+    Content address of a posting: hash of the normalized fields that feed the
+    model and the rule checks. namespace ties entries to a model/calibration.
+    """
+    digest = hashlib.sha256(namespace.encode('utf-8'))
+    for field in fields:
+        digest.update(b'\x00')
+        digest.update(normalize_field(job_data.get(field, '')).encode('utf-8'))
+    return digest.hexdigest()
@@ -0,0 +1,338 @@
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+import numpy as np
+import scipy.sparse as sp
+from catboost import CatBoostClassifier
+from sklearn.model_selection import train_test_split
+from model import CATBOOST_PARAMS, evaluate_model, load_dataset, text_features
+from model_registry import current_version, load_version, register, activate
+from scoring import file_sha256
+from submission_store import connect as connect_submissions
+from values import (
+    MODEL_FILE, VECTORIZER_FILE, SUBMISSIONS_DB, TRAINING_STORE_DB, RETRAIN_ITERATIONS, MODEL_REGISTRY_DIR
+)
+
+def row_key(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def is_held_out(key):
+    # Stable 20% evaluation split for submissions: a row stays on the same side across runs
+    return int(key[:8], 16) % 5 == 0
+
+def featurizer_fingerprint(vectorizer):
+    """
+    Identifies the features cached for a featurizer. Hashing featurizers
+    cache raw term counts, which do not change when the IDF is updated.
+    """
+    if hasattr(vectorizer, 'term_counts'):
+        return f"hashing-counts:{vectorizer.n_features}:{vectorizer.token_pattern}:{vectorizer.lowercase}"
+    digest = hashlib.sha256(json.dumps(sorted((term, int(index)) for term, index in vectorizer.vocabulary_.items())).encode('utf-8'))
+    digest.update(np.ascontiguousarray(vectorizer.idf_, dtype=np.float64).tobytes())
+    return f"tfidf:{digest.hexdigest()}"
+
+class TrainingStore:
+    """
+    TRAINING STORE:
+    Labeled training rows (Jobs.csv plus reviewed submissions) and their
+    featurized vectors, keyed by the hash of the posting text. Each row
+    records whether it belongs to the held-out split. Each run only ingests
+    submissions labeled since the last one and only featurizes rows that
+    have no cached vector for the current featurizer.
+    """
+
+    def __init__(self, db_path=TRAINING_STORE_DB):
+        self._db = sqlite3.connect(db_path, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript('''
+            CREATE TABLE IF NOT EXISTS rows (
+                row_key TEXT PRIMARY KEY,
+                source TEXT,
+                label INTEGER,
+                text TEXT,
+                added_at REAL,
+                held_out INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS features (
+                featurizer TEXT,
+                row_key TEXT,
+                indices BLOB,
+                data BLOB,
+                PRIMARY KEY (featurizer, row_key)
+            );
+            CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT);
+        ''')
+        existing = {row[1] for row in self._db.execute('PRAGMA table_info(rows)')}
+        if 'held_out' not in existing:
+            # Stores from before the split was recorded: reload the dataset to mark model.py's test rows
+            self._db.execute('ALTER TABLE rows ADD COLUMN held_out INTEGER')
+            self._db.execute("DELETE FROM state WHERE key = 'dataset_loaded'")
+        self._db.commit()
+
+    def get_state(self, key, default=None):
+        row = self._db.execute('SELECT value FROM state WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key, value):
+        with self._db:
+            self._db.execute('INSERT OR REPLACE INTO state VALUES (?, ?)', (key, json.dumps(value)))
+
+    def add_rows(self, rows, source):
+        """
+        Adds (text, label, held_out) rows; a later label for the same text
+        replaces the earlier one. A row already in the store keeps its split,
+        except that dataset rows set it. Returns the number of rows that were
+        new or relabeled.
+        """
+        now = time.time()
+        changed = 0
+        with self._db:
+            for text, label, held_out in rows:
+                key = row_key(text)
+                existing = self._db.execute('SELECT label, held_out FROM rows WHERE row_key = ?', (key,)).fetchone()
+                if existing is not None:
+                    if source != 'dataset' and existing[1] is not None:
+                        held_out = bool(existing[1])
+                    if existing[0] == label and existing[1] == int(held_out):
+                        continue
+                self._db.execute('INSERT OR REPLACE INTO rows VALUES (?, ?, ?, ?, ?, ?)',
+                                 (key, source, label, text, now, int(held_out)))
+                changed += 1
+        return changed
+
+    def rows(self):
+        """
+        Returns (row_key, label, text, held_out) for every row
+        """
+        return [(key, label, text, bool(is_held_out(key) if held_out is None else held_out))
+                for key, label, text, held_out in
+                self._db.execute('SELECT row_key, label, text, held_out FROM rows ORDER BY row_key')]
+
+    def cached_features(self, fingerprint, keys):
+        cached = {}
+        for key, indices, data in self._db.execute(
+                'SELECT row_key, indices, data FROM features WHERE featurizer = ?', (fingerprint,)):
+            cached[key] = (np.frombuffer(indices, dtype=np.int32), np.frombuffer(data, dtype=np.float64))
+        return {key: cached[key] for key in keys if key in cached}
+
+    def store_features(self, fingerprint, keys, matrix):
+        matrix = sp.csr_matrix(matrix)
+        with self._db:
+            for i, key in enumerate(keys):
+                start, end = matrix.indptr[i], matrix.indptr[i + 1]
+                self._db.execute('INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?)', (
+                    fingerprint, key,
+                    matrix.indices[start:end].astype(np.int32).tobytes(),
+                    matrix.data[start:end].astype(np.float64).tobytes()
+                ))
+
+    def close(self):
+        self._db.close()
+
+def dataset_rows(path):
+    """
+    Returns (text, label, held_out) for Jobs.csv, held_out marking model.py's
+    test split so the original model is never evaluated on its training rows.
+    A text that appears on both sides of the split counts as training.
+    """
+    df = load_dataset(path)
+    # train_test_split permutes by row count and seed only, as in model.train
+    _, test_index = train_test_split(np.arange(len(df)), test_size=0.2, random_state=42)
+    test_rows = set(test_index.tolist())
+    splits = {}
+    for i, (text, label) in enumerate(zip(df['combined_text'], df['is_real'].astype(int))):
+        held_out = i in test_rows
+        splits[text] = (label, splits[text][1] and held_out if text in splits else held_out)
+    return [(text, label, held_out) for text, (label, held_out) in splits.items()]
+
+def submission_rows(db_path, labeled_after, after_id, include_verdicts=False):
+    """
+    Yields (id, labeled_at, text, label) for submissions labeled at or after
+    labeled_after and, when include_verdicts is set, unlabeled submissions
+    after after_id with their final verdict as the label (labeled_at None)
+    """
+    connection = connect_submissions(db_path)
+    try:
+        columns = ', '.join(f'"{column}"' for column in text_features)
+        query = (f'SELECT id, label, labeled_at, verdict, {columns} FROM submissions '
+                 'WHERE (label IS NOT NULL AND COALESCE(labeled_at, 0) >= ?) '
+                 'OR (? AND label IS NULL AND id > ?) ORDER BY id')
+        for row in connection.execute(query, (labeled_after, bool(include_verdicts), after_id)):
+            submission_id, label, labeled_at, verdict = row[:4]
+            if label is None:
+                if verdict not in ("Real Job", "Fake Job"):
+                    continue
+                label = 1 if verdict == "Real Job" else 0
+            text = ' '.join(value for value in row[4:] if value)
+            yield submission_id, labeled_at, text, label
+    finally:
+        connection.close()
+
+def featurize(store, vectorizer, rows):
+    """
+    Builds the feature matrix for rows, transforming only rows without a
+    cached vector. Hashing featurizers return raw term counts, which the
+    caller weights with the IDF it fits.
+    """
+    fingerprint = featurizer_fingerprint(vectorizer)
+    keys = [row[0] for row in rows]
+    cached = store.cached_features(fingerprint, keys)
+    missing = [(key, text) for key, _, text, _ in rows if key not in cached]
+    if missing:
+        transform = vectorizer.term_counts if hasattr(vectorizer, 'term_counts') else vectorizer.transform
+        store.store_features(fingerprint, [key for key, _ in missing], transform([text for _, text in missing]))
+        cached = store.cached_features(fingerprint, keys)
+
+    indptr = np.zeros(len(keys) + 1, dtype=np.int64)
+    for i, key in enumerate(keys):
+        indptr[i + 1] = indptr[i] + len(cached[key][0])
+    indices = np.concatenate([cached[key][0] for key in keys]) if keys else np.zeros(0, dtype=np.int32)
+    data = np.concatenate([cached[key][1] for key in keys]) if keys else np.zeros(0)
+    n_columns = vectorizer.n_features if hasattr(vectorizer, 'term_counts') else len(vectorizer.vocabulary_)
+    matrix = sp.csr_matrix((data.copy(), indices, indptr), shape=(len(keys), n_columns))
+    return matrix, len(keys) - len(missing), len(missing)
+
+def load_previous(registry_dir):
+    version = current_version(registry_dir)
+    if version:
+        model, vectorizer, _, _ = load_version(version, registry_dir)
+        return model, vectorizer, version
+    import joblib
+    return joblib.load(MODEL_FILE), joblib.load(VECTORIZER_FILE), f"pickle-{file_sha256(MODEL_FILE)[:12]}"
+
+def retrain(data_path='Jobs.csv', submissions_db=SUBMISSIONS_DB, store_path=TRAINING_STORE_DB,
+            registry_dir=MODEL_REGISTRY_DIR, iterations=RETRAIN_ITERATIONS, include_verdicts=False,
+            version=None, refresh_idf=False):
+    """
+    INCREMENTAL RETRAINING:
+    Ingests newly labeled submissions, warm-starts CatBoost from the active
+    model (init_model) with `iterations` more trees on the training rows,
+    and registers the result as a new version with an evaluation report
+    comparing it to the previous model on the held-out rows. The held-out
+    rows are model.py's test split plus a hashed 20% of submissions.
+
+    Warm-started trees split on features weighted with the previous IDF, so
+    it is kept. With refresh_idf (hashing featurizer only) the IDF is refit
+    on the training rows, never the held-out ones, and the model is trained
+    from scratch with CATBOOST_PARAMS instead.
+    """
+    started = time.perf_counter()
+    model, vectorizer, previous_version = load_previous(registry_dir)
+    if getattr(vectorizer, 'uses_postings', False):
+        raise ValueError("Incremental retraining caches text features; retrain Pool-mode models with model.py")
+    hashing = hasattr(vectorizer, 'term_counts')
+    if refresh_idf and not hashing:
+        raise ValueError("Only the hashing featurizer can refresh its IDF; retrain TF-IDF models with model.py")
+    store = TrainingStore(store_path)
+    try:
+        dataset_added = store.add_rows(dataset_rows(data_path), 'dataset') if not store.get_state('dataset_loaded') else 0
+        store.set_state('dataset_loaded', True)
+
+        # Reviewed labels are read by when they were set, so a submission labeled after an
+        # earlier run scanned it is still ingested; verdicts are final when the row is written
+        last_labeled_at = store.get_state('last_labeled_at', 0)
+        last_id = store.get_state('last_submission_id', 0)
+        new_rows = []
+        for submission_id, labeled_at, text, label in submission_rows(submissions_db, last_labeled_at, last_id,
+                                                                      include_verdicts):
+            if labeled_at is None:
+                last_id = max(last_id, submission_id)
+            else:
+                last_labeled_at = max(last_labeled_at, labeled_at)
+            if text:
+                new_rows.append((text, int(label), is_held_out(row_key(text))))
+        submissions_added = store.add_rows(new_rows, 'submission')
+
+        rows = store.rows()
+        start = time.perf_counter()
+        X, cached_rows, featurized_rows = featurize(store, vectorizer, rows)
+        featurize_seconds = time.perf_counter() - start
+        y = np.array([label for _, label, _, _ in rows])
+        held_out = np.array([held for _, _, _, held in rows], dtype=bool)
+
+        if hashing:
+            # The previous model is scored with the IDF it was trained with
+            X_previous = vectorizer.weight(X.copy())
+            if refresh_idf:
+                vectorizer.document_frequencies = np.bincount(X[~held_out].indices,
+                                                              minlength=vectorizer.n_features).astype(np.int64)
+                vectorizer.n_documents = int((~held_out).sum())
+                X = vectorizer.weight(X)
+            else:
+                X = X_previous
+        else:
+            X_previous = X
+        previous_metrics = evaluate_model(model, X_previous[held_out], y[held_out])
+
+        start = time.perf_counter()
+        if refresh_idf:
+            new_model = CatBoostClassifier(**CATBOOST_PARAMS, verbose=0)
+            new_model.fit(X[~held_out], y[~held_out])
+        else:
+            new_model = CatBoostClassifier(**{**CATBOOST_PARAMS, 'iterations': iterations}, verbose=0)
+            new_model.fit(X[~held_out], y[~held_out], init_model=model)
+        training_seconds = time.perf_counter() - start
+        new_metrics = evaluate_model(new_model, X[held_out], y[held_out])
+
+        report = {
+            'previous_version': previous_version,
+            'rows': {
+                'total': len(rows),
+                'train': int((~held_out).sum()),
+                'held_out': int(held_out.sum()),
+                'dataset_added': dataset_added,
+                'submissions_added': submissions_added
+            },
+            'features': {
+                'featurizer': featurizer_fingerprint(vectorizer).split(':')[0],
+                'cached_rows': cached_rows,
+                'featurized_rows': featurized_rows,
+                'seconds': round(featurize_seconds, 3)
+            },
+            'training': {
+                'init_model': None if refresh_idf else previous_version,
+                'idf': 'refreshed' if refresh_idf else 'previous',
+                'added_iterations': None if refresh_idf else iterations,
+                'tree_count': new_model.tree_count_,
+                'seconds': round(training_seconds, 3)
+            },
+            'metrics': {'previous': previous_metrics, 'new': new_metrics},
+            'total_seconds': round(time.perf_counter() - started, 3)
+        }
+        # Calibration was fitted for the previous model, so it is not carried over
+        manifest = register(new_model, vectorizer, version, metrics=new_metrics, report=report,
+                            registry_dir=registry_dir)
+        store.set_state('last_submission_id', last_id)
+        store.set_state('last_labeled_at', last_labeled_at)
+        report['version'] = manifest['version']
+        return report
+    finally:
+        store.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Incrementally retrain the model from logged submissions')
+    parser.add_argument('--data', default='Jobs.csv', help='Base labeled dataset, ingested once')
+    parser.add_argument('--submissions', default=SUBMISSIONS_DB)
+    parser.add_argument('--store', default=TRAINING_STORE_DB)
+    parser.add_argument('--registry', default=MODEL_REGISTRY_DIR)
+    parser.add_argument('--iterations', type=int, default=RETRAIN_ITERATIONS, help='Trees added to the previous model')
+    parser.add_argument('--include-verdicts', action='store_true',
+                        help='Use the final verdict as the label of unreviewed submissions')
+    parser.add_argument('--version', help='Version name (default: timestamp)')
+    parser.add_argument('--refresh-idf', action='store_true',
+                        help='Refit the hashing IDF on the training rows and train from scratch instead of warm-starting')
+    parser.add_argument('--activate', action='store_true', help='Activate the new version')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    report = retrain(args.data, args.submissions, args.store, args.registry, args.iterations,
+                     args.include_verdicts, args.version, args.refresh_idf)
+    print(json.dumps(report, indent=2))
+    if args.activate:
+        activate(report['version'], args.registry)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import namedtuple
+from phrase_index import PhraseIndex
+from metrics import RULE_HITS, RULE_SECONDS
+from values import RULE_DEFINITIONS_FILE, ISSUE_SEVERITY_WEIGHTS
+
+RULE_TYPES = ('phrases', 'regex')
+# 'clean' is the cleaned posting text (lowercased, special characters removed), 'text' the text as written
+RULE_TEXTS = ('clean', 'text')
+# Term lists read by the built-in checks in verify.py and pipeline.py
+REQUIRED_TERM_LISTS = (
+    'urgency_flags', 'payment_flags', 'unrealistic_flags', 'communication_flags', 'payment_keyword',
+    'suspicious_phrase', 'basic_suspicious_phrase', 'urgency_keyword', 'vague_term'
+)
+
+class RuleDefinitionError(ValueError):
+    pass
+
+# phrase -> (issue, reason) for 'phrases' rules; pattern, issue and reason for 'regex' rules
+CompiledRule = namedtuple('CompiledRule', ['id', 'type', 'text', 'matches', 'pattern', 'issue', 'reason'])
+
+def issue_key(phrase):
+    return phrase.replace(' ', '_').replace('/', '_')
+
+def issue_prefix(template):
+    # The fixed part of an issue template, which every issue of the rule contains
+    return template.split('{', 1)[0]
+
+def read_definitions(path):
+    with open(path, encoding='utf-8') as f:
+        if path.lower().endswith(('.yaml', '.yml')):
+            import yaml
+
+            return yaml.safe_load(f)
+        return json.load(f)
+
+def term_pairs(name, terms):
+    """
+    Normalizes a term list to [(phrase, reason)]; a term is a phrase or a
+    [phrase, reason] pair, reason being None for plain phrases
+    """
+    if not isinstance(terms, list) or not terms:
+        raise RuleDefinitionError(f"{name}: expected a non-empty list of phrases")
+    pairs = []
+    for term in terms:
+        if isinstance(term, str):
+            pairs.append((term, None))
+        elif isinstance(term, list) and len(term) == 2 and all(isinstance(item, str) for item in term):
+            pairs.append((term[0], term[1]))
+        else:
+            raise RuleDefinitionError(f"{name}: {term!r} is neither a phrase nor a [phrase, reason] pair")
+    return pairs
+
+class RulePlan:
+    """
+    RULE PLAN:
+    Rule definitions (scam_rules.json) compiled once at load time. Every
+    phrase rule and term list goes into one PhraseIndex, so a posting is
+    scanned once per text whatever the number of rules; issue keys and
+    reasons are formatted ahead of time and regexes precompiled. Severity
+    weights and critical issue prefixes declared by the rules are merged
+    with ISSUE_SEVERITY_WEIGHTS for scoring and the override decision.
+    """
+
+    def __init__(self, definitions, source='<definitions>'):
+        if not isinstance(definitions, dict):
+            raise RuleDefinitionError(f"{source}: expected an object with 'rules' and 'term_lists'")
+        self.source = source
+        self.fingerprint = hashlib.sha256(json.dumps(definitions, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+        self.terms = {name: term_pairs(name, terms) for name, terms in (definitions.get('term_lists') or {}).items()}
+        missing = [name for name in REQUIRED_TERM_LISTS if name not in self.terms]
+        if missing:
+            raise RuleDefinitionError(f"{source}: missing term lists {', '.join(missing)}")
+
+        self.rules = []
+        rule_weights = []
+        self.critical_keywords = []
+        self.max_issues = 0
+        self.max_critical = 0
+        for definition in definitions.get('rules') or []:
+            rule = self._compile(definition)
+            if rule.id in self.terms or any(rule.id == other.id for other in self.rules):
+                raise RuleDefinitionError(f"{source}: duplicate rule or term list id {rule.id!r}")
+            self.rules.append(rule)
+            # Upper bounds for the rule scheduler (verify.RULES)
+            issue_count = len(rule.matches) if rule.type == 'phrases' else 1
+            self.max_issues += issue_count
+            if definition.get('severity') is not None:
+                rule_weights.append((issue_prefix(definition['issue']), float(definition['severity'])))
+            if definition.get('critical'):
+                self.critical_keywords.append(issue_prefix(definition['issue']))
+                self.max_critical += issue_count
+        # Rule weights take precedence: the first matching substring wins
+        self.severity_weights = rule_weights + list(ISSUE_SEVERITY_WEIGHTS)
+
+        tables = {name: [phrase for phrase, _ in pairs] for name, pairs in self.terms.items()}
+        for rule in self.rules:
+            if rule.type == 'phrases':
+                tables[rule.id] = list(rule.matches)
+        self.phrase_index = PhraseIndex(tables)
+
+    def _compile(self, definition):
+        rule_id = definition.get('id') if isinstance(definition, dict) else None
+        if not rule_id:
+            raise RuleDefinitionError(f"{self.source}: every rule needs an 'id'")
+        name = f"{self.source}: rule {rule_id!r}"
+        rule_type = definition.get('type')
+        text = definition.get('text', 'clean')
+        if rule_type not in RULE_TYPES:
+            raise RuleDefinitionError(f"{name}: type must be one of {', '.join(RULE_TYPES)}")
+        if text not in RULE_TEXTS:
+            raise RuleDefinitionError(f"{name}: text must be one of {', '.join(RULE_TEXTS)}")
+        if not definition.get('issue') or not definition.get('reason'):
+            raise RuleDefinitionError(f"{name}: 'issue' and 'reason' are required")
+
+        if rule_type == 'regex':
+            try:
+                pattern = re.compile(definition.get('pattern') or '')
+            except re.error as e:
+                raise RuleDefinitionError(f"{name}: invalid pattern: {e}") from e
+            if not pattern.pattern:
+                raise RuleDefinitionError(f"{name}: 'pattern' is required")
+            return CompiledRule(rule_id, rule_type, text, None, pattern, definition['issue'], definition['reason'])
+
+        matches = {}
+        for phrase, reason in term_pairs(name, definition.get('phrases')):
+            fields = {'key': issue_key(phrase), 'phrase': phrase, 'reason': reason or ''}
+            try:
+                # Phrases are matched lowercased; a repeated phrase keeps its first issue
+                matches.setdefault(phrase.lower(), (definition['issue'].format(**fields),
+                                                    definition['reason'].format(**fields)))
+            except (KeyError, IndexError, ValueError) as e:
+                raise RuleDefinitionError(f"{name}: bad template field {e}; use {{key}}, {{phrase}} or {{reason}}") from e
+        return CompiledRule(rule_id, rule_type, text, matches, None, definition['issue'], definition['reason'])
+
+    def scan(self, text):
+        """
+        Single pass over the lowercased text; returns {category: set(phrases found)}
+        """
+        return self.phrase_index.scan(text)
+
+    def evaluate(self, context):
+        """
+        Runs every rule on a posting context (verify.PostingContext) and
+        returns (issues, {reason: issue}) like the checks in verify.py. Phrase
+        rules read the context's shared phrase scans; counts postings matched
+        and time spent per rule.
+        """
+        issues = set()
+        reasons = {}
+        for rule in self.rules:
+            start = time.perf_counter()
+            found = []
+            if rule.type == 'phrases':
+                hits = (context.phrase_hits if rule.text == 'clean' else context.text_phrase_hits)[rule.id]
+                found = [rule.matches[phrase] for phrase in hits]
+            elif rule.pattern.search(context.clean_text if rule.text == 'clean' else context.text):
+                found = [(rule.issue, rule.reason)]
+            for issue, reason in found:
+                issues.add(issue)
+                reasons[reason] = issue
+            RULE_SECONDS.inc(time.perf_counter() - start, rule=rule.id)
+            if found:
+                RULE_HITS.inc(rule=rule.id)
+        return issues, reasons
+
+def load_rule_plan(path=RULE_DEFINITIONS_FILE):
+    try:
+        definitions = read_definitions(path)
+    except (OSError, ValueError) as e:
+        raise RuleDefinitionError(f"Could not read rule definitions from {path}: {e}") from e
+    return RulePlan(definitions, path)
+
+_default_plan = None
+_default_lock = threading.Lock()
+
+def get_default_plan():
+    global _default_plan
+    if _default_plan is None:
+        with _default_lock:
+            if _default_plan is None:
+                _default_plan = load_rule_plan(RULE_DEFINITIONS_FILE)
+    return _default_plan
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate and compile rule definitions')
+    parser.add_argument('path', nargs='?', default=RULE_DEFINITIONS_FILE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    plan = load_rule_plan(args.path)
+    print(json.dumps({
+        'rules': {rule.id: len(rule.matches) if rule.type == 'phrases' else rule.type for rule in plan.rules},
+        'term_lists': {name: len(pairs) for name, pairs in plan.terms.items()},
+        'phrase_index_categories': len(plan.phrase_index.categories),
+        'critical_keywords': plan.critical_keywords,
+        'fingerprint': plan.fingerprint,
+        'compile_ms': round((time.perf_counter() - start) * 1000, 2)
+    }, indent=2))
+
+if __name__ == '__main__':
+    main()
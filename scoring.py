@@ -0,0 +1,92 @@
+import hashlib
+import json
+import logging
+import math
+import os
+from values import DEFAULT_ISSUE_WEIGHT, CALIBRATION_FILE
+from rule_definitions import get_default_plan
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def issue_weight(issue):
+    # ISSUE_SEVERITY_WEIGHTS, after the weights declared in the rule definitions
+    for key, weight in get_default_plan().severity_weights:
+        if key in issue:
+            return weight
+    return DEFAULT_ISSUE_WEIGHT
+
+def rule_risk(issues):
+    """
+    Maps the weighted rule-engine issues to a risk in [0, 1).
+    Each unit of weight removes ~40% of the remaining legitimacy.
+    """
+    total_weight = sum(issue_weight(issue) for issue in set(issues))
+    return 1 - math.exp(-0.5 * total_weight)
+
+def rank_issues(issues):
+    """
+    Most severe issues first, ties broken by name so the order is stable
+    """
+    return sorted(set(issues), key=lambda issue: (-issue_weight(issue), issue))
+
+def rank_reasons(reason_issues):
+    """
+    Reasons ({reason: issue it explains}) in the order of their issues (see
+    rank_issues), so the first reasons explain the most severe issues
+    """
+    return sorted(reason_issues, key=lambda reason: (-issue_weight(reason_issues[reason]), reason_issues[reason], reason))
+
+def reasons_for_issues(reason_issues, issues):
+    """
+    The reasons explaining any of issues, in rank_reasons order. An issue can
+    have several reasons, so showing the first issues means showing these
+    rather than as many reasons.
+    """
+    issues = set(issues)
+    return [reason for reason in rank_reasons(reason_issues) if reason_issues[reason] in issues]
+
+def load_calibration(path=CALIBRATION_FILE, model_path=None, model_sha256=None):
+    """
+    Loads Platt-scaling parameters written by calibrate.py. Returns None when
+    there is no calibration or it was fitted against a different model file
+    (model_path, or its known model_sha256).
+    """
+    if not os.path.isfile(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            calibration = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Could not read calibration file {path}: {e}")
+        return None
+    if model_path and not model_sha256 and os.path.isfile(model_path):
+        model_sha256 = file_sha256(model_path)
+    if model_sha256 and calibration.get('model_sha256') != model_sha256:
+        logging.warning(f"Ignoring {path}: it was fitted for a different model")
+        return None
+    return calibration
+
+def calibrate(real_probability, calibration=None):
+    if not calibration:
+        return real_probability
+    p = min(max(real_probability, 1e-6), 1 - 1e-6)
+    logit = math.log(p / (1 - p))
+    return 1 / (1 + math.exp(-(calibration['slope'] * logit + calibration['intercept'])))
+
+def compute_score(real_probability, issues, final_result, calibration=None):
+    """
+    DETERMINISTIC SCORE:
+    Legitimacy score (0-100) from the CatBoost probability of a real job,
+    discounted by the weighted rule-engine issues and kept on the side of
+    50 that matches the final verdict.
+    """
+    legitimacy = calibrate(real_probability, calibration) * (1 - rule_risk(issues))
+    score = round(legitimacy * 100)
+    if final_result == "Real Job":
+        return min(99, max(50, score))
+    return min(49, max(1, score))
@@ -0,0 +1,85 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+class ScrapeCache:
+    """
+    SCRAPE CACHE:
+    On-disk store of fetched job pages (compressed HTML plus ETag and
+    Last-Modified validators) and their parsed job dicts, keyed by LinkedIn
+    job ID. Entries younger than ttl_seconds are served without any network
+    I/O; older ones are revalidated with a conditional request.
+    """
+
+    def __init__(self, db_path, ttl_seconds=6 * 3600):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.stats = {'fresh_hits': 0, 'revalidated': 0, 'misses': 0}
+        self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS pages (
+                job_id TEXT PRIMARY KEY,
+                url TEXT,
+                fetched_at REAL,
+                etag TEXT,
+                last_modified TEXT,
+                html BLOB,
+                job_data TEXT
+            )''')
+        self._db.commit()
+
+    def get(self, job_id, with_html=False):
+        """
+        Returns the cached entry as a dict (with an 'is_fresh' flag) or None.
+        Hits and revalidation only need the parsed job and the validators, so
+        the page itself is read and decompressed only with with_html.
+        """
+        columns = 'url, fetched_at, etag, last_modified, job_data' + (', html' if with_html else '')
+        with self._lock:
+            try:
+                row = self._db.execute(f'SELECT {columns} FROM pages WHERE job_id = ?', (job_id,)).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Scrape cache read failed: {e}")
+                return None
+        if row is None:
+            return None
+        url, fetched_at, etag, last_modified, job_data = row[:5]
+        entry = {
+            'url': url,
+            'fetched_at': fetched_at,
+            'etag': etag,
+            'last_modified': last_modified,
+            'job_data': json.loads(job_data),
+            'is_fresh': time.time() - fetched_at <= self.ttl_seconds
+        }
+        if with_html:
+            entry['html'] = zlib.decompress(row[5]).decode('utf-8') if row[5] else ''
+        return entry
+
+    def put(self, job_id, url, html, job_data, etag=None, last_modified=None):
+        with self._lock:
+            try:
+                self._db.execute('INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?)', (
+                    job_id, url, time.time(), etag, last_modified,
+                    zlib.compress(html.encode('utf-8')), json.dumps(job_data)
+                ))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Scrape cache write failed: {e}")
+
+    def touch(self, job_id):
+        # Page revalidated (304 Not Modified): restart its TTL
+        with self._lock:
+            try:
+                self._db.execute('UPDATE pages SET fetched_at = ? WHERE job_id = ?', (time.time(), job_id))
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Scrape cache update failed: {e}")
+
+    def record(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
@@ -0,0 +1,427 @@
+import copy
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+import requests
+from requests.adapters import HTTPAdapter
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+from values import (
+    JOB_DATA_STRUCTURE, USER_AGENT, SCRAPE_MAX_WORKERS,
+    SCRAPE_REQUESTS_PER_SECOND_PER_HOST, SCRAPE_TIMEOUT_SECONDS, SCRAPE_MAX_RETRIES,
+    SCRAPE_CACHE_DB, SCRAPE_CACHE_TTL_SECONDS, SCRAPE_ALLOWED_HOSTS, HTML_PARSER
+)
+from scrape_cache import ScrapeCache
+
+def clean_text(text):
+    if not text:
+        return text
+    text = text.replace('\n', ' ')
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+def extract_job_id(url):
+    job_id_match = re.search(r"/jobs/view/(\d+)/", url)
+    return job_id_match.group(1) if job_id_match else ""
+
+def host_allowed(host, port, allowed_hosts):
+    for allowed in allowed_hosts:
+        allowed_host, _, allowed_port = allowed.lower().partition(':')
+        if allowed_port:
+            if host == allowed_host and port == int(allowed_port):
+                return True
+        elif (host == allowed_host or host.endswith('.' + allowed_host)) and port in (None, 80, 443):
+            return True
+    return False
+
+def is_linkedin_job_url(url, allowed_hosts=SCRAPE_ALLOWED_HOSTS):
+    """
+    True for http(s) URLs of job pages (/jobs/...) on allowed_hosts, LinkedIn
+    by default. Nothing else is fetched, so callers cannot point the server
+    at internal hosts or other sites.
+    """
+    try:
+        parsed = urlparse(url)
+        port = parsed.port
+    except (ValueError, TypeError):
+        return False
+    return (parsed.scheme in ('http', 'https')
+            and host_allowed((parsed.hostname or '').lower(), port, allowed_hosts)
+            and parsed.username is None and parsed.password is None
+            and parsed.path.startswith('/jobs/'))
+
+class HostRateLimiter:
+    """
+    PER-HOST RATE LIMIT:
+    Spaces requests to the same host at least 1/rate seconds apart across all
+    threads. Hosts are independent, so one slow host does not hold up others.
+    """
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def delay(self, host, seconds):
+        # Backoff: push the host's next slot out instead of sleeping in place
+        with self._lock:
+            self._next_slot[host] = max(self._next_slot.get(host, 0.0), time.monotonic() + seconds)
+
+def create_session(pool_size=SCRAPE_MAX_WORKERS):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+# Redirects followed by fetch_page when it checks every hop
+MAX_REDIRECTS = 5
+
+def get_checked(session, url, url_allowed, timeout, headers):
+    """
+    session.get() that follows redirects itself and stops at one whose
+    target url_allowed rejects
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        response = session.get(url, timeout=timeout, headers=headers, allow_redirects=False)
+        if not response.is_redirect:
+            return response
+        url = urljoin(url, response.headers['Location'])
+        if not url_allowed(url):
+            raise requests.RequestException(f"Redirect to a disallowed URL: {url}")
+    raise requests.TooManyRedirects(f"More than {MAX_REDIRECTS} redirects")
+
+def fetch_page(url, session, rate_limiter, max_retries=SCRAPE_MAX_RETRIES, timeout=SCRAPE_TIMEOUT_SECONDS,
+               headers=None, url_allowed=None):
+    """
+    Fetches a page over the shared session. Returns (response, None) on a
+    200 or 304 response, or (None, error message) after max_retries attempts.
+    With url_allowed, redirects are only followed to URLs it accepts.
+    """
+    host = urlparse(url).netloc
+    for attempt in range(max_retries):
+        rate_limiter.wait(host)
+        try:
+            if url_allowed:
+                response = get_checked(session, url, url_allowed, timeout, headers)
+            else:
+                response = session.get(url, timeout=timeout, headers=headers)
+            if response.status_code in (200, 304):
+                return response, None
+            logging.warning(f"Attempt {attempt + 1} for {url} failed with status code: {response.status_code}")
+        except requests.RequestException as e:
+            logging.error(f"Request failed: {e}")
+        rate_limiter.delay(host, 2 ** attempt)
+    return None, f"Failed to fetch job page after {max_retries} attempts."
+
+# Precompiled patterns for splitting a description into sections
+SECTION_HEADER_RE = re.compile(r'(?=[A-Z][a-z]+:)')
+SECTION_KEYWORD_RE = re.compile(r'(?=\b(?:Requirements|Qualifications|Skills|What You\'ll Need|You Have|About the Role|Job Description|Responsibilities)\b)',
+                                re.IGNORECASE)
+REQUIREMENTS_HEADER_RE = re.compile(r'^(Requirements|Qualifications|Skills|What You\'ll Need|You Have|Must Have)', re.IGNORECASE)
+BENEFITS_HEADER_RE = re.compile(r'^(Benefits|Perks|What We Offer)', re.IGNORECASE)
+DESCRIPTION_HEADER_RE = re.compile(r'^(About the Role|Job Description|Responsibilities)', re.IGNORECASE)
+REQUIREMENT_TERMS_RE = re.compile(r'\b(experience|knowledge|skills|ability|degree|qualifications?)\b', re.IGNORECASE)
+REQUIREMENT_SENTENCE_RE = re.compile(r'\b(experience|knowledge|skills|ability|degree|qualifications?|proficient|familiar|understanding)\b',
+                                     re.IGNORECASE)
+SALARY_RE = re.compile(r"\$[\d,]+(?:\.\d{2})?(?:\s*-\s*\$[\d,]+(?:\.\d{2})?)?")
+
+# (tag, class) of each LinkedIn element the scraper reads; the first match in document order wins
+LINKEDIN_SELECTORS = {
+    ('h1', 'top-card-layout__title'): 'title',
+    ('a', 'topcard__org-name-link'): 'company',
+    ('div', 'show-more-less-html__markup'): 'description',
+    ('ul', 'description__job-criteria-list'): 'criteria',
+    ('span', 'posted-time-ago__text'): 'posting_date',
+    ('span', 'topcard__flavor--bullet'): 'location',
+    ('span', 'workplace-type'): 'remote_status'
+}
+
+def extract_fields_bs4(html):
+    """
+    Reference extractor: BeautifulSoup with the pure-Python html.parser
+    """
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "html.parser")
+    fields = {}
+    elements = {field: soup.find(tag, class_=css_class) for (tag, css_class), field in LINKEDIN_SELECTORS.items()}
+    
+    for field in ('title', 'company', 'posting_date', 'location', 'remote_status'):
+        fields[field] = elements[field].text if elements[field] else None
+    
+    description = elements['description']
+    fields['description_text'] = description.get_text(separator=" ", strip=True) if description else None
+    fields['description_raw'] = description.text if description else None
+    
+    fields['criteria'] = []
+    if elements['criteria']:
+        for item in elements['criteria'].find_all("li"):
+            header = item.find("h3")
+            value = item.find("span")
+            fields['criteria'].append((header.text if header else "", value.text if value else ""))
+    
+    fields['company_link'] = elements['company'].get("href") if elements['company'] else None
+    return fields
+
+def extract_fields_lxml(html):
+    """
+    FAST EXTRACTOR:
+    Parses with lxml and collects every target element in a single pass
+    over the tree, stopping as soon as all of them have been found.
+    """
+    root = lxml.html.fromstring(html)
+    elements = {}
+    for element in root.iter(etree.Element):
+        css_classes = element.get('class')
+        if not css_classes:
+            continue
+        for css_class in css_classes.split():
+            field = LINKEDIN_SELECTORS.get((element.tag, css_class))
+            if field and field not in elements:
+                elements[field] = element
+        if len(elements) == len(LINKEDIN_SELECTORS):
+            break
+    
+    fields = {}
+    for field in ('title', 'company', 'posting_date', 'location', 'remote_status'):
+        fields[field] = elements[field].text_content() if field in elements else None
+    
+    description = elements.get('description')
+    if description is not None:
+        text_nodes = description.xpath('.//text()')
+        fields['description_text'] = ' '.join(text.strip() for text in text_nodes if text.strip())
+        fields['description_raw'] = ''.join(text_nodes)
+    else:
+        fields['description_text'] = None
+        fields['description_raw'] = None
+    
+    fields['criteria'] = []
+    if 'criteria' in elements:
+        for item in elements['criteria'].iter('li'):
+            header = item.find('.//h3')
+            value = item.find('.//span')
+            fields['criteria'].append((header.text_content() if header is not None else "",
+                                       value.text_content() if value is not None else ""))
+    
+    fields['company_link'] = elements['company'].get('href') if 'company' in elements else None
+    return fields
+
+def split_description(full_text):
+    sections = SECTION_HEADER_RE.split(full_text)
+    if len(sections) == 1:
+        sections = SECTION_KEYWORD_RE.split(full_text)
+    
+    description_parts = []
+    requirements_parts = []
+    benefits_parts = []
+    
+    for section in sections:
+        section = clean_text(section)
+        if not section:
+            continue
+            
+        if REQUIREMENTS_HEADER_RE.search(section):
+            requirements_parts.append(section)
+        elif BENEFITS_HEADER_RE.search(section):
+            benefits_parts.append(section)
+        elif DESCRIPTION_HEADER_RE.search(section):
+            description_parts.append(section)
+        else:
+            if not requirements_parts and REQUIREMENT_TERMS_RE.search(section):
+                requirements_parts.append(section)
+            else:
+                description_parts.append(section)
+    
+    return description_parts, requirements_parts, benefits_parts
+
+def build_job_data(fields, job_id=""):
+    job_data = copy.deepcopy(JOB_DATA_STRUCTURE)
+    job_data["job_id_or_ref_code"] = job_id
+    job_data["job_title"] = fields['title'] or ""
+    job_data["company_name"] = fields['company'] or ""
+    
+    if fields['description_text'] is not None:
+        full_text = clean_text(fields['description_text'])
+        description_parts, requirements_parts, benefits_parts = split_description(full_text)
+        
+        if description_parts:
+            job_data["job_description"] = ' '.join(description_parts)
+        else:
+            job_data["job_description"] = full_text
+        
+        if requirements_parts:
+            job_data["requirements"] = ' '.join(requirements_parts)
+        else:
+            from nltk.tokenize import sent_tokenize
+            req_sentences = [sentence for sentence in sent_tokenize(full_text)
+                             if REQUIREMENT_SENTENCE_RE.search(sentence)]
+            if req_sentences:
+                job_data["requirements"] = ' '.join(req_sentences)
+        
+        if benefits_parts:
+            job_data["benefits"] = ' '.join(benefits_parts)
+    
+    for header, value in fields['criteria']:
+        header = clean_text(header).lower()
+        value = clean_text(value)
+        if "employment type" in header:
+            job_data["employment_type"] = value
+        elif "job function" in header:
+            job_data["job_function"] = value
+        elif "industries" in header:
+            job_data["industry"] = value
+        elif "seniority level" in header:
+            job_data["required_experience"] = value
+    
+    job_data["posting_date"] = fields['posting_date'] or ""
+    job_data["job_location"] = fields['location'] or ""
+    job_data["remote_status"] = fields['remote_status'].capitalize() if fields['remote_status'] else ""
+    
+    company_link = fields['company_link']
+    if company_link:
+        job_data["company_social_media_links"].append(company_link)
+        if "linkedin.com" in company_link:
+            job_data["company_website"] = company_link
+    
+    if fields['description_raw']:
+        salary_matches = SALARY_RE.findall(fields['description_raw'])
+        if salary_matches:
+            job_data["salary_info_raw"] = ", ".join(salary_matches)
+    
+    # Every string field gets its single clean_text pass here
+    for key in job_data:
+        if isinstance(job_data[key], str):
+            job_data[key] = clean_text(job_data[key])
+    
+    return job_data
+
+def parse_linkedin_job(html, job_id="", parser=None):
+    """
+    Parses a LinkedIn job page into a JOB_DATA_STRUCTURE dict. Uses the lxml
+    extractor when lxml is installed, otherwise BeautifulSoup; a page lxml
+    cannot parse goes to BeautifulSoup. Only a page neither can parse gives
+    empty fields.
+    """
+    parser = parser or HTML_PARSER
+    if parser == 'auto':
+        parser = 'lxml' if lxml is not None else 'bs4'
+    fields = None
+    if parser == 'lxml':
+        try:
+            fields = extract_fields_lxml(html)
+        except Exception as e:
+            logging.warning(f"Failed to parse job page with lxml, retrying with bs4: {e}")
+    if fields is None:
+        try:
+            fields = extract_fields_bs4(html)
+        except Exception as e:
+            logging.warning(f"Failed to parse job page with bs4: {e}")
+            fields = {field: None for field in LINKEDIN_SELECTORS.values()}
+            fields.update({'description_text': None, 'description_raw': None, 'criteria': [], 'company_link': None})
+    return build_job_data(fields, job_id)
+
+_default_session = None
+_default_rate_limiter = HostRateLimiter(SCRAPE_REQUESTS_PER_SECOND_PER_HOST)
+_default_cache = None
+_default_lock = threading.Lock()
+
+def get_default_session():
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = create_session()
+        return _default_session
+
+def get_default_cache():
+    global _default_cache
+    if not SCRAPE_CACHE_DB:
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ScrapeCache(SCRAPE_CACHE_DB, SCRAPE_CACHE_TTL_SECONDS)
+        return _default_cache
+
+def scrape_linkedin_job(url, session=None, rate_limiter=None, cache=None, allowed_hosts=SCRAPE_ALLOWED_HOSTS):
+    """
+    Scrapes one job posting. With a cache, a fresh entry for the job ID is
+    returned without network I/O or parsing, and a stale one is revalidated
+    with If-None-Match / If-Modified-Since before re-downloading. URLs that
+    are not job pages on allowed_hosts are rejected without a request, and
+    redirects are only followed to such pages.
+    """
+    if not is_linkedin_job_url(url, allowed_hosts):
+        return {"error": f"Not a LinkedIn job URL: {url}"}
+    session = session or get_default_session()
+    rate_limiter = rate_limiter or _default_rate_limiter
+    cache = cache if cache is not None else get_default_cache()
+    job_id = extract_job_id(url)
+    cache_key = job_id or url
+    
+    cached = cache.get(cache_key) if cache else None
+    if cached and cached['is_fresh']:
+        cache.record('fresh_hits')
+        return cached['job_data']
+    
+    conditional_headers = {}
+    if cached:
+        if cached['etag']:
+            conditional_headers['If-None-Match'] = cached['etag']
+        if cached['last_modified']:
+            conditional_headers['If-Modified-Since'] = cached['last_modified']
+    
+    response, error = fetch_page(url, session, rate_limiter, headers=conditional_headers or None,
+                                 url_allowed=lambda target: is_linkedin_job_url(target, allowed_hosts))
+    if error:
+        return {"error": error}
+    
+    if response.status_code == 304 and cached:
+        cache.touch(cache_key)
+        cache.record('revalidated')
+        return cached['job_data']
+    
+    job_data = parse_linkedin_job(response.text, job_id)
+    if cache:
+        cache.record('misses')
+        cache.put(cache_key, url, response.text, job_data,
+                  etag=response.headers.get('ETag'),
+                  last_modified=response.headers.get('Last-Modified'))
+    return job_data
+
+def scrape_linkedin_jobs(urls, max_workers=SCRAPE_MAX_WORKERS, session=None, rate_limiter=None, cache=None,
+                         allowed_hosts=SCRAPE_ALLOWED_HOSTS):
+    """
+    CONCURRENT SCRAPER:
+    Fetches and parses many job URLs over one pooled session, rate limited
+    per host. Results are returned in the order of the input URLs; failed
+    URLs yield {"error": ...} entries.
+    """
+    session = session or get_default_session()
+    rate_limiter = rate_limiter or _default_rate_limiter
+    cache = cache if cache is not None else get_default_cache()
+
+    def scrape_one(url):
+        try:
+            return scrape_linkedin_job(url, session, rate_limiter, cache, allowed_hosts)
+        except Exception as e:
+            logging.error(f"Error scraping LinkedIn job {url}: {e}")
+            return {"error": f"Failed to scrape job: {e}"}
+
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls)))) as pool:
+        return list(pool.map(scrape_one, urls))
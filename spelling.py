@@ -0,0 +1,50 @@
+import gc
+import os
+import threading
+import logging
+from functools import lru_cache
+
+_spell_checker = None
+_spell_checker_lock = threading.Lock()
+
+WORD_CACHE_SIZE = 50000
+
+def get_spell_checker():
+    """
+    SHARED SPELL CHECKER:
+    Loads the word-frequency dictionary once per process. pipeline.warm_up() calls
+    preload_spell_checker() before workers fork (e.g. gunicorn --preload) so children share the pages.
+    """
+    global _spell_checker
+    if _spell_checker is None:
+        with _spell_checker_lock:
+            if _spell_checker is None:
+                logging.info("Loading spell checker dictionary")
+                from spellchecker import SpellChecker
+                _spell_checker = SpellChecker()
+    return _spell_checker
+
+def _reset_after_fork():
+    # A loader thread of the parent may have held the lock when it forked
+    global _spell_checker_lock
+    _spell_checker_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+def preload_spell_checker():
+    get_spell_checker()
+    # Freeze the loaded objects so the garbage collector does not touch
+    # (and copy) the dictionary pages in forked workers
+    gc.freeze()
+
+@lru_cache(maxsize=WORD_CACHE_SIZE)
+def is_misspelled(word):
+    return bool(get_spell_checker().unknown([word]))
+
+def unknown_words(words):
+    """
+    Drop-in replacement for SpellChecker().unknown() backed by the shared
+    dictionary and a per-word LRU cache
+    """
+    return {word.lower() for word in words if is_misspelled(word.lower())}
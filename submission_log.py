@@ -0,0 +1,89 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+class BatchWriter:
+    """
+    WRITE-BEHIND LOGGER:
+    Collects items on a queue and hands them to flush_fn in batches from a
+    background thread, when batch_size items are waiting or flush_interval
+    seconds have passed. Pending items are flushed at interpreter exit.
+    """
+
+    def __init__(self, flush_fn, batch_size=100, flush_interval=2.0, max_queue=10000):
+        self.flush_fn = flush_fn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stopping = threading.Event()
+        atexit.register(self.close)
+
+    def submit(self, item):
+        self._ensure_started()
+        # Blocks when the queue is full, which applies backpressure instead of dropping rows
+        self._queue.put(item)
+
+    def _ensure_started(self):
+        # A thread started before a fork does not exist in the child; start one per process
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._stopping.clear()
+                self._thread = threading.Thread(target=self._run, name='submission-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._flush(batch)
+        self._drain()
+
+    def _collect(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+            if self._stopping.is_set():
+                break
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._flush(batch)
+
+    def _flush(self, batch):
+        try:
+            self.flush_fn(batch)
+        except Exception as e:
+            logging.error(f"Failed to write {len(batch)} logged submissions: {e}")
+
+    def close(self, timeout=10):
+        """
+        Stops the writer thread after flushing everything still queued
+        """
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid() and thread.is_alive():
+            thread.join(timeout)
+        self._drain()
@@ -0,0 +1,186 @@
+import argparse
+import csv
+import json
+import logging
+import re
+import sqlite3
+import time
+from urllib.parse import urlparse
+from values import SUBMISSION_FIELDNAMES, SUBMISSIONS_CSV, SUBMISSIONS_DB
+
+# CSV headers that are stored under a cleaner column name
+LIST_COLUMNS = {
+    'company_social_media_links__-': 'company_social_media_links',
+    'attachments__-': 'attachments'
+}
+
+POSTING_COLUMNS = [LIST_COLUMNS.get(field, field) for field in SUBMISSION_FIELDNAMES if field != 'is_real']
+
+INDEXED_COLUMNS = ['company_name', 'domain', 'posting_date', 'verdict', 'submitted_at', 'labeled_at']
+
+def connect(db_path=SUBMISSIONS_DB):
+    connection = sqlite3.connect(db_path, timeout=30)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.execute('PRAGMA synchronous=NORMAL')
+    init_store(connection)
+    return connection
+
+def init_store(connection):
+    columns = ',\n    '.join(f'"{column}" TEXT' for column in POSTING_COLUMNS)
+    connection.execute(f'''
+        CREATE TABLE IF NOT EXISTS submissions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            submitted_at REAL,
+            source TEXT,
+            domain TEXT,
+            model_prediction TEXT,
+            verdict TEXT,
+            score INTEGER,
+            is_real INTEGER,
+            label INTEGER,
+            labeled_at REAL,
+            {columns}
+        )''')
+    existing = {row[1] for row in connection.execute('PRAGMA table_info(submissions)')}
+    if 'label' not in existing:
+        # Reviewed ground truth (1 real, 0 fake), added after the first schema
+        connection.execute('ALTER TABLE submissions ADD COLUMN label INTEGER')
+    if 'labeled_at' not in existing:
+        # When the label was last set, so retraining picks up rows labeled after it scanned them
+        connection.execute('ALTER TABLE submissions ADD COLUMN labeled_at REAL')
+    for column in INDEXED_COLUMNS:
+        connection.execute(f'CREATE INDEX IF NOT EXISTS idx_submissions_{column} ON submissions ("{column}")')
+    connection.commit()
+
+def submission_domain(job_data):
+    """
+    Domain of the application contact (email or URL), used for indexed lookups
+    """
+    contact = str(job_data.get('application_link_or_email') or job_data.get('company_website') or '').lower()
+    email_match = re.search(r'[\w\.-]+@([\w\.-]+\.\w+)', contact)
+    if email_match:
+        return email_match.group(1)
+    parsed = urlparse(contact if '://' in contact else f'http://{contact}')
+    netloc = parsed.netloc.split(':')[0]
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+def column_value(value):
+    if isinstance(value, (list, tuple)):
+        return json.dumps(list(value))
+    if value is None:
+        return ''
+    return str(value)
+
+def build_record(job_data, result, source='web'):
+    record = {
+        'submitted_at': time.time(),
+        'source': source,
+        'domain': submission_domain(job_data),
+        'model_prediction': result.get('model_prediction'),
+        'verdict': result.get('final_prediction'),
+        'score': result.get('score'),
+        # Same label the CSV log used: the CatBoost prediction before rule overrides
+        'is_real': 1 if result.get('model_prediction') == "Real Job" else 0
+    }
+    for column in POSTING_COLUMNS:
+        record[column] = column_value(job_data.get(column, ''))
+    return record
+
+def insert_records(records, db_path=SUBMISSIONS_DB):
+    if not records:
+        return
+    columns = list(records[0])
+    placeholders = ', '.join('?' for _ in columns)
+    column_list = ', '.join(f'"{column}"' for column in columns)
+    connection = connect(db_path)
+    try:
+        with connection:
+            connection.executemany(
+                f'INSERT INTO submissions ({column_list}) VALUES ({placeholders})',
+                [[record[column] for column in columns] for record in records]
+            )
+    finally:
+        connection.close()
+
+def set_label(submission_ids, is_real, db_path=SUBMISSIONS_DB):
+    """
+    Records a reviewed label for submissions; only labeled rows are used for retraining
+    """
+    connection = connect(db_path)
+    try:
+        with connection:
+            now = time.time()
+            cursor = connection.executemany('UPDATE submissions SET label = ?, labeled_at = ? WHERE id = ?',
+                                            [(1 if is_real else 0, now, submission_id) for submission_id in submission_ids])
+        return cursor.rowcount
+    finally:
+        connection.close()
+
+def migrate_csv(csv_path=SUBMISSIONS_CSV, db_path=SUBMISSIONS_DB, force=False, chunk_size=1000):
+    """
+    Imports the legacy userinputs.csv log. Values that the CSV writer mangled
+    (',' stored as ';', newlines stripped) cannot be restored and are kept as-is.
+    """
+    connection = connect(db_path)
+    try:
+        already_migrated = connection.execute(
+            "SELECT COUNT(*) FROM submissions WHERE source = 'csv_migration'").fetchone()[0]
+    finally:
+        connection.close()
+    if already_migrated and not force:
+        logging.warning(f"{already_migrated} rows were already migrated; use --force to import again")
+        return 0
+
+    migrated = 0
+    batch = []
+    with open(csv_path, newline='', encoding='utf-8-sig') as csvfile:
+        for row in csv.DictReader(csvfile):
+            job_data = {LIST_COLUMNS.get(field, field): value for field, value in row.items() if field}
+            for column in LIST_COLUMNS.values():
+                job_data[column] = [item.strip() for item in job_data.get(column, '').split(';') if item.strip()]
+            label = "Real Job" if str(row.get('is_real', '')).strip() == '1' else "Fake Job"
+            result = {'model_prediction': label, 'final_prediction': label}
+            record = build_record(job_data, result, source='csv_migration')
+            # The CSV log has no timestamps
+            record['submitted_at'] = None
+            batch.append(record)
+            if len(batch) >= chunk_size:
+                insert_records(batch, db_path)
+                migrated += len(batch)
+                batch = []
+    insert_records(batch, db_path)
+    migrated += len(batch)
+    return migrated
+
+def main():
+    parser = argparse.ArgumentParser(description='Submission store maintenance')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    migrate_parser = subparsers.add_parser('migrate', help='Import the legacy CSV submission log')
+    migrate_parser.add_argument('--csv', default=SUBMISSIONS_CSV)
+    migrate_parser.add_argument('--db', default=SUBMISSIONS_DB)
+    migrate_parser.add_argument('--force', action='store_true', help='Import even if a migration already ran')
+    label_parser = subparsers.add_parser('label', help='Record the reviewed label of submissions')
+    label_parser.add_argument('ids', nargs='+', type=int, help='Submission ids')
+    label_group = label_parser.add_mutually_exclusive_group(required=True)
+    label_group.add_argument('--real', action='store_true')
+    label_group.add_argument('--fake', action='store_true')
+    label_parser.add_argument('--db', default=SUBMISSIONS_DB)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    if args.command == 'migrate':
+        migrated = migrate_csv(args.csv, args.db, args.force)
+        logging.info(f"Migrated {migrated} submissions from {args.csv} into {args.db}")
+    elif args.command == 'label':
+        updated = set_label(args.ids, args.real, args.db)
+        logging.info(f"Labeled {updated} submissions as {'real' if args.real else 'fake'}")
+        if args.fake:
+            # Reviewed scams become known scams for near-duplicate detection
+            from near_duplicates import add_labeled_submissions, get_default_index
+
+            index = get_default_index()
+            if index is not None:
+                logging.info(f"Added {add_labeled_submissions(index, args.db)} postings to the near-duplicate index")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+import functools
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+os.environ.setdefault('STARTUP_MODE', 'lazy')
+
+import app
+import domain_reputation
+import near_duplicates
+
+class ScrapeAndScoreInputTest(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.app.test_client()
+
+    def post(self, body):
+        return self.client.post('/api/scrape_and_score', data=body, content_type='application/json')
+
+    def test_rejects_payloads_that_are_not_objects(self):
+        for body in ('[1]', '"x"', '3', 'null', 'not json'):
+            response = self.post(body)
+            self.assertEqual(response.status_code, 400, body)
+            self.assertIn('urls', response.get_json()['error'])
+
+    def test_rejects_urls_that_are_not_a_list_of_strings(self):
+        for body in ('{}', '{"urls": "https://www.linkedin.com/jobs/view/1/"}', '{"urls": [1]}'):
+            self.assertEqual(self.post(body).status_code, 400, body)
+
+    def test_rejects_urls_outside_linkedin_before_fetching(self):
+        response = self.post('{"urls": ["https://www.linkedin.com/jobs/view/1/", "http://169.254.169.254/latest"]}')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['invalid_urls'], ['http://169.254.169.254/latest'])
+
+class PredictBatchTest(unittest.TestCase):
+    """
+    /api/predict_batch scores postings together; each result must match what
+    /predict gives for the same posting on its own
+    """
+
+    def setUp(self):
+        with open(os.path.join(REPO_DIR, 'Job.json'), encoding='utf-8') as f:
+            jobs = json.load(f)
+        # Form posts carry text fields only
+        self.postings = [{field: value for field, value in job.items() if isinstance(value, str)} for job in jobs[:40]]
+        self.client = app.app.test_client()
+        enabled = domain_reputation.lookups_enabled()
+        domain_reputation.set_lookups_enabled(False)
+        self.addCleanup(domain_reputation.set_lookups_enabled, enabled)
+        # Every posting is scored from scratch, without the result cache, known scams or the submission log
+        for patch in (mock.patch.object(app, 'score_postings', functools.partial(app.score_postings, use_cache=False)),
+                      mock.patch.object(near_duplicates, 'NEAR_DUPLICATE_ENABLED', False),
+                      mock.patch.object(app, 'log_user_submission')):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def predict(self, posting):
+        with mock.patch.object(app, 'render_template', lambda template, **context: json.dumps(context)):
+            response = self.client.post('/predict', data=posting)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.get_data(as_text=True))
+
+    def test_batch_results_match_single_predictions(self):
+        response = self.client.post('/api/predict_batch', json=self.postings)
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()['results']
+        self.assertEqual(len(results), len(self.postings))
+
+        verdicts = set()
+        for posting, result in zip(self.postings, results):
+            single = self.predict(posting)
+            details = single['verification_details']
+            self.assertEqual(result['job_title'], posting['job_title'])
+            self.assertEqual((result['final_prediction'], result['model_prediction'], result['score']),
+                             (single['prediction_text'], single['model_prediction'], single['score']))
+            self.assertAlmostEqual(result['real_probability'], details['real_probability'], places=4)
+            self.assertEqual((result['critical_issues_count'], result['total_issues_count']),
+                             (details['critical_issues_count'], details['total_issues_count']))
+            self.assertEqual(result['issues'][:len(single['suspicious_features'])], single['suspicious_features'])
+            verdicts.add(result['final_prediction'])
+        self.assertEqual(verdicts, {"Real Job", "Fake Job"})
+
+    def test_rejects_batches_that_are_not_arrays_of_objects(self):
+        self.assertEqual(self.client.post('/api/predict_batch', json={'job_title': 'x'}).status_code, 400)
+        self.assertEqual(self.client.post('/api/predict_batch', json=[{'job_title': 'x'}, 'y']).status_code, 400)
+        self.assertEqual(self.client.post('/api/predict_batch', json=[]).get_json(), {'results': []})
+
+if __name__ == '__main__':
+    unittest.main()
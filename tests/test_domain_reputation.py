@@ -0,0 +1,132 @@
+import os
+import socket
+import sys
+import threading
+import unittest
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.rrset
+from domain_reputation import (
+    DomainCache, DomainReputation, build_resolver, lookup_dns, lookup_whois, lookups_enabled, set_lookups_enabled,
+    get_default_reputation
+)
+from verify import check_domain_reputation
+
+# Canned DNS zone served by StubDNSServer: (name, type) -> records
+ZONE = {
+    ('acme-hiring.com.', 'MX'): ['10 mail.acme-hiring.com.'],
+    ('acme-hiring.com.', 'A'): ['192.0.2.10'],
+    ('newco-jobs.com.', 'A'): ['192.0.2.20'],
+}
+
+class StubDNSServer:
+    """
+    Answers queries for ZONE on a local UDP port: NXDOMAIN for unknown
+    names, an empty answer for known names without records of the type
+    """
+
+    def __init__(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.port = self.socket.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                data, address = self.socket.recvfrom(4096)
+            except OSError:
+                return
+            query = dns.message.from_wire(data)
+            question = query.question[0]
+            name, rdtype = question.name.to_text(), dns.rdatatype.to_text(question.rdtype)
+            response = dns.message.make_response(query)
+            if (name, rdtype) in ZONE:
+                response.answer.append(dns.rrset.from_text_list(name, 300, 'IN', rdtype, ZONE[(name, rdtype)]))
+            elif not any(known == name for known, _ in ZONE):
+                response.set_rcode(dns.rcode.NXDOMAIN)
+            self.socket.sendto(response.to_wire(), address)
+
+    def close(self):
+        self.socket.close()
+
+def canned_whois(entries):
+    def lookup(domain, timeout):
+        if domain not in entries:
+            raise Exception(f'No match for "{domain.upper()}".')
+        return entries[domain]
+    return lookup
+
+class DomainReputationTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubDNSServer()
+        cls.resolver = build_resolver(['127.0.0.1'], cls.server.port)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.close()
+
+    def test_lookup_dns(self):
+        self.assertEqual(lookup_dns(self.resolver, 'acme-hiring.com', 'MX', 2), ('ok', ['mail.acme-hiring.com']))
+        self.assertEqual(lookup_dns(self.resolver, 'acme-hiring.com', 'A', 2), ('ok', ['192.0.2.10']))
+        self.assertEqual(lookup_dns(self.resolver, 'newco-jobs.com', 'MX', 2), ('negative', []))
+        self.assertEqual(lookup_dns(self.resolver, 'gone-jobs.com', 'A', 2), ('negative', []))
+
+    def test_lookup_whois(self):
+        lookup = canned_whois({
+            'acme-hiring.com': {'domain_name': 'ACME-HIRING.COM', 'registrar': ['Example Registrar'],
+                                'creation_date': [datetime(2005, 3, 1), datetime(2005, 3, 2)]},
+            'empty.com': {'domain_name': None}
+        })
+        self.assertEqual(lookup_whois(lookup, 'acme-hiring.com', 2), ('ok', {
+            'creation_date': '2005-03-01T00:00:00+00:00', 'registrar': 'Example Registrar'
+        }))
+        self.assertEqual(lookup_whois(lookup, 'empty.com', 2), ('negative', {}))
+        self.assertEqual(lookup_whois(lookup, 'gone-jobs.com', 2), ('negative', {}))
+
+        def unreachable(domain, timeout):
+            raise ConnectionRefusedError('Connection refused')
+        self.assertEqual(lookup_whois(unreachable, 'acme-hiring.com', 2), ('error', 'Connection refused'))
+
+    def test_check_domain_reputation(self):
+        recent = datetime.now(timezone.utc) - timedelta(days=10)
+        reputation = DomainReputation(DomainCache(':memory:'), resolver=self.resolver, budget=5, whois_lookup=canned_whois({
+            'acme-hiring.com': {'domain_name': 'ACME-HIRING.COM', 'creation_date': datetime(2005, 3, 1)},
+            'newco-jobs.com': {'domain_name': 'NEWCO-JOBS.COM', 'creation_date': recent}
+        }))
+        contact_info = 'hr@acme-hiring.com, apply@newco-jobs.com, gone-jobs.com'
+        issues, reasons, pending = check_domain_reputation(
+            contact_info, reputation, ['acme-hiring.com', 'newco-jobs.com', 'gone-jobs.com'])
+
+        self.assertEqual(pending, 0)
+        self.assertEqual(issues, {'no_mx_records', 'newly_registered_domain', 'unresolvable_domain'})
+        self.assertEqual(reasons, {
+            'Email domain cannot receive mail (no MX records): newco-jobs.com': 'no_mx_records',
+            'Domain registered only 10 days ago: newco-jobs.com': 'newly_registered_domain',
+            'Domain does not exist or has no DNS records: gone-jobs.com': 'unresolvable_domain'
+        })
+
+        # Answers are served from the cache the second time
+        lookups = reputation.stats['lookups']
+        check_domain_reputation(contact_info, reputation, ['acme-hiring.com', 'newco-jobs.com', 'gone-jobs.com'])
+        self.assertEqual(reputation.stats['lookups'], lookups)
+
+    def test_lookups_disabled(self):
+        enabled = lookups_enabled()
+        set_lookups_enabled(False)
+        try:
+            self.assertIsNone(get_default_reputation())
+            self.assertEqual(check_domain_reputation('hr@gone-jobs.com'), (set(), {}, 0))
+        finally:
+            set_lookups_enabled(enabled)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import json
+import os
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from phrase_index import PhraseIndex
+from rule_definitions import get_default_plan
+from verify import PostingContext
+
+def substring_hits(tables, text):
+    # The per-phrase checks the index replaced
+    lowered = text.lower()
+    return {category: {phrase.lower() for phrase in phrases if phrase and phrase.lower() in lowered}
+            for category, phrases in tables.items()}
+
+def plan_tables(plan):
+    # The tables RulePlan compiles into its index
+    tables = {name: [phrase for phrase, _ in pairs] for name, pairs in plan.terms.items()}
+    for rule in plan.rules:
+        if rule.type == 'phrases':
+            tables[rule.id] = list(rule.matches)
+    return tables
+
+class PhraseIndexTest(unittest.TestCase):
+
+    def test_overlapping_phrases(self):
+        tables = {
+            'short': ['he', 'his', 'she'],
+            'long': ['hers', 'She Sells', 'ushers'],
+            'shared': ['he', 'sea shells', '']
+        }
+        index = PhraseIndex(tables)
+        for text in ('', 'ushers', 'SHE sells sea shells', 'his hershey', 'h', 'the end'):
+            self.assertEqual(index.scan(text), substring_hits(tables, text), text)
+
+    def test_rule_plan_matches_substring_checks_on_job_postings(self):
+        plan = get_default_plan()
+        tables = plan_tables(plan)
+        self.assertEqual(set(plan.phrase_index.categories), set(tables))
+        with open(os.path.join(REPO_DIR, 'Job.json'), encoding='utf-8') as f:
+            jobs = json.load(f)
+
+        matched = set()
+        for job_data in jobs:
+            context = PostingContext(job_data)
+            for text in (context.text, context.clean_text):
+                hits = plan.scan(text)
+                self.assertEqual(hits, substring_hits(tables, text), job_data.get('job_title'))
+                matched.update(category for category, phrases in hits.items() if phrases)
+        # The postings exercise most tables, not only the empty case
+        self.assertGreater(len(matched), len(tables) // 2)
+
+if __name__ == '__main__':
+    unittest.main()
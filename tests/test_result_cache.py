@@ -0,0 +1,125 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import domain_reputation
+import pipeline
+from result_cache import ResultCache, posting_cache_key
+from rule_definitions import RulePlan, read_definitions
+from values import RULE_DEFINITIONS_FILE
+
+FIELDS = ['job_title', 'job_description', 'company_social_media_links']
+
+class PostingCacheKeyTest(unittest.TestCase):
+
+    def test_key_covers_normalized_fields_and_namespace(self):
+        posting = {'job_title': 'Data  Analyst', 'job_description': ' SQL\nreports ', 'company_social_media_links': ['a', 'b']}
+        key = posting_cache_key(posting, FIELDS, 'model-1')
+
+        self.assertEqual(key, posting_cache_key({'job_title': 'Data Analyst', 'job_description': 'SQL reports',
+                                                 'company_social_media_links': 'a, b'}, FIELDS, 'model-1'))
+        self.assertEqual(key, posting_cache_key({**posting, 'benefits': 'Health insurance'}, FIELDS, 'model-1'))
+        self.assertNotEqual(key, posting_cache_key({**posting, 'job_title': 'Data Engineer'}, FIELDS, 'model-1'))
+        self.assertNotEqual(key, posting_cache_key(posting, FIELDS, 'model-2'))
+        # Fields are separated, so text cannot move from one field to the next
+        self.assertNotEqual(posting_cache_key({'job_title': 'ab', 'job_description': ''}, FIELDS),
+                            posting_cache_key({'job_title': 'a', 'job_description': 'b'}, FIELDS))
+
+class ResultCacheTest(unittest.TestCase):
+
+    def test_lru_eviction_and_ttl(self):
+        cache = ResultCache(max_entries=2, ttl_seconds=60)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+        self.assertEqual(cache.stats['evictions'], 1)
+
+        with mock.patch('result_cache.time.time', return_value=cache._entries['a'][0] + 61):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats['expirations'], 1)
+
+    def test_disk_entries_are_shared(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'result_cache.sqlite3')
+            ResultCache(db_path=path).put('key', {'score': 42})
+            cache = ResultCache(db_path=path)
+            self.assertEqual(cache.get('key'), {'score': 42})
+            self.assertEqual(cache.stats['disk_hits'], 1)
+
+class FakeIndex:
+    # Stands in for the near-duplicate index: no known scams, a settable generation
+    generation = 0
+
+    def refresh_if_due(self):
+        pass
+
+    def query_text(self, text):
+        return None
+
+class ScorePostingsCacheTest(unittest.TestCase):
+    """
+    score_postings caches results under a namespace of everything they
+    depend on besides the posting: a change to any part is a miss
+    """
+
+    def setUp(self):
+        with open(os.path.join(REPO_DIR, 'Job.json'), encoding='utf-8') as f:
+            self.posting = pipeline.normalize_job_data(json.load(f)[0])
+        self.index = FakeIndex()
+        self.cache = ResultCache()
+        enabled = domain_reputation.lookups_enabled()
+        domain_reputation.set_lookups_enabled(False)
+        self.addCleanup(domain_reputation.set_lookups_enabled, enabled)
+        for patch in (mock.patch.object(pipeline, 'result_cache', self.cache),
+                      mock.patch.object(pipeline, 'get_default_index', lambda: self.index)):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def score(self, **kwargs):
+        hits = self.cache.stats['hits']
+        result = pipeline.score_postings([self.posting], **kwargs)[0]
+        return result, self.cache.stats['hits'] > hits
+
+    def test_repeated_posting_is_a_hit(self):
+        first, hit = self.score()
+        self.assertFalse(hit)
+        second, hit = self.score()
+        self.assertTrue(hit)
+        self.assertEqual(first, second)
+        self.assertFalse(self.score(use_cache=False)[1])
+
+    def test_rule_edit_invalidates_cached_results(self):
+        self.score()
+        definitions = copy.deepcopy(read_definitions(RULE_DEFINITIONS_FILE))
+        definitions['rules'][0]['phrases'].append(['quick money', 'Quick money promises are scam indicators'])
+        edited = RulePlan(definitions, RULE_DEFINITIONS_FILE)
+        self.assertNotEqual(edited.fingerprint, pipeline.RULE_PLAN.fingerprint)
+
+        with mock.patch.object(pipeline, 'RULE_PLAN', edited):
+            self.assertFalse(self.score()[1])
+            self.assertTrue(self.score()[1])
+        self.assertTrue(self.score()[1])
+
+    def test_explanation_mode_and_known_scams_are_part_of_the_namespace(self):
+        self.score(full_explanations=False)
+        self.assertFalse(self.score(full_explanations=True)[1])
+        self.assertTrue(self.score(full_explanations=False)[1])
+
+        self.index.generation += 1
+        self.assertFalse(self.score(full_explanations=False)[1])
+
+    def test_other_model_artifacts_bypass_the_cache(self):
+        self.score()
+        self.assertFalse(self.score(artifacts=pipeline.load_artifacts())[1])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import numpy as np
+from catboost import CatBoostClassifier
+
+import retrain
+from featurizers import HashingTfidfFeaturizer
+from model import load_dataset
+from model_registry import activate, load_version, register
+from retrain import TrainingStore, dataset_rows
+from submission_store import build_record, insert_records, set_label
+
+DATA_PATH = os.path.join(REPO_DIR, 'Jobs.csv')
+
+def submission(title, description):
+    job_data = {'job_title': title, 'job_description': description, 'requirements': 'Own laptop', 'benefits': ''}
+    return build_record(job_data, {'model_prediction': "Real Job", 'final_prediction': "Real Job", 'score': 60})
+
+class RetrainTest(unittest.TestCase):
+    """
+    Retrains a small hashing model registered in a temporary registry
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.registry_dir = os.path.join(self.directory.name, 'model_registry')
+        self.store_path = os.path.join(self.directory.name, 'training_store.sqlite3')
+        self.submissions_db = os.path.join(self.directory.name, 'submissions.sqlite3')
+
+        df = load_dataset(DATA_PATH)
+        vectorizer = HashingTfidfFeaturizer(n_features=256)
+        model = CatBoostClassifier(iterations=10, depth=4, random_seed=42, verbose=0, allow_writing_files=False)
+        model.fit(vectorizer.fit_transform(df['combined_text']), df['is_real'])
+        register(model, vectorizer, 'base', registry_dir=self.registry_dir)
+        activate('base', self.registry_dir)
+        self.base_idf = vectorizer.idf_
+
+        # Texts on both sides of the submission split
+        records = [submission(f'Data entry clerk {i}', f'Work from home, pay a deposit of {i}00 to start')
+                   for i in range(20)]
+        insert_records(records, self.submissions_db)
+        self.submission_ids = list(range(1, len(records) + 1))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def retrain(self, version, **kwargs):
+        # A few trees keep the test fast, and no training logs are written into the repo
+        with mock.patch.dict(retrain.CATBOOST_PARAMS, {'iterations': 10, 'allow_writing_files': False}):
+            return retrain.retrain(DATA_PATH, self.submissions_db, self.store_path, self.registry_dir,
+                                   iterations=5, version=version, **kwargs)
+
+    def stored_rows(self):
+        store = TrainingStore(self.store_path)
+        try:
+            return store.rows()
+        finally:
+            store.close()
+
+    def test_labels_set_after_a_run_are_ingested(self):
+        report = self.retrain('v1')
+        self.assertEqual(report['rows']['submissions_added'], 0)
+        self.assertEqual(report['rows']['dataset_added'], len(dataset_rows(DATA_PATH)))
+
+        set_label(self.submission_ids, False, self.submissions_db)
+        report = self.retrain('v2')
+        self.assertEqual(report['rows']['submissions_added'], len(self.submission_ids))
+        self.assertEqual(report['rows']['dataset_added'], 0)
+        self.assertEqual(report['rows']['total'], len(dataset_rows(DATA_PATH)) + len(self.submission_ids))
+
+        # Nothing new is labeled, so nothing is ingested again
+        self.assertEqual(self.retrain('v3')['rows']['submissions_added'], 0)
+
+    def test_warm_start_keeps_the_previous_idf(self):
+        set_label(self.submission_ids, False, self.submissions_db)
+        report = self.retrain('v1')
+
+        self.assertEqual((report['training']['idf'], report['training']['init_model']), ('previous', 'base'))
+        _, vectorizer, _, _ = load_version('v1', self.registry_dir)
+        np.testing.assert_array_equal(vectorizer.idf_, self.base_idf)
+
+    def test_held_out_rows_never_reach_training_or_the_idf(self):
+        set_label(self.submission_ids, False, self.submissions_db)
+        fitted_rows = []
+        fit = CatBoostClassifier.fit
+
+        def recording_fit(model, X, y=None, **kwargs):
+            fitted_rows.append(X.shape[0])
+            return fit(model, X, y, **kwargs)
+
+        with mock.patch.object(CatBoostClassifier, 'fit', recording_fit):
+            report = self.retrain('v1', refresh_idf=True)
+
+        rows = self.stored_rows()
+        training = [text for _, _, text, held_out in rows if not held_out]
+        self.assertTrue(any(held_out for _, _, _, held_out in rows))
+        self.assertEqual((report['training']['idf'], report['training']['init_model']), ('refreshed', None))
+        self.assertEqual(fitted_rows, [len(training)])
+        self.assertEqual(report['rows']['train'], len(training))
+
+        _, vectorizer, _, _ = load_version('v1', self.registry_dir)
+        expected = HashingTfidfFeaturizer(n_features=256).fit(training)
+        self.assertEqual(vectorizer.n_documents, len(training))
+        np.testing.assert_array_equal(vectorizer.document_frequencies, expected.document_frequencies)
+
+    def test_features_are_reused_across_runs(self):
+        first = self.retrain('v1')
+        self.assertEqual(first['features']['cached_rows'], 0)
+        self.assertEqual(first['features']['featurized_rows'], first['rows']['total'])
+
+        set_label(self.submission_ids, False, self.submissions_db)
+        second = self.retrain('v2')
+        self.assertEqual(second['features']['cached_rows'], first['rows']['total'])
+        self.assertEqual(second['features']['featurized_rows'], len(self.submission_ids))
+
+        third = self.retrain('v3')
+        self.assertEqual((third['features']['cached_rows'], third['features']['featurized_rows']),
+                         (second['rows']['total'], 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import copy
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+from rule_definitions import RuleDefinitionError, load_rule_plan, read_definitions
+from values import RULE_DEFINITIONS_FILE
+
+class RuleDefinitionsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.definitions = read_definitions(os.path.join(REPO_DIR, RULE_DEFINITIONS_FILE))
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def load(self, definitions=None, text=None):
+        path = os.path.join(self.directory.name, 'scam_rules.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text if text is not None else json.dumps(definitions))
+        return load_rule_plan(path)
+
+    def edited(self, edit):
+        definitions = copy.deepcopy(self.definitions)
+        edit(definitions)
+        return definitions
+
+    def assertRejected(self, message, definitions=None, text=None):
+        with self.assertRaisesRegex(RuleDefinitionError, message):
+            self.load(definitions, text)
+
+    def test_shipped_definitions_load(self):
+        plan = self.load(self.definitions)
+        self.assertEqual(len(plan.rules), len(self.definitions['rules']))
+        self.assertEqual(plan.fingerprint, load_rule_plan(os.path.join(REPO_DIR, RULE_DEFINITIONS_FILE)).fingerprint)
+
+    def test_unreadable_files(self):
+        self.assertRejected('Could not read rule definitions', text='{"rules": [')
+        self.assertRejected("expected an object with 'rules' and 'term_lists'", text='[]')
+        with self.assertRaisesRegex(RuleDefinitionError, 'Could not read rule definitions'):
+            load_rule_plan(os.path.join(self.directory.name, 'missing.json'))
+
+    def test_term_lists(self):
+        self.assertRejected('missing term lists vague_term',
+                            self.edited(lambda definitions: definitions['term_lists'].pop('vague_term')))
+        self.assertRejected('expected a non-empty list of phrases',
+                            self.edited(lambda definitions: definitions['term_lists'].update(vague_term=[])))
+        self.assertRejected('neither a phrase nor a \\[phrase, reason\\] pair',
+                            self.edited(lambda definitions: definitions['term_lists']['vague_term'].append(['a', 'b', 'c'])))
+
+    def test_rules(self):
+        def add_rule(**rule):
+            return self.edited(lambda definitions: definitions['rules'].append(
+                {'id': 'extra', 'type': 'regex', 'pattern': 'x+', 'issue': 'extra', 'reason': 'Extra', **rule}))
+
+        self.load(add_rule())
+        self.assertRejected("every rule needs an 'id'", add_rule(id=''))
+        self.assertRejected("duplicate rule or term list id 'scam_keyword'", add_rule(id='scam_keyword'))
+        self.assertRejected("duplicate rule or term list id 'vague_term'", add_rule(id='vague_term'))
+        self.assertRejected('type must be one of phrases, regex', add_rule(type='keyword'))
+        self.assertRejected('text must be one of clean, text', add_rule(text='html'))
+        self.assertRejected("'issue' and 'reason' are required", add_rule(reason=''))
+        self.assertRejected("rule 'extra': invalid pattern", add_rule(pattern='(unclosed'))
+        self.assertRejected("'pattern' is required", add_rule(pattern=''))
+        self.assertRejected('bad template field .*severity', add_rule(type='phrases', phrases=['quick money'],
+                                                                    issue='extra_{severity}'))
+
+if __name__ == '__main__':
+    unittest.main()
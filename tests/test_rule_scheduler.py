@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import domain_reputation
+import near_duplicates
+from pipeline import normalize_job_data, verify_posting
+from verify import RULES, enhanced_scam_detection, rule_cost, run_rules
+
+class EarlyExitTest(unittest.TestCase):
+    """
+    Early exit may skip checks but never change a verdict
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        with open(os.path.join(REPO_DIR, 'Job.json'), encoding='utf-8') as f:
+            cls.postings = [normalize_job_data(job_data) for job_data in json.load(f)]
+
+    def setUp(self):
+        enabled = domain_reputation.lookups_enabled()
+        domain_reputation.set_lookups_enabled(False)
+        self.addCleanup(domain_reputation.set_lookups_enabled, enabled)
+        patch = mock.patch.object(near_duplicates, 'NEAR_DUPLICATE_ENABLED', False)
+        patch.start()
+        self.addCleanup(patch.stop)
+
+    def test_same_verdict_as_full_explanations(self):
+        skipped = 0
+        for job_data in self.postings:
+            full = enhanced_scam_detection(job_data)
+            early = enhanced_scam_detection(job_data, early_exit=True)
+            title = job_data.get('job_title')
+            self.assertEqual(early['is_scam'], full['is_scam'], title)
+            self.assertLessEqual(set(early['issues']), set(full['issues']), title)
+            self.assertEqual(sorted(early['checks_run'] + early['checks_skipped']), sorted(rule.name for rule in RULES))
+            skipped += bool(early['checks_skipped'])
+            for model_result in ("Real Job", "Fake Job"):
+                self.assertEqual(verify_posting(job_data, model_result, False)['final_result'],
+                                 verify_posting(job_data, model_result, True)['final_result'], title)
+        # Otherwise the comparison says nothing about early exit
+        self.assertGreater(skipped, len(self.postings) // 10)
+
+    def test_checks_run_cheapest_first(self):
+        self.assertEqual(run_rules(self.postings[0])['checks_run'], [rule.name for rule in sorted(RULES, key=rule_cost)])
+
+if __name__ == '__main__':
+    unittest.main()
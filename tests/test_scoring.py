@@ -0,0 +1,28 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scoring import rank_issues, rank_reasons, reasons_for_issues
+
+class ReasonsForIssuesTest(unittest.TestCase):
+
+    def test_gathers_every_reason_of_the_shown_issues(self):
+        reason_issues = {
+            'Mentions urgent hiring': 'high_urgency',
+            'Asks for a registration fee': 'payment_request',
+            'Uses a free email domain': 'free_email_domain',
+            'Asks for a training kit fee': 'payment_request'
+        }
+        issues = rank_issues(reason_issues.values())
+        self.assertEqual(issues, ['payment_request', 'free_email_domain', 'high_urgency'])
+
+        # Two issues have three reasons between them, so the first two reasons would drop one
+        self.assertEqual(reasons_for_issues(reason_issues, issues[:2]), [
+            'Asks for a registration fee', 'Asks for a training kit fee', 'Uses a free email domain'
+        ])
+        self.assertEqual(reasons_for_issues(reason_issues, issues), rank_reasons(reason_issues))
+
+if __name__ == '__main__':
+    unittest.main()
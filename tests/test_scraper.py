@@ -0,0 +1,209 @@
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper
+from scrape_cache import ScrapeCache
+from scraper import HostRateLimiter, create_session, is_linkedin_job_url, parse_linkedin_job, scrape_linkedin_jobs
+
+def job_page(job_id):
+    # The elements of a saved LinkedIn job page that the scraper reads
+    return f'''<html><body>
+<h1 class="top-card-layout__title">Data Analyst {job_id}</h1>
+<a class="topcard__org-name-link" href="https://www.linkedin.com/company/acme">Acme Analytics</a>
+<span class="topcard__flavor--bullet">Pune, India</span>
+<span class="posted-time-ago__text">2 days ago</span>
+<div class="show-more-less-html__markup">
+  <p>About the Role: analyse sales data for job {job_id}.</p>
+  <p>Requirements: 2 years of experience with SQL.</p>
+  <p>Benefits: health insurance.</p>
+</div>
+<ul class="description__job-criteria-list">
+  <li><h3>Employment type</h3><span>Full-time</span></li>
+  <li><h3>Industries</h3><span>Analytics</span></li>
+</ul>
+</body></html>'''
+
+class StubLinkedIn(BaseHTTPRequestHandler):
+    """
+    Serves job pages at /jobs/view/<id>/ after DELAYS[id] seconds. Ids in
+    REDIRECTS redirect to the given URL (formatted with the server port),
+    ids in MISSING answer 404.
+    """
+    DELAYS = {}
+    REDIRECTS = {}
+    MISSING = set()
+    requested = []
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requested.append(self.path)
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        try:
+            match = re.fullmatch(r'/jobs/view/(\d+)/', self.path)
+            job_id = match.group(1) if match else None
+            time.sleep(cls.DELAYS.get(job_id, 0))
+            if job_id in cls.REDIRECTS:
+                self.send_response(302)
+                self.send_header('Location', cls.REDIRECTS[job_id].format(port=self.server.server_port))
+                self.end_headers()
+            elif job_id is None or job_id in cls.MISSING:
+                self.send_error(404)
+            else:
+                body = job_page(job_id).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+class NoBackoff(HostRateLimiter):
+    # Failed URLs are still retried, without waiting between attempts
+    def delay(self, host, seconds):
+        pass
+
+class ScraperTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubLinkedIn)
+        cls.port = cls.server.server_port
+        cls.allowed_hosts = [f'127.0.0.1:{cls.port}']
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        StubLinkedIn.DELAYS, StubLinkedIn.REDIRECTS, StubLinkedIn.MISSING = {}, {}, set()
+        StubLinkedIn.requested = []
+        StubLinkedIn.max_in_flight = 0
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ScrapeCache(os.path.join(self.directory.name, 'scrape_cache.sqlite3'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def url(self, job_id, host='127.0.0.1'):
+        return f'http://{host}:{self.port}/jobs/view/{job_id}/'
+
+    def scrape(self, urls, max_workers=8):
+        return scrape_linkedin_jobs(urls, max_workers=max_workers, session=create_session(max_workers),
+                                    rate_limiter=NoBackoff(0), cache=self.cache,
+                                    allowed_hosts=self.allowed_hosts)
+
+    def test_allowed_hosts_default_to_linkedin(self):
+        self.assertTrue(is_linkedin_job_url('https://www.linkedin.com/jobs/view/123/'))
+        self.assertTrue(is_linkedin_job_url('https://in.linkedin.com/jobs/view/data-analyst-123'))
+        for url in ('http://169.254.169.254/latest/meta-data/', 'https://linkedin.com.evil.com/jobs/view/1/',
+                    'https://www.linkedin.com@10.0.0.1/jobs/view/1/', 'https://www.linkedin.com:8080/jobs/view/1/',
+                    'https://www.linkedin.com/in/someone', 'file:///etc/passwd', self.url(1)):
+            self.assertFalse(is_linkedin_job_url(url), url)
+        self.assertTrue(is_linkedin_job_url(self.url(1), self.allowed_hosts))
+        self.assertFalse(is_linkedin_job_url(self.url(1, 'localhost'), self.allowed_hosts))
+
+    def test_fetches_concurrently_in_input_order(self):
+        # Later URLs answer first, so completion order is the reverse of input order
+        job_ids = [str(i) for i in range(101, 107)]
+        StubLinkedIn.DELAYS = {job_id: 0.1 * (len(job_ids) - i) for i, job_id in enumerate(job_ids)}
+        start = time.perf_counter()
+        results = self.scrape([self.url(job_id) for job_id in job_ids])
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual([result['job_id_or_ref_code'] for result in results], job_ids)
+        self.assertEqual([result['job_title'] for result in results], [f'Data Analyst {job_id}' for job_id in job_ids])
+        self.assertEqual(results[0]['company_name'], 'Acme Analytics')
+        self.assertEqual(results[0]['employment_type'], 'Full-time')
+        self.assertGreater(StubLinkedIn.max_in_flight, 1)
+        self.assertLess(elapsed, sum(StubLinkedIn.DELAYS.values()))
+
+    def test_failed_urls_yield_errors_in_place(self):
+        StubLinkedIn.MISSING = {'202'}
+        urls = [self.url(201), self.url(202), 'http://169.254.169.254/latest/meta-data/', self.url(203)]
+        results = self.scrape(urls)
+
+        self.assertEqual(results[0]['job_title'], 'Data Analyst 201')
+        self.assertIn('error', results[1])
+        self.assertEqual(results[2], {'error': 'Not a LinkedIn job URL: http://169.254.169.254/latest/meta-data/'})
+        self.assertEqual(results[3]['job_title'], 'Data Analyst 203')
+        self.assertNotIn('/latest/meta-data/', StubLinkedIn.requested)
+
+    def test_redirects_only_to_allowed_job_pages(self):
+        StubLinkedIn.REDIRECTS = {
+            '301': 'http://127.0.0.1:{port}/jobs/view/302/',
+            '303': 'http://localhost:{port}/jobs/view/399/',
+            '304': '/admin/'
+        }
+        results = self.scrape([self.url(301), self.url(303), self.url(304)], max_workers=1)
+
+        self.assertEqual(results[0]['job_title'], 'Data Analyst 302')
+        self.assertIn('error', results[1])
+        self.assertIn('error', results[2])
+        self.assertNotIn('/jobs/view/399/', StubLinkedIn.requested)
+        self.assertNotIn('/admin/', StubLinkedIn.requested)
+
+    def test_fresh_cache_entries_are_not_refetched(self):
+        self.scrape([self.url(401)])
+        requested = len(StubLinkedIn.requested)
+        results = self.scrape([self.url(401)])
+
+        self.assertEqual(results[0]['job_title'], 'Data Analyst 401')
+        self.assertEqual(len(StubLinkedIn.requested), requested)
+        self.assertEqual(self.cache.stats['fresh_hits'], 1)
+
+class ScrapeCacheTest(unittest.TestCase):
+
+    def test_page_is_only_read_when_asked_for(self):
+        cache = ScrapeCache(':memory:')
+        cache.put('7', 'https://www.linkedin.com/jobs/view/7/', job_page('7'), {'job_title': 'Data Analyst 7'}, etag='"v1"')
+
+        entry = cache.get('7')
+        self.assertNotIn('html', entry)
+        self.assertEqual((entry['job_data'], entry['etag'], entry['is_fresh']), ({'job_title': 'Data Analyst 7'}, '"v1"', True))
+        self.assertEqual(cache.get('7', with_html=True)['html'], job_page('7'))
+        self.assertIsNone(cache.get('8'))
+
+class ParseLinkedInJobTest(unittest.TestCase):
+
+    def test_parsers_agree_on_a_saved_page(self):
+        self.assertEqual(parse_linkedin_job(job_page('7'), '7', 'lxml'), parse_linkedin_job(job_page('7'), '7', 'bs4'))
+
+    def test_page_lxml_rejects_falls_back_to_bs4(self):
+        # lxml refuses str input that carries an XML encoding declaration
+        html = '<?xml version="1.0" encoding="utf-8"?>' + job_page('8')
+        with self.assertRaises(ValueError):
+            scraper.extract_fields_lxml(html)
+        job_data = parse_linkedin_job(html, '8', 'lxml')
+
+        self.assertEqual(job_data, parse_linkedin_job(job_page('8'), '8', 'bs4'))
+        self.assertEqual(job_data['job_title'], 'Data Analyst 8')
+
+    def test_unparseable_page_gives_empty_fields(self):
+        with mock.patch.object(scraper, 'extract_fields_bs4', side_effect=RuntimeError('broken page')):
+            job_data = parse_linkedin_job('', '9', 'lxml')
+        self.assertEqual(job_data['job_id_or_ref_code'], '9')
+        self.assertEqual((job_data['job_title'], job_data['company_name'], job_data['job_description']), ('', '', ''))
+
+if __name__ == '__main__':
+    unittest.main()
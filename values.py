@@ -91,93 +91,53 @@ USER_AGENT = (
     "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 )
 
-SUSPICIOUS_PHRASES = [
-    ('work from home', 'Work from home opportunities are commonly used in scams'),
-    ('daily salary', 'Daily salary payments are unusual for legitimate jobs'),
-    ('advance payment', 'Requests for advance payments are red flags'),
-    ('immediate joining', 'Urgent hiring requests can indicate scams'),
-    ('urgent hiring', 'Urgent hiring requests can indicate scams'),
-    ('no experience needed', 'Legitimate jobs typically require some qualifications'),
-    ('high salary for freshers', 'Exceptionally high salaries for freshers are suspicious'),
-    ('earn money fast', 'Get-rich-quick phrases are common in scams'),
-    ('no interview needed', 'Legitimate jobs always have some interview process'),
-    ('part time job', 'Part-time job scams are common'),
-    ('data entry job', 'Data entry jobs are frequently faked'),
-    ('online job', 'Online job scams are prevalent'),
-    ('easy money', 'Promises of easy money are red flags'),
-    ('quick money', 'Promises of quick money are red flags'),
-    ('no skills required', 'Legitimate jobs require some skills'),
-    ('earn from home', 'Earn from home opportunities are often scams'),
-    ('immediate start', 'Immediate start requests can indicate scams'),
-    ('no background check', 'Legitimate employers conduct background checks'),
-    ('direct hiring', 'Direct hiring without process is suspicious'),
-    ('hiring now', 'Urgent hiring language can indicate scams'),
-    ('urgent', 'Urgent language is often used to pressure candidates'),
-    ('apply now', 'Immediate application pressure is suspicious'),
-    ('limited seats', 'Artificial scarcity creates pressure'),
-    ('offer expires', 'Time pressure tactics are common in scams'),
-    ('act fast', 'Rush tactics are red flags'),
-    ('last chance', 'Pressure tactics indicate potential scams'),
-    ('hurry', 'Rush language is suspicious'),
-    ('quick cash', 'Promises of quick money are red flags'),
-    ('guaranteed income', 'Income guarantees are unrealistic'),
-    ('life-changing opportunity', 'Overly dramatic promises are suspicious'),
-    ('freelance opportunity', 'Vague freelance offers are often scams'),
-    ('passive income', 'Passive income promises are often fake'),
-    ('financial freedom', 'Unrealistic financial promises are red flags'),
-    ('registration fee', 'Upfront fee requests are major red flags'),
-    ('training fee', 'Training fee requests indicate scams'),
-    ('investment required', 'Investment requirements are suspicious'),
-    ('deposit needed', 'Deposit requests are red flags'),
-    ('dream job', 'Overly appealing language is manipulative'),
-    ('once-in-a-lifetime', 'Exclusive language creates false urgency'),
-    ('exclusive offer', 'Exclusivity claims are often fake'),
-    ('selected candidate', 'False selection claims are manipulative'),
-    ('special opportunity', 'Special opportunity claims are often false'),
-    ('work online', 'Vague online work descriptions are common in scams'),
-    ('quick hiring', 'Fast hiring processes may indicate scams'),
-    ('no resume needed', 'Legitimate jobs typically require resumes'),
-    ('earn while learning', 'Promises of earning while training are suspicious'),
-    ('no qualifications needed', 'Legitimate jobs typically require some qualifications'),
-    ('international opportunity', 'Vague international offers may be scams'),
-    ('work visa provided', 'Visa promises without proper process are suspicious'),
-    ('instant job', 'No legitimate jobs are truly "instant"'),
-    ('no experience necessary', 'Most jobs require some relevant experience')
-]
-
-URGENCY_KEYWORDS = [
-    'urgent', 'immediate', 'apply now', 'limited seats', 'offer expires', 
-    'act fast', 'last chance', 'hurry', 'immediate joining', 'urgent hiring',
-    'immediate start', 'hiring now', 'offer valid', 'no interview needed',
-    'quick hiring', 'limited time', 'apply immediately', 'fast hiring',
-    'join immediately', 'urgent requirement', 'immediate opening'
-]
-
-HIGH_EARNING_PROMISES = [
-    'easy money', 'quick cash', 'high salary', 'earn daily', 'guaranteed income',
-    'life-changing opportunity', 'millionaires mentor', 'quick money', 'earn money fast',
-    'high earnings', 'big profits', 'make money online', 'earn from home',
-    'financial freedom', 'passive income', 'get rich quick', 'high commission',
-    'unlimited earnings', 'earn thousands', 'make extra income', 'high paying',
-    'lucrative opportunity', 'earn while you learn', 'money making'
-]
-
-VAGUE_TERMS = [
-    'work from home', 'no experience needed', 'freelance opportunity', 'online job',
-    'passive income', 'financial freedom', 'data entry job', 'online work',
-    'flexible work', 'be your own boss', 'work online', 'earn from anywhere',
-    'digital nomad', 'remote opportunity', 'work anytime', 'location independent',
-    'internet job', 'home based', 'virtual job', 'online business'
-]
+SCRAPE_MAX_WORKERS = 8
+SCRAPE_REQUESTS_PER_SECOND_PER_HOST = 2.0
+SCRAPE_TIMEOUT_SECONDS = 10
+SCRAPE_MAX_RETRIES = 3
+SCRAPE_MAX_URLS = 100
+# Hosts job pages may be fetched from, subdomains included; a 'host:port' entry allows only that host and port
+SCRAPE_ALLOWED_HOSTS = ['linkedin.com']
+# Scraped pages and parsed postings are cached by job ID; set to None to disable
+SCRAPE_CACHE_DB = 'scrape_cache.sqlite3'
+SCRAPE_CACHE_TTL_SECONDS = 6 * 3600
+# Domain reputation (domain_reputation.py): DNS MX/A and WHOIS lookups for contact domains
+DOMAIN_REPUTATION_ENABLED = True
+# Lookups are cached on disk; None keeps the cache in memory
+DOMAIN_CACHE_DB = 'domain_cache.sqlite3'
+DOMAIN_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# NXDOMAIN / no records / no WHOIS entry
+DOMAIN_NEGATIVE_TTL_SECONDS = 6 * 3600
+# Timeouts and unreachable servers, retried sooner
+DOMAIN_ERROR_TTL_SECONDS = 300
+# Per-lookup timeout, and the longest a request waits for all of a posting's lookups together
+DOMAIN_LOOKUP_TIMEOUT_SECONDS = 3.0
+DOMAIN_LOOKUP_BUDGET_SECONDS = 0.3
+DOMAIN_LOOKUP_WORKERS = 8
+# DNS servers to query (e.g. ['127.0.0.1'] for a local stub resolver); None uses the system resolver
+DOMAIN_DNS_NAMESERVERS = None
+# Domains registered more recently than this are flagged
+NEW_DOMAIN_MAX_AGE_DAYS = 180
+# Near-duplicate detection (near_duplicates.py): MinHash/LSH index of known scam postings
+NEAR_DUPLICATE_ENABLED = True
+NEAR_DUPLICATE_DB = 'near_duplicates.sqlite3'
+# Fake rows of these files seed the index when the database is first created
+NEAR_DUPLICATE_SEED_FILES = ['Jobs.csv', 'Job.json']
+# 128 hash functions in 32 bands of 4: pairs above ~0.6 Jaccard similarity are almost always candidates
+NEAR_DUPLICATE_NUM_PERM = 128
+NEAR_DUPLICATE_BANDS = 32
+# Word pairs; most postings are short (median ~30 words), where longer shingles make every edit too costly
+NEAR_DUPLICATE_SHINGLE_SIZE = 2
+NEAR_DUPLICATE_THRESHOLD = 0.7
+# Postings with fewer words are not indexed or queried
+NEAR_DUPLICATE_MIN_TOKENS = 20
+# How often each worker loads postings added by other workers
+NEAR_DUPLICATE_REFRESH_SECONDS = 10
+# 'lxml' (fast, needs lxml), 'bs4' (BeautifulSoup html.parser) or 'auto'
+HTML_PARSER = 'auto'
 
-PAYMENT_REQUESTS = [
-    'advance payment', 'registration fee', 'training fee', 'investment required',
-    'deposit needed', 'payment', 'fee', 'deposit', 'security deposit',
-    'application fee', 'processing fee', 'admin fee', 'membership fee',
-    'equipment cost', 'software purchase', 'starter kit', 'initial investment',
-    'background check fee', 'verification fee', 'certification cost',
-    'training materials', 'uniform cost', 'tool purchase'
-]
+# Scam phrase rules, term lists and their severity weights (see rule_definitions.py); JSON, or YAML with PyYAML
+RULE_DEFINITIONS_FILE = 'scam_rules.json'
 
 FREE_EMAIL_DOMAINS = [
     'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'protonmail.com',
@@ -230,4 +190,117 @@ GRAMMAR_INDICATORS = {
     'double_exclamation_threshold': 0,
     'spelling_error_threshold': 0.1,
     'sentence_length_variance': 0.8
-}
\ No newline at end of file
+}
+
+MAX_BATCH_SIZE = 1000
+
+# Weight of each rule-engine issue in the deterministic score; first matching
+# substring wins, anything unmatched uses DEFAULT_ISSUE_WEIGHT. Rules in
+# RULE_DEFINITIONS_FILE declare their own weights, which are checked first.
+ISSUE_SEVERITY_WEIGHTS = [
+    ('near_duplicate_scam', 1.0),
+    ('payment_request', 1.0),
+    ('high_red_flag_density', 1.0),
+    ('high_spelling_errors', 0.8),
+    ('unrealistic_', 0.8),
+    ('suspicious_tld', 0.6),
+    ('free_email_domain', 0.5),
+    ('moderate_red_flag_density', 0.5),
+    ('high_urgency', 0.5),
+    ('suspicious phrases', 0.5),
+    ('suspicious domain', 0.5),
+    ('unresolvable_domain', 0.6),
+    ('newly_registered_domain', 0.6),
+    ('no_mx_records', 0.5),
+]
+
+DEFAULT_ISSUE_WEIGHT = 0.25
+
+# Mean cost of each rule-engine check on Job.json, measured with `python benchmark.py rules`;
+# enhanced_scam_detection runs the cheapest first. domain_reputation is dominated by DNS/WHOIS
+# on a cache miss, so it is charged the lookup budget and runs last.
+RULE_COSTS_MS = {
+    'domains': 0.01,
+    'salary': 0.025,
+    'spelling': 0.065,
+    'posting_fields': 0.075,
+    'density': 0.085,
+    'phrases': 0.15,
+    'domain_reputation': DOMAIN_LOOKUP_BUDGET_SECONDS * 1000
+}
+# False stops the rule engine once its verdict is settled (shorter explanations);
+# True runs every check. /api/predict_batch?explain=full asks for the full run per request.
+RULE_FULL_EXPLANATIONS = False
+
+CALIBRATION_FILE = 'calibration.json'
+
+# Fields that influence the verdict; the result cache is keyed on these only
+VERDICT_FIELDS = [
+    'job_title', 'job_description', 'requirements', 'benefits',
+    'application_link_or_email', 'company_website', 'company_name',
+    'salary_info_raw', 'required_experience', 'remote_status',
+    'job_location', 'response_time_claimed'
+]
+
+RESULT_CACHE_SIZE = 10000
+RESULT_CACHE_TTL_SECONDS = 24 * 3600
+# Part of the result cache namespace; bump it when the fields of a scoring result change
+RESULT_FORMAT = 2
+# Set to a file path (e.g. 'result_cache.sqlite3') to persist cached results
+RESULT_CACHE_DB = None
+
+# Legacy CSV log; submissions are now stored in SUBMISSIONS_DB (see submission_store.py)
+SUBMISSIONS_CSV = 'userinputs.csv'
+SUBMISSIONS_DB = 'submissions.sqlite3'
+
+SUBMISSION_FIELDNAMES = [
+    'job_title', 'job_description', 'requirements', 'benefits', 'employment_type',
+    'required_experience', 'required_education', 'job_function', 'industry',
+    'job_id_or_ref_code', 'posting_date', 'expiration_date', 'company_name',
+    'company_profile', 'company_website', 'company_size', 'company_type',
+    'company_founded_year', 'company_social_media_links__-', 'job_location',
+    'interview_location', 'remote_status', 'relocation_assistance',
+    'application_link_or_email', 'application_method_type', 'response_time_claimed',
+    'application_deadline', 'recruiter_name_or_agency', 'recruiter_contact_info',
+    'hiring_manager_name', 'salary_info_raw', 'stock_options', 'relocation_package',
+    'job_posting_source', 'number_of_positions', 'logo_present', 'attachments__-',
+    'posting_frequency', 'posting_consistency', 'external_reviews_available',
+    'profile_photos_included', 'is_real'
+]
+
+# Logged submissions are written in batches by a background thread
+SUBMISSION_BATCH_SIZE = 50
+SUBMISSION_FLUSH_SECONDS = 2.0
+
+# Model artifacts
+MODEL_FILE = 'job_model_catboost.pkl'
+VECTORIZER_FILE = 'vectorizer_catboost.pkl'
+# Native format written by `python artifacts.py convert` (CatBoost .cbm + memory-mapped idf array)
+NATIVE_ARTIFACTS_DIR = 'model_artifacts'
+# 'native', 'pickle' or 'auto' (native when NATIVE_ARTIFACTS_DIR exists)
+ARTIFACT_FORMAT = 'auto'
+# Versioned artifacts (see model_registry.py); used instead of the files above once a version is active
+MODEL_REGISTRY_DIR = 'model_registry'
+# How often each worker checks whether the active registry version changed
+MODEL_RELOAD_CHECK_SECONDS = 10
+
+# Training featurizer: 'tfidf' (vocabulary of 1000 terms), 'hashing' (feature hashing with online IDF)
+# or 'catboost' (raw text and categorical columns in a CatBoost Pool, no sklearn vectorizer)
+FEATURIZER = 'tfidf'
+HASHING_N_FEATURES = 2 ** 12
+# 'catboost' featurizer: columns passed to CatBoost as raw text_features / cat_features
+POOL_TEXT_FEATURES = [
+    'job_title', 'job_description', 'requirements', 'benefits', 'company_profile', 'salary_info_raw'
+]
+POOL_CAT_FEATURES = [
+    'employment_type', 'required_experience', 'required_education', 'job_function', 'industry',
+    'company_size', 'company_type', 'remote_status', 'application_method_type', 'response_time_claimed',
+    'job_posting_source', 'logo_present', 'relocation_assistance', 'stock_options',
+    'external_reviews_available', 'profile_photos_included', 'posting_frequency', 'posting_consistency'
+]
+
+# Incremental retraining (retrain.py): training rows and cached features, trees added per run
+TRAINING_STORE_DB = 'training_store.sqlite3'
+RETRAIN_ITERATIONS = 100
+# 'eager' loads artifacts at import, 'background' in a thread at startup, 'lazy' on the first request
+STARTUP_MODE = 'background'
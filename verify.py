@@ -1,8 +1,14 @@
 import re
 import logging
+from collections import Counter, namedtuple
+from datetime import datetime, timezone
+from functools import cached_property
 from urllib.parse import urlparse
-from textblob import TextBlob
-from spellchecker import SpellChecker
+from spelling import unknown_words
+from rule_definitions import get_default_plan
+from metrics import timed_stage, RULE_CHECKS
+from domain_reputation import get_default_reputation
+from values import NEW_DOMAIN_MAX_AGE_DAYS, RULE_COSTS_MS
 
 FREE_EMAIL_DOMAINS = {
     'gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'rediffmail.com',
@@ -22,73 +28,19 @@ SUSPICIOUS_DOMAIN_KEYWORDS = {
     'workfromhome', 'onlinejob', 'parttime', 'freelance'
 }
 
-SCAM_PHRASES = [
-    ('no experience needed', 'Legitimate jobs typically require some qualifications or skills'),
-    ('no skills required', 'All legitimate jobs require some form of skill or competency'),
-    ('earn money fast', 'Get-rich-quick schemes are common scam indicators'),
-    ('quick money', 'Promises of quick earnings are typically fraudulent'),
-    ('easy money', 'Legitimate work requires effort and is rarely "easy"'),
-    ('work from home guaranteed', 'Guarantees of remote work are often misleading'),
-    ('immediate hiring', 'Instant hiring without proper process is suspicious'),
-    ('urgent hiring', 'Excessive urgency can indicate pressure tactics'),
-    ('no interview needed', 'Legitimate employers always conduct some form of screening'),
-    ('direct selection', 'Skipping selection process is unprofessional'),
-    ('advance payment required', 'Legitimate employers never ask for upfront fees'),
-    ('registration fee', 'Job seekers should never pay registration fees'),
-    ('training fee', 'Employers should provide free training, not charge for it'),
-    ('security deposit', 'Legitimate jobs do not require security deposits from employees'),
-    ('processing fee', 'Processing fees are red flags for job scams'),
-    ('earn daily', 'Daily earning promises are often associated with scams'),
-    ('high salary for freshers', 'Unrealistic salary promises for entry-level positions'),
-    ('no background check', 'Legitimate employers conduct proper background verification'),
-    ('copy paste job', 'Copy-paste jobs are commonly used in data entry scams'),
-    ('data entry from home', 'Home-based data entry jobs are frequently fraudulent'),
-    ('typing job', 'Online typing jobs are often scams targeting job seekers'),
-    ('form filling job', 'Form filling jobs are commonly used in online scams'),
-    ('email processing', 'Email processing jobs are typically fraudulent schemes'),
-    ('ad posting job', 'Ad posting jobs are often pyramid or MLM schemes'),
-    ('survey job', 'Online survey jobs rarely provide legitimate income'),
-    ('click job', 'Paid-to-click jobs are often scams or provide minimal income'),
-    ('captcha solving', 'Captcha solving jobs typically pay extremely low wages'),
-    ('sms job', 'SMS-based jobs are often part of fraudulent schemes'),
-    ('whatsapp job', 'WhatsApp-based job offers are commonly scams'),
-    ('telegram job', 'Telegram job channels often promote fraudulent opportunities'),
-    ('facebook job', 'Social media job offers are frequently unverified'),
-    ('instagram job', 'Instagram job promotions are often misleading'),
-    ('youtube job', 'YouTube-promoted jobs are frequently scams'),
-    ('tiktok job', 'TikTok job offers are often unverified or fraudulent'),
-    ('mobile job', 'Mobile-only jobs without proper company backing are suspicious'),
-    ('android job', 'Platform-specific job claims without verification are suspicious'),
-    ('iphone job', 'Device-specific job requirements are often misleading'),
-    ('part time guaranteed', 'Guarantees of part-time work are often false promises'),
-    ('flexible timing guaranteed', 'Guaranteed flexibility without requirements is suspicious'),
-    ('weekend job guaranteed', 'Weekend job guarantees without screening are suspicious'),
-    ('student job easy', 'Easy jobs specifically targeting students are often scams'),
-    ('housewife job', 'Jobs specifically targeting housewives are often exploitative'),
-    ('retired person job', 'Jobs targeting specific demographics can be predatory'),
-    ('disabled person job', 'Targeting vulnerable populations is a common scam tactic'),
-    ('unemployed guaranteed job', 'Guaranteed employment without qualifications is unrealistic'),
-    ('100% job guarantee', 'No legitimate employer can guarantee 100% job placement'),
-    ('money back guarantee', 'Money back guarantees in job offers are red flags'),
-    ('risk free job', 'No job is completely risk-free, such claims are misleading'),
-    ('government approved', 'False government endorsements are common in scams'),
-    ('ministry approved', 'Fake government approvals are used to gain credibility'),
-    ('iso certified company', 'False certifications are often claimed by scam companies'),
-    ('international company', 'Vague international company claims without verification'),
-    ('multinational opportunity', 'Unverified multinational claims are often false'),
-    ('global company hiring', 'Global hiring claims without proper company details'),
-    ('fortune 500 company', 'False Fortune 500 affiliations are common lies'),
-    ('startup opportunity', 'Vague startup opportunities without clear details'),
-    ('unicorn company', 'False unicorn company affiliations to attract candidates'),
-    ('funded startup', 'Unverified funding claims are often false'),
-    ('ipo bound company', 'False IPO claims to create urgency and credibility'),
-    ('pre ipo opportunity', 'Pre-IPO job claims are often misleading'),
-    ('equity offered', 'Unverified equity offers in job postings are suspicious'),
-    ('stock options guaranteed', 'Stock option guarantees without proper documentation'),
-    ('profit sharing guaranteed', 'Profit sharing promises without proper contracts'),
-    ('bonus guaranteed', 'Guaranteed bonuses without performance metrics are suspicious'),
-    ('incentive guaranteed', 'Guaranteed incentives without clear terms are red flags')
-]
+# Scam phrase rules and the term lists below, compiled once from RULE_DEFINITIONS_FILE
+RULE_PLAN = get_default_plan()
+# Every phrase rule and term list, in a single automaton
+PHRASE_INDEX = RULE_PLAN.phrase_index
+
+# Term lists counted by check_red_flag_density
+RED_FLAG_CATEGORIES = ('urgency_flags', 'payment_flags', 'unrealistic_flags', 'communication_flags')
+
+def find_phrases(text):
+    """
+    Single pass over the lowercased text; returns {category: set(phrases found)}
+    """
+    return RULE_PLAN.scan(text)
 
 
 SALARY_RANGES = {
@@ -155,18 +107,112 @@ def extract_domains(contact_info):
     
     return list(set(domains))  # Remove duplicates
 
-def check_dummy_domains(contact_info):
+SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+SPELLING_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+class PostingContext:
+    """
+    POSTING CONTEXT:
+    Everything the checks derive from one posting (combined and cleaned
+    text, phrase hits, tokens, sentences, exclamation/caps statistics,
+    contact domains), built once per request and passed to every check.
+    Each value is computed on first use and then reused.
+    """
+
+    def __init__(self, job_data, text=None):
+        self.job_data = job_data
+        # Set by the domain reputation check: lookups still running after the budget
+        self.domain_lookups_pending = 0
+        # Title, description, requirements and benefits: the text every content check reads
+        self.text = text if text is not None else ' '.join(
+            str(job_data.get(field, '') or '') for field in ('job_title', 'job_description', 'requirements', 'benefits'))
+
+    @classmethod
+    def from_text(cls, text):
+        return cls({}, text or '')
+
+    @cached_property
+    def lower_text(self):
+        return self.text.lower()
+
+    @cached_property
+    def clean_text(self):
+        return clean_text(self.text)
+
+    @cached_property
+    def phrase_hits(self):
+        # Phrase hits in the cleaned text (scam keywords, red-flag terms)
+        return find_phrases(self.clean_text)
+
+    @cached_property
+    def text_phrase_hits(self):
+        # Phrase hits in the text as written (payment keywords, pipeline checks)
+        return find_phrases(self.text)
+
+    @cached_property
+    def words(self):
+        return self.clean_text.split()
+
+    @cached_property
+    def word_counts(self):
+        return Counter(word for word in self.words if len(word) > 3)
+
+    @cached_property
+    def spelling_words(self):
+        return SPELLING_WORD_RE.findall(self.lower_text)
+
+    @cached_property
+    def sentences(self):
+        # Sentences of more than 5 characters, stripped
+        return [sentence.strip() for sentence in SENTENCE_SPLIT_RE.split(self.text) if len(sentence.strip()) > 5]
+
+    @cached_property
+    def exclamation_count(self):
+        return self.clean_text.count('!')
+
+    @cached_property
+    def caps_ratio(self):
+        # Measured on the cleaned text, as both checks that use it always have
+        text = self.clean_text
+        return sum(map(str.isupper, text)) / len(text) if text else 0.0
+
+    @cached_property
+    def contact_info(self):
+        return self.job_data.get('application_link_or_email', '') or self.job_data.get('company_website', '')
+
+    @cached_property
+    def domains(self):
+        return extract_domains(self.contact_info)
+
+    @cached_property
+    def experience_level(self):
+        return determine_experience_level(self.job_data.get('required_experience', ''))
+
+def posting_context(posting):
+    """
+    Returns posting itself if it is a PostingContext, else a new context for
+    a job dict or a plain text, so checks accept either
+    """
+    if isinstance(posting, PostingContext):
+        return posting
+    if isinstance(posting, str):
+        return PostingContext.from_text(posting)
+    return PostingContext(posting)
+
+@timed_stage('rules.domains')
+def check_dummy_domains(contact_info, domains=None):
     """
     DOMAIN VALIDATION:
     Checks for suspicious domain characteristics
     """
     issues = set()
-    reasons = set()
+    reasons = {}
     
     if not contact_info:
         return issues, reasons
     
-    domains = extract_domains(contact_info)
+    if domains is None:
+        domains = extract_domains(contact_info)
     
     for domain in domains:
         domain_lower = domain.lower()
@@ -174,174 +220,123 @@ def check_dummy_domains(contact_info):
         # Check for free email domains
         if domain_lower in FREE_EMAIL_DOMAINS:
             issues.add('free_email_domain')
-            reasons.add(f'Use of free email domain: {domain}')
+            reasons[f'Use of free email domain: {domain}'] = 'free_email_domain'
         
         # Check for suspicious TLDs
         for tld in SUSPICIOUS_TLDS:
             if domain_lower.endswith(tld):
                 issues.add('suspicious_tld')
-                reasons.add(f'Suspicious domain extension: {domain}')
+                reasons[f'Suspicious domain extension: {domain}'] = 'suspicious_tld'
                 break
         
         # Check for suspicious keywords in domain
         for keyword in SUSPICIOUS_DOMAIN_KEYWORDS:
             if keyword in domain_lower:
                 issues.add('suspicious_domain_keywords')
-                reasons.add(f'Suspicious domain with job-related keywords: {domain}')
+                reasons[f'Suspicious domain with job-related keywords: {domain}'] = 'suspicious_domain_keywords'
                 break
         
         # Check for very short domains (less than 4 characters before TLD)
         domain_parts = domain_lower.split('.')
         if len(domain_parts) >= 2 and len(domain_parts[0]) < 4:
             issues.add('short_domain')
-            reasons.add(f'Suspiciously short domain name: {domain}')
+            reasons[f'Suspiciously short domain name: {domain}'] = 'short_domain'
     
     return issues, reasons
 
-def check_scam_phrases(job_data):
+@timed_stage('rules.domain_reputation')
+def check_domain_reputation(contact_info, reputation=None, domains=None):
     """
-    ENHANCED SCAM PHRASE DETECTION:
-    Searches for red-flag phrases in job posting content with improved detection
+    DOMAIN REPUTATION:
+    Looks up the contact domains in DNS and WHOIS (see domain_reputation.py)
+    and flags domains that do not resolve, email domains that cannot receive
+    mail and recently registered domains. Returns (issues, reasons, pending),
+    pending being the number of lookups that did not finish within the budget.
     """
     issues = set()
-    reasons = set()
-    
-    # Collect all text fields
-    job_title = job_data.get('job_title', '')
-    job_description = job_data.get('job_description', '')
-    requirements = job_data.get('requirements', '')
-    benefits = job_data.get('benefits', '')
-    
-    # Combine and clean text
-    combined_text = clean_text(f"{job_title} {job_description} {requirements} {benefits}")
-    
-    # Enhanced scam keywords with dynamic detection
-    ENHANCED_SCAM_KEYWORDS = [
-        # Direct scam indicators
-        ('fake', 'Direct mention of "fake" indicates potential scam content'),
-        ('scam', 'Direct mention of "scam" indicates potential fraudulent content'),
-        ('fraud', 'Direct mention of "fraud" indicates potential illegal activity'),
-        ('cheat', 'Direct mention of "cheat" indicates potential dishonest practices'),
-        
-        # Urgency and pressure tactics
-        ('urgent', 'Urgent language creates pressure and is common in scams'),
-        ('immediate join', 'Immediate joining requirements are pressure tactics'),
-        ('immediate hiring', 'Immediate hiring without proper process is suspicious'),
-        ('immediate start', 'Immediate start requirements are often scam indicators'),
-        ('join today', 'Same-day joining requirements are unrealistic'),
-        ('start today', 'Same-day start requirements are unrealistic'),
-        ('limited vacancy', 'Limited vacancy claims create false urgency'),
-        ('only few seats', 'Limited seats claims create artificial scarcity'),
-        ('hurry up', 'Hurry up language is a pressure tactic'),
-        ('act fast', 'Act fast language creates unnecessary urgency'),
-        ('limited time', 'Limited time offers are pressure tactics'),
-        ('offer expires', 'Expiring offers create false urgency'),
-        
-        # Unrealistic promises
-        ('guaranteed job', 'Job guarantees without proper process are unrealistic'),
-        ('100% guarantee', '100% guarantees are unrealistic promises'),
-        ('no rejection', 'No rejection promises are unrealistic'),
-        ('everyone selected', 'Universal selection claims are false'),
-        ('all will be hired', 'Universal hiring claims are unrealistic'),
-        
-        # Financial red flags
-        ('advance payment', 'Advance payments from job seekers are scam indicators'),
-        ('registration fee', 'Registration fees are red flags in job postings'),
-        ('processing fee', 'Processing fees should never be charged to applicants'),
-        ('security deposit', 'Security deposits from employees are inappropriate'),
-        ('training fee', 'Training fees should be covered by legitimate employers'),
-        ('admin fee', 'Administrative fees are red flags'),
-        ('form fee', 'Form fees are inappropriate charges'),
-        ('verification fee', 'Verification fees are scam indicators'),
-        
-        # Work-from-home scams
-        ('work from home guaranteed', 'Guaranteed remote work is often misleading'),
-        ('home based job guaranteed', 'Guaranteed home-based work is suspicious'),
-        ('no office work', 'No office work claims can be misleading'),
-        ('only mobile work', 'Mobile-only work claims are often false'),
-        ('whatsapp job', 'WhatsApp-based jobs are commonly scams'),
-        ('telegram work', 'Telegram-based work is often fraudulent'),
+    reasons = {}
+    
+    reputation = reputation or get_default_reputation()
+    if not contact_info or reputation is None:
+        return issues, reasons, 0
+    
+    # Free email providers are known to be live; looking them up tells nothing
+    if domains is None:
+        domains = extract_domains(contact_info)
+    domains = [domain for domain in domains if domain not in FREE_EMAIL_DOMAINS]
+    if not domains:
+        return issues, reasons, 0
+    
+    contact_lower = contact_info.lower()
+    pending = 0
+    now = datetime.now(timezone.utc)
+    for domain, lookups in sorted(reputation.check(domains).items()):
+        pending += sum(1 for entry in lookups.values() if entry is None)
+        mx, a, whois_entry = lookups.get('mx'), lookups.get('a'), lookups.get('whois')
         
-        # Skill/experience red flags
-        ('no experience needed', 'No experience requirements are often unrealistic'),
-        ('no skills required', 'No skills requirements are suspicious'),
-        ('no qualification needed', 'No qualification requirements are red flags'),
-        ('anyone can do', 'Anyone can do claims are often false'),
-        ('very easy work', 'Very easy work claims are suspicious'),
-        ('simple copy paste', 'Copy-paste job claims are often scams'),
+        if mx and a and mx['status'] == 'negative' and a['status'] == 'negative':
+            issues.add('unresolvable_domain')
+            reasons[f'Domain does not exist or has no DNS records: {domain}'] = 'unresolvable_domain'
+        elif mx and mx['status'] == 'negative' and f'@{domain}' in contact_lower:
+            issues.add('no_mx_records')
+            reasons[f'Email domain cannot receive mail (no MX records): {domain}'] = 'no_mx_records'
         
-        # Communication red flags
-        ('no interview needed', 'No interview processes are unprofessional'),
-        ('direct selection', 'Direct selection without process is suspicious'),
-        ('selection guaranteed', 'Selection guarantees are unrealistic'),
-        ('no questions asked', 'No questions asked policies are red flags')
-    ]
-    
-    # Check for enhanced scam keywords
-    detected_keywords = []
-    for keyword, reason in ENHANCED_SCAM_KEYWORDS:
-        if keyword.lower() in combined_text.lower():
-            issue_key = f'scam_keyword_{keyword.replace(" ", "_").replace("/", "_")}'
-            issues.add(issue_key)
-            reasons.add(f'Detected scam keyword: "{keyword}". {reason}')
-            detected_keywords.append(keyword)
-    
-    # Check for original scam phrases (keep existing logic)
-    for phrase, reason in SCAM_PHRASES:
-        if phrase in combined_text:
-            issue_key = f'suspicious_phrase_{phrase.replace(" ", "_")}'
-            issues.add(issue_key)    
-            reasons.add(f'Found suspicious phrase: "{phrase}". {reason}')
+        if whois_entry and whois_entry['status'] == 'ok' and whois_entry['value'].get('creation_date'):
+            age_days = (now - datetime.fromisoformat(whois_entry['value']['creation_date'])).days
+            if age_days < NEW_DOMAIN_MAX_AGE_DAYS:
+                issues.add('newly_registered_domain')
+                reasons[f'Domain registered only {max(age_days, 0)} days ago: {domain}'] = 'newly_registered_domain'
+    
+    return issues, reasons, pending
+
+@timed_stage('rules.phrases')
+def check_scam_phrases(job_data):
+    """
+    ENHANCED SCAM PHRASE DETECTION:
+    Searches for red-flag phrases in job posting content with improved detection
+    """
+    context = posting_context(job_data)
+    
+    # Scam keywords, scam phrases and fake contact numbers (RULE_DEFINITIONS_FILE)
+    issues, reasons = RULE_PLAN.evaluate(context)
     
     # Check for excessive exclamation marks (unprofessional tone)
-    exclamation_count = combined_text.count('!')
+    exclamation_count = context.exclamation_count
     if exclamation_count > 5:
         issues.add('excessive_exclamation')
-        reasons.add(f'Excessive use of exclamation marks ({exclamation_count}) indicates unprofessional communication')
+        reasons[f'Excessive use of exclamation marks ({exclamation_count}) indicates unprofessional communication'] = 'excessive_exclamation'
     
     # Check for excessive capitalization
-    if len(combined_text) > 0:
-        caps_ratio = sum(1 for c in combined_text if c.isupper()) / len(combined_text)
-        if caps_ratio > 0.3:
-            issues.add('excessive_capitalization')
-            reasons.add('Excessive capitalization suggests unprofessional or spam content')
-    
-    # Enhanced pattern detection
-    # Check for suspicious number patterns (like fake phone numbers)
-    suspicious_numbers = re.findall(r'\b(?:1234567890|9876543210|0000000000|1111111111|9999999999)\b', combined_text)
-    if suspicious_numbers:
-        issues.add('fake_contact_numbers')
-        reasons.add('Detected potentially fake contact numbers')
+    if context.caps_ratio > 0.3:
+        issues.add('excessive_capitalization')
+        reasons['Excessive capitalization suggests unprofessional or spam content'] = 'excessive_capitalization'
     
     # Check for repeated words (sign of poor quality content)
-    words = combined_text.split()
-    word_count = {}
-    for word in words:
-        if len(word) > 3:  # Only check words longer than 3 characters
-            word_count[word.lower()] = word_count.get(word.lower(), 0) + 1
-    
-    repeated_words = [word for word, count in word_count.items() if count > 5]
+    # Only words longer than 3 characters are counted
+    repeated_words = [word for word, count in context.word_counts.items() if count > 5]
     if repeated_words:
         issues.add('excessive_word_repetition')
-        reasons.add(f'Excessive repetition of words: {", ".join(repeated_words[:3])}')
+        reasons[f'Excessive repetition of words: {", ".join(repeated_words[:3])}'] = 'excessive_word_repetition'
     
     return issues, reasons
 
+@timed_stage('rules.spelling')
 def enhanced_spelling_grammar_check(text):
     """
     Enhanced spelling and grammar checking with better error detection
+    (text is the posting text or its PostingContext)
     """
     issues = set()
-    reasons = set()
+    reasons = {}
     
-    if not text or len(text.strip()) < 20:
+    context = posting_context(text)
+    if len(context.text.strip()) < 20:
         return issues, reasons
     
     try:
         # Spelling check with improved accuracy
-        spell = SpellChecker()
         # Extract words, excluding common abbreviations and technical terms
-        words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())  # Only words 3+ characters
+        words = context.spelling_words  # Only words 3+ characters
         
         if words and len(words) > 10:  # Only check if there are enough words
             # Filter out common technical terms and abbreviations
@@ -355,38 +350,37 @@ def enhanced_spelling_grammar_check(text):
             filtered_words = [word for word in words if word not in common_terms]
             
             if filtered_words:
-                misspelled = spell.unknown(filtered_words)
+                misspelled = unknown_words(filtered_words)
                 error_rate = len(misspelled) / len(filtered_words)
                 
                 if error_rate > 0.15:  # More than 15% spelling errors
                     issues.add('high_spelling_errors')
-                    reasons.add(f'High spelling error rate ({error_rate:.1%}) suggests unprofessional content')
+                    reasons[f'High spelling error rate ({error_rate:.1%}) suggests unprofessional content'] = 'high_spelling_errors'
                 elif error_rate > 0.08:  # More than 8% spelling errors
                     issues.add('moderate_spelling_errors')
-                    reasons.add(f'Moderate spelling error rate ({error_rate:.1%}) indicates poor quality')
+                    reasons[f'Moderate spelling error rate ({error_rate:.1%}) indicates poor quality'] = 'moderate_spelling_errors'
         
         # Enhanced grammar checking
-        sentences = re.split(r'[.!?]+', text)
-        valid_sentences = [s.strip() for s in sentences if len(s.strip()) > 5]
+        valid_sentences = context.sentences
         
         if valid_sentences:
             # Check for very short sentences (might indicate poor grammar)
             short_sentences = [s for s in valid_sentences if len(s.split()) < 4]
             if len(short_sentences) / len(valid_sentences) > 0.4:
                 issues.add('poor_sentence_structure')
-                reasons.add('Many very short sentences suggest poor grammar or rushed writing')
+                reasons['Many very short sentences suggest poor grammar or rushed writing'] = 'poor_sentence_structure'
             
             # Check for missing punctuation
-            no_punctuation = [s for s in valid_sentences if not re.search(r'[.!?]$', s.strip())]
+            no_punctuation = [s for s in valid_sentences if not re.search(r'[.!?]$', s)]
             if len(no_punctuation) / len(valid_sentences) > 0.3:
                 issues.add('missing_punctuation')
-                reasons.add('Missing punctuation suggests poor writing quality')
+                reasons['Missing punctuation suggests poor writing quality'] = 'missing_punctuation'
             
             # Check for run-on sentences (very long sentences)
             long_sentences = [s for s in valid_sentences if len(s.split()) > 30]
             if long_sentences:
                 issues.add('run_on_sentences')
-                reasons.add('Very long sentences suggest poor writing structure')
+                reasons['Very long sentences suggest poor writing structure'] = 'run_on_sentences'
     
     except Exception as e:
         logging.warning(f"Enhanced spelling/grammar check failed: {e}")
@@ -465,20 +459,15 @@ def parse_salary_info(salary_info):
     return parsed_salaries
 
 
+@timed_stage('rules.density')
 def check_red_flag_density(job_data):
     """
     Check the density of red flags to determine overall risk level
     """
     issues = set()
-    reasons = set()
+    reasons = {}
     
-    # Collect all text fields
-    job_title = job_data.get('job_title', '')
-    job_description = job_data.get('job_description', '')
-    requirements = job_data.get('requirements', '')
-    benefits = job_data.get('benefits', '')
-    
-    combined_text = clean_text(f"{job_title} {job_description} {requirements} {benefits}")
+    context = posting_context(job_data)
     
     # Count different types of red flags
     red_flag_categories = {
@@ -489,26 +478,15 @@ def check_red_flag_density(job_data):
         'quality_flags': 0
     }
     
-    # Urgency red flags
-    urgency_terms = ['urgent', 'immediate', 'hurry', 'fast', 'quick', 'asap', 'today', 'now']
-    red_flag_categories['urgency_flags'] = sum(1 for term in urgency_terms if term in combined_text.lower())
-    
-    # Payment red flags
-    payment_terms = ['fee', 'payment', 'deposit', 'advance', 'money', 'pay', 'charge', 'cost']
-    red_flag_categories['payment_flags'] = sum(1 for term in payment_terms if term in combined_text.lower())
-    
-    # Unrealistic promise flags
-    unrealistic_terms = ['guarantee', 'easy', 'simple', 'no experience', 'anyone', 'everyone', '100%']
-    red_flag_categories['unrealistic_flags'] = sum(1 for term in unrealistic_terms if term in combined_text.lower())
-    
-    # Communication red flags
-    comm_terms = ['whatsapp', 'telegram', 'sms', 'call now', 'contact immediately']
-    red_flag_categories['communication_flags'] = sum(1 for term in comm_terms if term in combined_text.lower())
+    # Urgency, payment, unrealistic promise and communication red flags
+    phrase_hits = context.phrase_hits
+    for category in RED_FLAG_CATEGORIES:
+        red_flag_categories[category] = sum(1 for term, _ in RULE_PLAN.terms[category] if term in phrase_hits[category])
     
     # Quality red flags
-    if combined_text.count('!') > 3:
+    if context.exclamation_count > 3:
         red_flag_categories['quality_flags'] += 1
-    if len(combined_text) > 0 and sum(1 for c in combined_text if c.isupper()) / len(combined_text) > 0.2:
+    if context.caps_ratio > 0.2:
         red_flag_categories['quality_flags'] += 1
     
     # Calculate total red flag score
@@ -517,29 +495,30 @@ def check_red_flag_density(job_data):
     
     if total_flags >= 8 or active_categories >= 4:
         issues.add('high_red_flag_density')
-        reasons.add(f'High concentration of red flags detected (Total: {total_flags}, Categories: {active_categories})')
+        reasons[f'High concentration of red flags detected (Total: {total_flags}, Categories: {active_categories})'] = 'high_red_flag_density'
     elif total_flags >= 5 or active_categories >= 3:
         issues.add('moderate_red_flag_density')
-        reasons.add(f'Moderate concentration of red flags detected (Total: {total_flags}, Categories: {active_categories})')
+        reasons[f'Moderate concentration of red flags detected (Total: {total_flags}, Categories: {active_categories})'] = 'moderate_red_flag_density'
     
     return issues, reasons
 
+@timed_stage('rules.salary')
 def check_salary_range(job_data):
     """
     SALARY VALIDATION:
     Validates salary ranges against realistic expectations
     """
     issues = set()
-    reasons = set()
+    reasons = {}
     
-    salary_info = job_data.get('salary_info_raw', '')
-    required_experience = job_data.get('required_experience', '')
+    context = posting_context(job_data)
+    salary_info = context.job_data.get('salary_info_raw', '')
     
     if not salary_info:
         return issues, reasons
     
     # Determine experience level
-    exp_level = determine_experience_level(required_experience)
+    exp_level = context.experience_level
     salary_ranges = SALARY_RANGES[exp_level]
     
     # Parse salary values
@@ -556,22 +535,22 @@ def check_salary_range(job_data):
         if any(term in salary_text for term in ['per day', 'daily', '/day']):
             if salary < salary_ranges['daily_min'] or salary > salary_ranges['daily_max']:
                 issues.add('unrealistic_daily_salary')
-                reasons.add(f'Unrealistic daily salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["daily_min"]:,} - ₹{salary_ranges["daily_max"]:,})')
+                reasons[f'Unrealistic daily salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["daily_min"]:,} - ₹{salary_ranges["daily_max"]:,})'] = 'unrealistic_daily_salary'
         
         elif any(term in salary_text for term in ['per week', 'weekly', '/week']):
             if salary < salary_ranges['weekly_min'] or salary > salary_ranges['weekly_max']:
                 issues.add('unrealistic_weekly_salary')
-                reasons.add(f'Unrealistic weekly salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["weekly_min"]:,} - ₹{salary_ranges["weekly_max"]:,})')
+                reasons[f'Unrealistic weekly salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["weekly_min"]:,} - ₹{salary_ranges["weekly_max"]:,})'] = 'unrealistic_weekly_salary'
         
         elif any(term in salary_text for term in ['per month', 'monthly', '/month', 'pm']):
             if salary < salary_ranges['monthly_min'] or salary > salary_ranges['monthly_max']:
                 issues.add('unrealistic_monthly_salary')
-                reasons.add(f'Unrealistic monthly salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["monthly_min"]:,} - ₹{salary_ranges["monthly_max"]:,})')
+                reasons[f'Unrealistic monthly salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["monthly_min"]:,} - ₹{salary_ranges["monthly_max"]:,})'] = 'unrealistic_monthly_salary'
         
         elif any(term in salary_text for term in ['per hour', 'hourly', '/hour', '/hr']):
             if salary < salary_ranges['hourly_min'] or salary > salary_ranges['hourly_max']:
                 issues.add('unrealistic_hourly_salary')
-                reasons.add(f'Unrealistic hourly rate: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["hourly_min"]:,} - ₹{salary_ranges["hourly_max"]:,})')
+                reasons[f'Unrealistic hourly rate: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["hourly_min"]:,} - ₹{salary_ranges["hourly_max"]:,})'] = 'unrealistic_hourly_salary'
         
         elif any(term in salary_text for term in ['lpa', 'per annum', 'annually', 'yearly', '/year']):
             # Handle LPA (Lakhs Per Annum)
@@ -580,109 +559,176 @@ def check_salary_range(job_data):
                 annual_value = salary * 100000  # Convert LPA to actual amount
                 if lpa_value < salary_ranges['ctc_lpa_min'] or lpa_value > salary_ranges['ctc_lpa_max']:
                     issues.add('unrealistic_annual_salary')
-                    reasons.add(f'Unrealistic annual salary: {lpa_value} LPA for {exp_level} level (expected: {salary_ranges["ctc_lpa_min"]} - {salary_ranges["ctc_lpa_max"]} LPA)')
+                    reasons[f'Unrealistic annual salary: {lpa_value} LPA for {exp_level} level (expected: {salary_ranges["ctc_lpa_min"]} - {salary_ranges["ctc_lpa_max"]} LPA)'] = 'unrealistic_annual_salary'
             else:
                 if salary < salary_ranges['annual_min'] or salary > salary_ranges['annual_max']:
                     issues.add('unrealistic_annual_salary')
-                    reasons.add(f'Unrealistic annual salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["annual_min"]:,} - ₹{salary_ranges["annual_max"]:,})')
+                    reasons[f'Unrealistic annual salary: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["annual_min"]:,} - ₹{salary_ranges["annual_max"]:,})'] = 'unrealistic_annual_salary'
         
         elif any(term in salary_text for term in ['ctc', 'cost to company']):
             # Assume CTC values are in LPA if less than 100, otherwise in actual rupees
             if salary < 100:  # Likely LPA
                 if salary < salary_ranges['ctc_lpa_min'] or salary > salary_ranges['ctc_lpa_max']:
                     issues.add('unrealistic_ctc')
-                    reasons.add(f'Unrealistic CTC: {salary} LPA for {exp_level} level (expected: {salary_ranges["ctc_lpa_min"]} - {salary_ranges["ctc_lpa_max"]} LPA)')
+                    reasons[f'Unrealistic CTC: {salary} LPA for {exp_level} level (expected: {salary_ranges["ctc_lpa_min"]} - {salary_ranges["ctc_lpa_max"]} LPA)'] = 'unrealistic_ctc'
             else:  # Actual amount
                 if salary < salary_ranges['annual_min'] or salary > salary_ranges['annual_max']:
                     issues.add('unrealistic_ctc')
-                    reasons.add(f'Unrealistic CTC: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["annual_min"]:,} - ₹{salary_ranges["annual_max"]:,})')
+                    reasons[f'Unrealistic CTC: ₹{salary:,.0f} for {exp_level} level (expected: ₹{salary_ranges["annual_min"]:,} - ₹{salary_ranges["annual_max"]:,})'] = 'unrealistic_ctc'
         
         else:
             # No specific time period mentioned - try to infer from value range
             if salary < 1000:  # Likely hourly
                 if salary < salary_ranges['hourly_min'] or salary > salary_ranges['hourly_max']:
                     issues.add('unclear_salary_range')
-                    reasons.add(f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)')
+                    reasons[f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)'] = 'unclear_salary_range'
             elif salary < 10000:  # Likely daily
                 if salary < salary_ranges['daily_min'] or salary > salary_ranges['daily_max']:
                     issues.add('unclear_salary_range')
-                    reasons.add(f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)')
+                    reasons[f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)'] = 'unclear_salary_range'
             elif salary < 200000:  # Likely monthly
                 if salary < salary_ranges['monthly_min'] or salary > salary_ranges['monthly_max']:
                     issues.add('unclear_salary_range')
-                    reasons.add(f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)')
+                    reasons[f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)'] = 'unclear_salary_range'
             else:  # Likely annual
                 if salary < salary_ranges['annual_min'] or salary > salary_ranges['annual_max']:
                     issues.add('unclear_salary_range')
-                    reasons.add(f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)')
+                    reasons[f'Unclear salary specification: ₹{salary:,.0f} (please specify time period)'] = 'unclear_salary_range'
     
     return issues, reasons
 
-def detect_scam_job(job_data):
+@timed_stage('rules.posting_fields')
+def check_posting_fields(job_data):
     """
-    SCAM DETECTION CONTROLLER:
-    Main function that orchestrates all validation checks
+    POSTING FIELD CHECKS:
+    Company information, remote location, claimed response time and
+    payment requests from applicants
     """
-    all_issues = set()
-    all_reasons = set()
-    
-    # Get contact information
-    contact_info = job_data.get('application_link_or_email', '') or job_data.get('company_website', '')
-    
-    # 1. Domain validation
-    domain_issues, domain_reasons = check_dummy_domains(contact_info)
-    all_issues.update(domain_issues)
-    all_reasons.update(domain_reasons)
-    
-    # 2. Scam phrase detection
-    phrase_issues, phrase_reasons = check_scam_phrases(job_data)
-    all_issues.update(phrase_issues)
-    all_reasons.update(phrase_reasons)
-    
-    # 3. Salary validation
-    salary_issues, salary_reasons = check_salary_range(job_data)
-    all_issues.update(salary_issues)
-    all_reasons.update(salary_reasons)
+    issues = set()
+    reasons = {}
     
-    # 4. Additional checks
+    context = posting_context(job_data)
+    job_data = context.job_data
     
     # Check for missing company information
     company_name = job_data.get('company_name', '').strip()
     if not company_name or len(company_name) < 3:
-        all_issues.add('missing_company_info')
-        all_reasons.add('Missing or insufficient company information')
+        issues.add('missing_company_info')
+        reasons['Missing or insufficient company information'] = 'missing_company_info'
     
     # Check remote job without location
     remote_status = job_data.get('remote_status', '').lower()
     job_location = job_data.get('job_location', '').strip()
     if 'remote' in remote_status and not job_location:
-        all_issues.add('remote_no_location')
-        all_reasons.add('Remote job without company location specified')
+        issues.add('remote_no_location')
+        reasons['Remote job without company location specified'] = 'remote_no_location'
     
     # Check for unrealistic response time claims
     response_time = job_data.get('response_time_claimed', '').lower()
     if any(term in response_time for term in ['immediate', 'within 24 hours', 'urgent', 'instant']):
-        all_issues.add('unrealistic_response_time')
-        all_reasons.add('Unrealistically quick response time promised')
+        issues.add('unrealistic_response_time')
+        reasons['Unrealistically quick response time promised'] = 'unrealistic_response_time'
     
     # Check for payment requests from applicants
-    all_text = ' '.join([
-        job_data.get('job_title', ''),
-        job_data.get('job_description', ''),
-        job_data.get('requirements', ''),
-        job_data.get('benefits', '')
-    ]).lower()
-    
-    payment_keywords = ['registration fee', 'processing fee', 'advance payment', 'security deposit', 'training fee']
-    for keyword in payment_keywords:
-        if keyword in all_text:
-            all_issues.add('payment_request')
-            all_reasons.add('Job posting mentions payment or fees from applicants')
+    payment_hits = context.text_phrase_hits['payment_keyword']
+    for keyword, _ in RULE_PLAN.terms['payment_keyword']:
+        if keyword in payment_hits:
+            issues.add('payment_request')
+            reasons['Job posting mentions payment or fees from applicants'] = 'payment_request'
             break
     
-    # Determine experience level for context
-    required_experience = job_data.get('required_experience', '')
-    experience_level = determine_experience_level(required_experience)
+    return issues, reasons
+
+def check_domain_reputation_rule(context):
+    # DNS/WHOIS lookups, bounded by DOMAIN_LOOKUP_BUDGET_SECONDS
+    issues, reasons, context.domain_lookups_pending = check_domain_reputation(context.contact_info,
+                                                                             domains=context.domains)
+    return issues, reasons
+
+# Issues that count as critical in the override decision, with those of rules marked critical
+CRITICAL_ISSUE_KEYWORDS = [
+    'high_red_flag_density', 'payment_request', 'high_spelling_errors', 'unrealistic_'
+] + RULE_PLAN.critical_keywords
+
+def is_critical(issue):
+    return any(keyword in issue for keyword in CRITICAL_ISSUE_KEYWORDS)
+
+Rule = namedtuple('Rule', ['name', 'check', 'basic', 'max_issues', 'max_critical'])
+
+# Every check of enhanced_scam_detection; the basic ones make up detect_scam_job.
+# max_issues / max_critical bound how many (critical) issues a check can add.
+RULES = [
+    Rule('domains', lambda context: check_dummy_domains(context.contact_info, context.domains), True, 4, 0),
+    Rule('domain_reputation', check_domain_reputation_rule, True, 3, 0),
+    Rule('phrases', check_scam_phrases, True, RULE_PLAN.max_issues + 3, RULE_PLAN.max_critical),
+    Rule('salary', check_salary_range, True, 7, 6),
+    Rule('posting_fields', check_posting_fields, True, 4, 2),
+    Rule('density', check_red_flag_density, False, 1, 1),
+    Rule('spelling', enhanced_spelling_grammar_check, False, 4, 1)
+]
+
+def rule_cost(rule):
+    return RULE_COSTS_MS.get(rule.name, max(RULE_COSTS_MS.values()))
+
+def override_decided(basic_issues, all_issues, remaining):
+    """
+    True when running the remaining rules cannot change whether
+    enhanced_scam_detection reports a scam. Issues only accumulate, so a
+    reached override stays reached, and if even the most the remaining
+    rules could add falls short of every threshold it can never be reached.
+    """
+    critical = sum(1 for issue in all_issues if is_critical(issue))
+    if len(basic_issues) >= 3 or critical >= 2 or len(all_issues) >= 5:
+        return True
+    return (len(basic_issues) + sum(rule.max_issues for rule in remaining if rule.basic) < 3 and
+            len(all_issues) + sum(rule.max_issues for rule in remaining) < 5 and
+            critical + sum(rule.max_critical for rule in remaining) < 2)
+
+def run_rules(job_data, rules=RULES, early_exit=False):
+    """
+    RULE SCHEDULER:
+    Runs the rules cheapest first (RULE_COSTS_MS, measured with
+    `python benchmark.py rules`). With early_exit it stops as soon as the
+    override decision can no longer change, so the expensive checks
+    (spelling, DNS/WHOIS) are skipped for postings the cheap ones settle.
+    """
+    context = posting_context(job_data)
+    remaining = sorted(rules, key=rule_cost)
+    basic_issues = set()
+    all_issues = set()
+    # Every check returns (issues, {reason: issue it explains})
+    all_reasons = {}
+    checks_run = []
+    while remaining:
+        if early_exit and override_decided(basic_issues, all_issues, remaining):
+            break
+        rule = remaining.pop(0)
+        issues, reasons = rule.check(context)
+        checks_run.append(rule.name)
+        all_issues.update(issues)
+        all_reasons.update(reasons)
+        if rule.basic:
+            basic_issues.update(issues)
+    for name in checks_run:
+        RULE_CHECKS.inc(check=name, outcome='run')
+    for rule in remaining:
+        RULE_CHECKS.inc(check=rule.name, outcome='skipped')
+    return {
+        'basic_issues': basic_issues,
+        'issues': all_issues,
+        'reasons': all_reasons,
+        'checks_run': checks_run,
+        'checks_skipped': [rule.name for rule in remaining]
+    }
+
+def detect_scam_job(job_data):
+    """
+    SCAM DETECTION CONTROLLER:
+    Main function that orchestrates all validation checks
+    """
+    context = posting_context(job_data)
+    result = run_rules(context, [rule for rule in RULES if rule.basic])
+    all_issues = result['issues']
     
     # Determine if it's a scam based on number of issues
     # More than 2 distinct issues indicate high probability of scam
@@ -691,9 +737,11 @@ def detect_scam_job(job_data):
     return {
         'is_scam': is_scam,
         'issues': list(all_issues),
-        'reasons': list(all_reasons),
-        'experience_level': experience_level,
-        'total_issues': len(all_issues)
+        'reasons': list(result['reasons']),
+        'reason_issues': result['reasons'],
+        'experience_level': context.experience_level,
+        'total_issues': len(all_issues),
+        'domain_lookups_pending': context.domain_lookups_pending
     }
 
 # Additional utility functions for enhanced detection
@@ -703,25 +751,25 @@ def check_grammar_and_spelling(text):
     Additional check for grammar and spelling quality
     """
     issues = set()
-    reasons = set()
+    reasons = {}
     
     if not text or len(text.strip()) < 50:
         return issues, reasons
     
     try:
-        # Check spelling using spellchecker
-        spell = SpellChecker()
+        # Check spelling using the shared spell checker
         words = re.findall(r'\b[a-zA-Z]+\b', text.lower())
         
         if words:
-            misspelled = spell.unknown(words)
+            misspelled = unknown_words(words)
             error_rate = len(misspelled) / len(words)
             
             if error_rate > 0.15:  # More than 15% spelling errors
                 issues.add('poor_spelling')
-                reasons.add(f'High spelling error rate ({error_rate:.1%}) suggests unprofessional content')
+                reasons[f'High spelling error rate ({error_rate:.1%}) suggests unprofessional content'] = 'poor_spelling'
         
-        # Check for grammar using TextBlob
+        # Check for grammar using TextBlob (imported on first use, it pulls in nltk)
+        from textblob import TextBlob
         blob = TextBlob(text)
         sentences = blob.sentences
         
@@ -730,57 +778,32 @@ def check_grammar_and_spelling(text):
             short_sentences = [s for s in sentences if len(s.words) < 4]
             if len(short_sentences) / len(sentences) > 0.3:
                 issues.add('poor_grammar')
-                reasons.add('Many very short sentences suggest poor grammar or rushed writing')
+                reasons['Many very short sentences suggest poor grammar or rushed writing'] = 'poor_grammar'
     
     except Exception as e:
         logging.warning(f"Grammar/spelling check failed: {e}")
     
     return issues, reasons
 
-def enhanced_scam_detection(job_data):
+def enhanced_scam_detection(job_data, early_exit=False):
     """
-    Enhanced version with improved scam detection and red flag analysis
+    Enhanced version with improved scam detection and red flag analysis.
+    With early_exit, checks that cannot change is_scam are skipped (see
+    run_rules); checks_run / checks_skipped list what was evaluated.
     """
-    # Get basic scam detection results
-    basic_results = detect_scam_job(job_data)
-    
-    # Add enhanced spelling and grammar checks
-    all_text = ' '.join([
-        job_data.get('job_title', ''),
-        job_data.get('job_description', ''),
-        job_data.get('requirements', ''),
-        job_data.get('benefits', '')
-    ])
-    
-    # Enhanced spelling and grammar check
-    spelling_issues, spelling_reasons = enhanced_spelling_grammar_check(all_text)
-    
-    # Red flag density check
-    density_issues, density_reasons = check_red_flag_density(job_data)
-    
-    # Combine all results
-    all_issues = set(basic_results['issues'])
-    all_reasons = set(basic_results['reasons'])
-    
-    all_issues.update(spelling_issues)
-    all_reasons.update(spelling_reasons)
-    
-    all_issues.update(density_issues)
-    all_reasons.update(density_reasons)
+    # One context shared by every check
+    context = posting_context(job_data)
+    result = run_rules(context, RULES, early_exit)
+    all_issues = result['issues']
     
     # Enhanced scam determination logic
     # Count different types of critical issues
-    critical_issues = [
-        issue for issue in all_issues 
-        if any(keyword in issue for keyword in [
-            'scam_keyword', 'fake_contact', 'high_red_flag_density', 
-            'payment_request', 'high_spelling_errors', 'unrealistic_'
-        ])
-    ]
+    critical_issues = [issue for issue in all_issues if is_critical(issue)]
     
     # Determine if it's a scam with improved logic
     # More than 2 critical issues OR more than 4 total issues indicates high probability of scam
-    is_scam = len(critical_issues) >= 2 or len(all_issues) >= 5 or basic_results['is_scam']
+    # (or at least 3 issues from the basic checks, the detect_scam_job verdict)
+    is_scam = len(critical_issues) >= 2 or len(all_issues) >= 5 or len(result['basic_issues']) >= 3
     
     # Calculate confidence score based on issue severity
     confidence_score = min(100, len(critical_issues) * 35 + len(all_issues) * 15)
@@ -788,9 +811,13 @@ def enhanced_scam_detection(job_data):
     return {
         'is_scam': is_scam,
         'issues': list(all_issues),
-        'reasons': list(all_reasons),
-        'experience_level': basic_results['experience_level'],
+        'reasons': list(result['reasons']),
+        'reason_issues': result['reasons'],
+        'experience_level': context.experience_level,
         'total_issues': len(all_issues),
         'critical_issues': len(critical_issues),
-        'confidence_score': confidence_score
-    }
\ No newline at end of file
+        'confidence_score': confidence_score,
+        'domain_lookups_pending': context.domain_lookups_pending,
+        'checks_run': result['checks_run'],
+        'checks_skipped': result['checks_skipped']
+    }